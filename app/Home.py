@@ -2,7 +2,7 @@
 import streamlit as st
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from app.db import query
+from app.db import catalog
 from app.config import SHARED_CSS, COLORS, metric_card, page_footer
 
 st.set_page_config(
@@ -14,6 +14,12 @@ st.set_page_config(
 
 st.markdown(SHARED_CSS, unsafe_allow_html=True)
 
+# Hidden admin view: /?admin=perf shows query instrumentation instead of Home.
+if st.query_params.get("admin") == "perf":
+    from app.perf_panel import render_performance_panel
+    render_performance_panel()
+    st.stop()
+
 # ═══════════════════════════════════════════════════════════════
 # HERO SECTION — Elegant branded header with chess knight motif
 # ═══════════════════════════════════════════════════════════════
@@ -56,26 +62,24 @@ st.markdown("---")
 st.markdown("### Database Overview")
 
 try:
-    games_data = query("SELECT COUNT(*) as n, MIN(seas) as min_s, MAX(seas) as max_s FROM games")
-    plays_data = query("SELECT COUNT(*) as n FROM plays")
-    pass_data = query("SELECT COUNT(*) as n FROM passes")
-    rush_data = query("SELECT COUNT(*) as n FROM rushes")
-    players_data = query("SELECT COUNT(*) as n FROM players")
+    # Row counts and season range come from the build-time catalog, not COUNT(*)
+    meta = catalog()
+    games_data = meta.loc["games"]
 
     col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
         st.markdown(metric_card(
             "Games Analyzed",
-            f"{games_data['n'].iloc[0]:,}",
-            f"Seasons {int(games_data['min_s'].iloc[0])}–{int(games_data['max_s'].iloc[0])}",
+            f"{games_data['row_count']:,}",
+            f"Seasons {int(games_data['season_min'])}–{int(games_data['season_max'])}",
             "", "pos"
         ), unsafe_allow_html=True)
 
     with col2:
         st.markdown(metric_card(
             "Total Plays",
-            f"{plays_data['n'].iloc[0]:,}",
+            f"{meta.loc['plays', 'row_count']:,}",
             "Play-by-play records",
             "", "pos"
         ), unsafe_allow_html=True)
@@ -83,7 +87,7 @@ try:
     with col3:
         st.markdown(metric_card(
             "Pass Plays",
-            f"{pass_data['n'].iloc[0]:,}",
+            f"{meta.loc['passes', 'row_count']:,}",
             "With target & passer",
             "", "pos"
         ), unsafe_allow_html=True)
@@ -91,7 +95,7 @@ try:
     with col4:
         st.markdown(metric_card(
             "Rush Plays",
-            f"{rush_data['n'].iloc[0]:,}",
+            f"{meta.loc['rushes', 'row_count']:,}",
             "With direction & carrier",
             "", "pos"
         ), unsafe_allow_html=True)
@@ -99,7 +103,7 @@ try:
     with col5:
         st.markdown(metric_card(
             "Players",
-            f"{players_data['n'].iloc[0]:,}",
+            f"{meta.loc['players', 'row_count']:,}",
             "Bio & combine data",
             "", "pos"
         ), unsafe_allow_html=True)
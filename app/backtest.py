@@ -0,0 +1,269 @@
+"""Rule-based betting strategy backtests over games.
+
+A strategy is a bet ("home" / "away" against the spread, "over" / "under"
+the total) on every game matching all of its predicates, e.g. home dogs of
+7+ in the cold, or unders in wind:
+
+    Strategy("home", (("sprv", ">=", 7), ("temp", "<", 35)))
+    Strategy("under", (("wspd", ">", 15),))
+
+backtest() runs many strategies at once.  Each distinct predicate becomes a
+boolean mask over the games (sorted by date) once.  A strategy's mask is
+the AND of its predicates' masks.  Stacked, the masks form a strategies x
+games matrix.  Its nonzero (strategy, game) pairs are the bets, and
+records, the per-season breakdown and drawdowns are bincounts and
+cumulative sums over those pairs.  Every bet is 1 unit at -110: a win
+pays 100/110, a loss costs 1, and a push (or a game with no line) is
+refunded.
+"""
+import itertools
+import operator
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+BETS = ("home", "away", "over", "under")
+WIN_PAYOUT = 100 / 110  # Units won per unit risked at -110
+# Profit is tallied in elevenths of a unit (a win is +10, a loss -11), so
+# sums and drawdowns are exact integers until the final division.
+_TICKS = 11
+_WIN_TICKS, _LOSS_TICKS = round(WIN_PAYOUT * _TICKS), -_TICKS
+
+_OPS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "==": operator.eq, "!=": operator.ne,
+    "in": lambda col, value: col.isin(list(value)),
+    "between": lambda col, value: col.between(*value),  # inclusive (lo, hi)
+}
+
+# Strategies evaluated per block (bounds the strategies x games matrices)
+_BLOCK = 2048
+
+
+class Strategy(NamedTuple):
+    """A bet on every game matching all `conditions` ((column, op, value) tuples)."""
+    bet: str
+    conditions: tuple = ()
+    name: str = None
+
+    @property
+    def label(self) -> str:
+        if self.name:
+            return self.name
+        rules = " & ".join(f"{c} {op} {v}" for c, op, v in self.conditions)
+        return f"{self.bet}: {rules}" if rules else f"{self.bet}: all games"
+
+
+class BacktestResult(NamedTuple):
+    summary: pd.DataFrame    # one row per strategy
+    by_season: pd.DataFrame  # one row per strategy and season with bets
+
+
+def strategy_grid(bets=BETS, **options) -> list:
+    """Every combination of one bet and one option per column.
+
+    Each keyword maps a column to its alternatives: (op, value) pairs, or
+    None for no condition on that column.  For example
+    strategy_grid(["home"], sprv=[(">=", 3), (">=", 7)], temp=[("<", 35), None])
+    gives four strategies.
+    """
+    columns = list(options)
+    strategies = []
+    for bet in bets:
+        for choice in itertools.product(*(options[c] for c in columns)):
+            conditions = tuple((c, *opt) for c, opt in zip(columns, choice) if opt is not None)
+            strategies.append(Strategy(bet, conditions))
+    return strategies
+
+
+def _normalize(strategy: Strategy) -> Strategy:
+    """Conditions as hashable tuples (list values for "in" / "between" become tuples)."""
+    conditions = tuple(
+        (column, op, tuple(value) if isinstance(value, list) else value)
+        for column, op, value in strategy.conditions
+    )
+    return strategy._replace(conditions=conditions)
+
+
+def _prepare(games: pd.DataFrame) -> pd.DataFrame:
+    """Games sorted by date, with spread_result / ou_result derived if missing."""
+    games = games.sort_values(["seas", "wk", "gid"]).reset_index(drop=True)
+    if "spread_result" not in games:
+        games["spread_result"] = games["ptsh"] - games["ptsv"] + games["sprv"]
+    if "ou_result" not in games:
+        games["ou_result"] = games["ptsh"] + games["ptsv"] - games["ou"]
+    return games
+
+
+def _outcomes(games: pd.DataFrame) -> np.ndarray:
+    """(len(BETS) x games) array: 1 win, -1 loss, 0 push, NaN no line."""
+    spread = np.sign(games["spread_result"].to_numpy(dtype=float))
+    total = np.sign(games["ou_result"].to_numpy(dtype=float))
+    return np.vstack([spread, -spread, total, -total])
+
+
+def _mask(games: pd.DataFrame, column: str, op: str, value) -> np.ndarray:
+    if op not in _OPS:
+        raise ValueError(f"Unknown predicate op {op!r}")
+    col = games[column]
+    matched = pd.Series(_OPS[op](col, value), index=col.index)
+    # Missing values never match (nullable columns compare to NA)
+    return matched.fillna(False).to_numpy(dtype=bool) & col.notna().to_numpy()
+
+
+def _max_drawdown(rows, profit, n_strategies: int, n_games: int) -> np.ndarray:
+    """Largest drop from a running peak (starting at 0) of each strategy's cumulative profit.
+
+    `rows` / `profit` list every bet, grouped by strategy and in date order
+    within one.  Adding rows * offset (more than any equity swing) keeps
+    one running maximum over all bets from carrying across strategies.
+    """
+    drawdown = np.zeros(n_strategies, dtype=np.int64)
+    if len(rows) == 0:
+        return drawdown
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    equity = np.cumsum(profit)
+    base = np.r_[0, equity][starts]  # equity before each strategy's first bet
+    equity -= np.repeat(base, np.diff(np.r_[starts, len(rows)]))
+    floor = rows * (2 * _TICKS * (n_games + 1))
+    shifted = equity + floor
+    peak = np.maximum(np.maximum.accumulate(shifted), floor)
+    drawdown[rows[starts]] = np.maximum.reduceat(peak - shifted, starts)
+    return drawdown
+
+
+def _backtest_block(games: pd.DataFrame, strategies: list) -> tuple:
+    """Totals (bets, wins, losses, units per strategy), drawdowns and season breakdown for one block.
+
+    Only the strategies x games match matrix is dense.  Everything after it
+    works on the (strategy, game) pairs that are actual bets.
+    """
+    n = len(games)
+    predicates = {}
+    for s in strategies:
+        if s.bet not in BETS:
+            raise ValueError(f"Unknown bet {s.bet!r} (use one of {', '.join(BETS)})")
+        for cond in s.conditions:
+            predicates.setdefault(cond, len(predicates))
+    # Row 0 is "no condition", so strategies with fewer predicates pad with it
+    masks = np.ones((len(predicates) + 1, n), dtype=bool)
+    for cond, i in predicates.items():
+        masks[i + 1] = _mask(games, *cond)
+    width = max((len(s.conditions) for s in strategies), default=0)
+    index = np.zeros((len(strategies), max(width, 1)), dtype=np.intp)
+    for row, s in enumerate(strategies):
+        for col, cond in enumerate(s.conditions):
+            index[row, col] = predicates[cond] + 1
+
+    outcomes = _outcomes(games)
+    bet_index = np.array([BETS.index(s.bet) for s in strategies], dtype=np.intp)
+    selected = ~np.isnan(outcomes)[bet_index]  # games with a line for the bet
+    for col in range(index.shape[1]):
+        selected &= masks[index[:, col]]
+
+    # Every bet as a (strategy, game) pair; row-major, so by date per strategy
+    rows, cols = np.nonzero(selected)
+    result = outcomes[bet_index[rows], cols]
+    won = result > 0
+    lost = result < 0
+    profit = np.where(won, _WIN_TICKS, 0) + np.where(lost, _LOSS_TICKS, 0)  # ticks
+
+    n_strategies = len(strategies)
+    totals = np.column_stack([
+        np.bincount(rows, minlength=n_strategies),
+        np.bincount(rows, weights=won, minlength=n_strategies),
+        np.bincount(rows, weights=lost, minlength=n_strategies),
+        np.bincount(rows, weights=profit, minlength=n_strategies) / _TICKS,
+    ])
+
+    season_values, season_index = np.unique(games["seas"].to_numpy(), return_inverse=True)
+    k = len(season_values)
+    cell = rows * k + season_index[cols]
+    shape = (n_strategies, k)
+    season_counts = np.stack([
+        np.bincount(cell, minlength=n_strategies * k).reshape(shape),
+        np.bincount(cell, weights=won, minlength=n_strategies * k).reshape(shape),
+        np.bincount(cell, weights=lost, minlength=n_strategies * k).reshape(shape),
+    ])
+    season_units = np.bincount(cell, weights=profit, minlength=n_strategies * k).reshape(shape) / _TICKS
+
+    drawdown = _max_drawdown(rows, profit, n_strategies, n) / _TICKS
+    return totals, drawdown, season_values, season_counts, season_units
+
+
+def _summary_frame(strategies, totals, drawdown) -> pd.DataFrame:
+    bets, wins, losses, units = totals.T
+    risked = wins + losses
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({
+            "strategy": [s.label for s in strategies],
+            "bet": [s.bet for s in strategies],
+            "bets": bets.astype(int),
+            "wins": wins.astype(int),
+            "losses": losses.astype(int),
+            "pushes": (bets - risked).astype(int),
+            "win_pct": np.where(risked > 0, 100 * wins / risked, np.nan),
+            "units": units,
+            "roi": np.where(risked > 0, 100 * units / risked, np.nan),
+            "max_drawdown": drawdown,
+        })
+
+
+def _season_frame(strategies, season_values, counts, units) -> pd.DataFrame:
+    bets, wins, losses = counts
+    row, col = np.nonzero(bets)
+    risked = wins[row, col] + losses[row, col]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({
+            "strategy": np.array([s.label for s in strategies], dtype=object)[row],
+            "seas": season_values[col],
+            "bets": bets[row, col].astype(int),
+            "wins": wins[row, col].astype(int),
+            "losses": losses[row, col].astype(int),
+            "units": units[row, col],
+            "roi": np.where(risked > 0, 100 * units[row, col] / risked, np.nan),
+        })
+
+
+def _backtest_chunk(games: pd.DataFrame, strategies: list) -> tuple:
+    """Summary and season frames for a list of strategies, one block at a time."""
+    if not strategies:
+        return (_summary_frame([], np.zeros((0, 4)), np.zeros(0)),
+                _season_frame([], np.zeros(0, dtype=int), np.zeros((3, 0, 0)), np.zeros((0, 0))))
+    summaries, seasons = [], []
+    for lo in range(0, len(strategies), _BLOCK):
+        block = strategies[lo:lo + _BLOCK]
+        totals, drawdown, season_values, counts, units = _backtest_block(games, block)
+        summaries.append(_summary_frame(block, totals, drawdown))
+        seasons.append(_season_frame(block, season_values, counts, units))
+    return pd.concat(summaries, ignore_index=True), pd.concat(seasons, ignore_index=True)
+
+
+def backtest(games: pd.DataFrame, strategies, workers: int = None) -> BacktestResult:
+    """Record, ROI at -110, max drawdown and season breakdown for each strategy.
+
+    `games` needs seas, wk, gid and the columns the predicates use, plus
+    spread_result / ou_result (as load_games_data() derives them), or else
+    ptsh, ptsv, sprv and ou to derive them from.  `workers` > 1 splits the
+    strategies over a process pool, which only pays off for very large
+    grids.
+
+    summary: strategy, bet, bets, wins, losses, pushes, win_pct (of graded
+    bets), units, roi (% of units risked; pushes are refunded) and
+    max_drawdown (units).  by_season: strategy, seas, bets, wins, losses,
+    units and roi for every season a strategy bet in.
+    """
+    strategies = [_normalize(s if isinstance(s, Strategy) else Strategy(*s)) for s in strategies]
+    games = _prepare(games)
+    if workers and workers > 1 and len(strategies) > _BLOCK:
+        from concurrent.futures import ProcessPoolExecutor
+        size = -(-len(strategies) // workers)
+        chunks = [strategies[i:i + size] for i in range(0, len(strategies), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_backtest_chunk, itertools.repeat(games), chunks))
+        summary = pd.concat([p[0] for p in parts], ignore_index=True)
+        by_season = pd.concat([p[1] for p in parts], ignore_index=True)
+    else:
+        summary, by_season = _backtest_chunk(games, strategies)
+    return BacktestResult(summary, by_season)
@@ -0,0 +1,141 @@
+"""Shared bucketings for the dashboards, vectorized and as SQL.
+
+Each bucketing is declared once as ordered rules and can be applied two ways:
+to a pandas Series in one vectorized pass (Binning.apply(), via np.select),
+or inside a query as a CASE expression (Binning.sql()), so a page can bin
+server-side.  Both give the same labels.  apply() and categorical() return
+ordered categoricals, so groupbys and charts list the buckets in bucket order
+rather than alphabetically.
+"""
+import numpy as np
+import pandas as pd
+
+MISSING_LABEL = "Unknown"
+
+
+class Binning:
+    """An ordered bucketing of one column.
+
+    `rules` are (op, value, label) tuples tried in order; op is one of "<",
+    "<=", "==" (numeric) or "contains" (case-insensitive substring).  Values
+    matching no rule get `default`, and missing values get MISSING_LABEL.
+    """
+
+    _NUMERIC_OPS = ("<", "<=", "==")
+
+    def __init__(self, name: str, column: str, rules: list, default: str):
+        for op, _, _ in rules:
+            if op not in self._NUMERIC_OPS + ("contains",):
+                raise ValueError(f"Unknown binning op {op!r}")
+        self.name = name
+        self.column = column
+        self.rules = tuple(rules)
+        self.default = default
+        self.labels = tuple(dict.fromkeys([label for _, _, label in rules] + [default, MISSING_LABEL]))
+
+    def __repr__(self):
+        return f"Binning({self.name!r}, {self.column!r}, labels={list(self.labels)})"
+
+    @property
+    def dtype(self) -> pd.CategoricalDtype:
+        return pd.CategoricalDtype(self.labels, ordered=True)
+
+    def apply(self, values) -> pd.Series:
+        """Bucket labels for `values` as an ordered categorical Series."""
+        values = pd.Series(values)
+        if any(op == "contains" for op, _, _ in self.rules):
+            text = values.astype("string").str.upper()
+            missing = text.isna().to_numpy()
+            conditions = [
+                text.str.contains(str(value).upper(), regex=False).fillna(False).to_numpy(dtype=bool)
+                for _, value, _ in self.rules
+            ]
+        else:
+            numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+            missing = np.isnan(numbers)
+            with np.errstate(invalid="ignore"):
+                conditions = [
+                    numbers < value if op == "<" else numbers <= value if op == "<=" else numbers == value
+                    for op, value, _ in self.rules
+                ]
+        # Select category codes rather than label strings: np.select over
+        # small ints is far cheaper than over an object array.
+        codes = np.select(
+            [missing] + conditions,
+            [self.labels.index(MISSING_LABEL)] + [self.labels.index(label) for _, _, label in self.rules],
+            default=self.labels.index(self.default),
+        )
+        return pd.Series(pd.Categorical.from_codes(codes, dtype=self.dtype), index=values.index, name=self.name)
+
+    def categorical(self, labels) -> pd.Series:
+        """Labels already computed (e.g. by sql()) as an ordered categorical."""
+        labels = pd.Series(labels)
+        return labels.astype(self.dtype)
+
+    def sql(self, column: str = None) -> str:
+        """CASE expression giving the same labels as apply() inside a query."""
+        column = column or self.column
+        whens = [f"WHEN {column} IS NULL THEN '{MISSING_LABEL}'"]
+        for op, value, label in self.rules:
+            if op == "contains":
+                test = f"contains(upper(CAST({column} AS VARCHAR)), '{str(value).upper()}')"
+            else:
+                test = f"{column} {'=' if op == '==' else op} {value}"
+            whens.append(f"WHEN {test} THEN '{label}'")
+        return f"CASE {' '.join(whens)} ELSE '{self.default}' END"
+
+
+# Game-time temperature (°F)
+WEATHER = Binning("weather_cat", "temp", [
+    ("<", 35, "Cold"),
+    ("<", 55, "Cool"),
+    ("<", 75, "Moderate"),
+], default="Warm")
+
+# Home line (games.sprv; negative = home favored)
+SPREAD = Binning("spread_bucket", "sprv", [
+    ("<=", -14, "-14 or more"),
+    ("<=", -10, "-10 to -13.5"),
+    ("<=", -7, "-7 to -9.5"),
+    ("<=", -3, "-3 to -6.5"),
+    ("<", 0, "-1 to -2.5"),
+    ("==", 0, "PK"),
+    ("<", 3, "+1 to +2.5"),
+    ("<", 7, "+3 to +6.5"),
+    ("<", 10, "+7 to +9.5"),
+], default="+10 or more")
+
+# Yards to go
+YARDS_TO_GO = Binning("ytg_bucket", "ytg", [
+    ("<=", 3, "1-3"),
+    ("<=", 6, "4-6"),
+    ("<=", 10, "7-10"),
+    ("<=", 15, "11-15"),
+], default="16+")
+
+# Yards from own goal
+FIELD_POSITION = Binning("field_pos_bucket", "yfog", [
+    ("<=", 25, "Own 1-25"),
+    ("<=", 50, "Own 26-50"),
+    ("<=", 75, "Opp 49-25"),
+], default="Opp 24-1")
+
+# Pass location codes (PASS.loc), e.g. "DL" = deep left, "SM" = short middle
+PASS_DEPTH = Binning("depth_cat", "loc", [
+    ("contains", "D", "Deep"),
+    ("contains", "I", "Intermediate"),
+], default="Short")
+
+PASS_DIRECTION = Binning("direction_cat", "loc", [
+    ("contains", "L", "Left"),
+    ("contains", "R", "Right"),
+], default="Middle")
+
+# Estimated air yards per PASS_DEPTH bucket
+PASS_DEPTH_YARDS = {"Deep": 15, "Intermediate": 10, "Short": 3}
+
+
+def pass_depth_yards(loc) -> pd.Series:
+    """Estimated target depth in yards from pass location codes (NaN if unknown)."""
+    depth = PASS_DEPTH.apply(loc)
+    return depth.astype(object).map(PASS_DEPTH_YARDS).astype(float).rename("depth_est")
@@ -0,0 +1,194 @@
+"""Bootstrap confidence intervals for grouped means, rates and totals.
+
+All groups are resampled together.  Rows are first collapsed into
+resampling units: one per (group, cluster) with cluster=, otherwise one
+per row.  Units that are identical within a group, such as the 0/1 rows of
+a success rate, are then merged and counted.  Each resample draws one
+weight per unit, giving a (units x resamples) NumPy matrix:
+
+- "poisson": a unit of multiplicity m gets Poisson(m), the sum of m
+  independent Poisson(1) row weights.
+- "multinomial": the group's units share Multinomial(N, m / N), drawn as
+  conditional binomials, which is the classic resample-with-replacement.
+
+Group totals for every resample are one sparse (groups x units) product
+with that matrix.
+Because identical units merge, a rate over any number of rows costs two
+units per group, and a per-game cluster bootstrap costs one unit per team
+game.  2,000 resamples of a rate over every team-season of plays take under
+a tenth of a second.  A per-game cluster bootstrap of the same plays draws
+2,000 Poisson weights for each of ~10,000 team games and takes just under a
+second, most of it in the draws; one season takes a few tens of
+milliseconds.  Only an unclustered mean of a continuous value resamples row
+by row.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+N_BOOT = 2000
+CI_LEVEL = 0.95
+METHODS = ("poisson", "multinomial")
+STATS = ("mean", "sum")
+
+# Units x resamples drawn per block, bounding the weight matrix's memory
+_BLOCK_CELLS = 4_000_000
+
+
+def _check(method: str, stat: str = "mean") -> None:
+    if method not in METHODS:
+        raise ValueError(f"Unknown bootstrap method {method!r} (use one of {', '.join(METHODS)})")
+    if stat not in STATS:
+        raise ValueError(f"Unknown bootstrap statistic {stat!r} (use one of {', '.join(STATS)})")
+
+
+def _units(codes, values, clusters=None) -> pd.DataFrame:
+    """Resampling units as columns g, rows, total, m (multiplicity), sorted by g."""
+    frame = pd.DataFrame({"g": codes, "total": values})
+    if clusters is not None:
+        frame["cluster"] = clusters
+        frame = (frame.groupby(["g", "cluster"], sort=False)["total"]
+                 .agg(rows="size", total="sum").reset_index("g"))
+    else:
+        frame["rows"] = 1
+    return frame.groupby(["g", "rows", "total"]).size().rename("m").reset_index()
+
+
+def _poisson_weights(rng, m, size: int):
+    # A scalar rate takes numpy's much faster sampler, and clustered units
+    # (one per team game) almost all have m = 1
+    ones = m == 1
+    if ones.all():
+        return rng.poisson(1.0, size=(len(m), size))
+    weights = np.empty((len(m), size), dtype=np.int64)
+    weights[ones] = rng.poisson(1.0, size=(ones.sum(), size))
+    weights[~ones] = rng.poisson(m[~ones, None], size=((~ones).sum(), size))
+    return weights
+
+
+def _multinomial_weights(rng, m, starts, size: int):
+    """Multinomial(N, m / N) weights per group, one conditional binomial per unit rank."""
+    group = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(m))))
+    rank = np.arange(len(m)) - starts[group]
+    group_m = np.add.reduceat(m, starts)
+    before = np.cumsum(m) - m
+    # m still unassigned when each unit's turn comes (its own included)
+    remaining = group_m[group] - (before - before[starts][group])
+    left = np.repeat(group_m[:, None], size, axis=1)
+    weights = np.empty((len(m), size), dtype=np.int64)
+    for r in range(rank.max() + 1):
+        idx = np.flatnonzero(rank == r)
+        draw = rng.binomial(left[group[idx]], (m[idx] / remaining[idx])[:, None])
+        weights[idx] = draw
+        left[group[idx]] -= draw
+    return weights
+
+
+def _replicates(units: pd.DataFrame, n_groups: int, stat: str, n_boot: int, method: str, rng):
+    """(n_groups x n_boot) matrix of the resampled statistic (NaN if a resample is empty)."""
+    from scipy import sparse
+    g = units["g"].to_numpy()
+    m = units["m"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    # Group-by-unit matrices: one sparse product sums every group's weighted
+    # totals (and row counts) for a whole block of resamples.
+    cols = np.arange(len(m))
+    totals = sparse.csr_matrix((units["total"].to_numpy(dtype=float), (g, cols)), shape=(n_groups, len(m)))
+    rows = sparse.csr_matrix((units["rows"].to_numpy(dtype=float), (g, cols)), shape=(n_groups, len(m)))
+
+    out = np.full((n_groups, n_boot), np.nan)
+    if units.empty:
+        return out
+    block = max(1, min(n_boot, _BLOCK_CELLS // max(len(m), 1)))
+    for lo in range(0, n_boot, block):
+        size = min(block, n_boot - lo)
+        if method == "poisson":
+            weights = _poisson_weights(rng, m, size)
+        else:
+            weights = _multinomial_weights(rng, m, starts, size)
+        num = totals @ weights
+        if stat == "sum":
+            out[:, lo:lo + size] = num
+        else:
+            den = rows @ weights
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[:, lo:lo + size] = np.where(den > 0, num / den, np.nan)
+    return out
+
+
+def _interval(reps, level: float):
+    alpha = (1.0 - level) / 2
+    if len(reps) == 0:
+        # nanquantile() over zero groups doesn't keep the quantile axis
+        return np.empty(0), np.empty(0), np.empty(0)
+    with warnings.catch_warnings():
+        # Groups with no non-empty resample just get NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        lo, hi = np.nanquantile(reps, [alpha, 1.0 - alpha], axis=1)
+        se = np.nanstd(reps, axis=1, ddof=1)
+    return lo, hi, se
+
+
+def bootstrap_ci(df: pd.DataFrame, by, value: str, cluster: str = None, stat: str = "mean",
+                 n_boot: int = N_BOOT, method: str = "poisson", level: float = CI_LEVEL,
+                 scale: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    """Percentile bootstrap CI of `value`'s mean (or sum) per `by` group.
+
+    cluster= (e.g. "gid") resamples whole clusters instead of rows, which
+    is the right unit for plays from the same game and much cheaper.  Rows
+    with a missing value or group key are dropped.  `scale` multiplies the
+    estimate and interval (100 for percentages).  The fixed `seed` keeps
+    intervals stable across reruns.
+
+    Returns one row per group: the `by` columns, n (rows), clusters (with
+    cluster=), estimate, ci_lo, ci_hi and se (bootstrap standard error).
+    """
+    _check(method, stat)
+    by = [by] if isinstance(by, str) else list(by)
+    data = df.dropna(subset=[value])
+    grouped = data.groupby(by, observed=True, sort=True)
+    codes = grouped.ngroup()
+    keep = codes.notna().to_numpy()   # NaN for rows with a missing key
+    values = data[value].to_numpy(dtype=float)[keep]
+    codes = codes[keep].to_numpy(dtype=np.int64)
+    clusters = data[cluster].to_numpy()[keep] if cluster else None
+
+    out = grouped.size().rename("n").reset_index()
+    units = _units(codes, values, clusters)
+    reps = _replicates(units, len(out), stat, n_boot, method, np.random.default_rng(seed))
+    lo, hi, se = _interval(reps, level)
+
+    sums = np.bincount(codes, weights=values, minlength=len(out))
+    if cluster:
+        out["clusters"] = units.groupby("g")["m"].sum().reindex(range(len(out)), fill_value=0).to_numpy()
+    estimate = sums / out["n"].to_numpy() if stat == "mean" else sums
+    out["estimate"] = estimate * scale
+    out["ci_lo"] = lo * scale
+    out["ci_hi"] = hi * scale
+    out["se"] = se * scale
+    return out
+
+
+def rate_ci(successes, trials, n_boot: int = N_BOOT, method: str = "poisson",
+            level: float = CI_LEVEL, scale: float = 1.0, seed: int = 0):
+    """Bootstrap CI of successes / trials from counts already aggregated.
+
+    Equivalent to bootstrap_ci() over the underlying 0/1 rows, for rates a
+    query already counted (ATS%, Over%, ...).  Returns (ci_lo, ci_hi)
+    arrays aligned with the inputs, NaN where trials is 0.
+    """
+    _check(method)
+    successes = np.asarray(successes, dtype=np.int64)
+    trials = np.asarray(trials, dtype=np.int64)
+    codes = np.arange(len(trials))
+    units = pd.DataFrame({
+        "g": np.concatenate([codes, codes]),
+        "rows": 1,
+        "total": np.repeat([0.0, 1.0], len(trials)),
+        "m": np.concatenate([trials - successes, successes]),
+    })
+    units = units[units["m"] > 0].sort_values("g", kind="stable")
+    reps = _replicates(units, len(trials), "mean", n_boot, method, np.random.default_rng(seed))
+    lo, hi, _ = _interval(reps, level)
+    return lo * scale, hi * scale
@@ -0,0 +1,158 @@
+"""Canonical tables built from the raw tables.
+
+Shared by app.db (parquet build, db_fingerprint()) and src/data/ingest.py
+(CSV build, node hashes), so both build the same SQL and key their rebuild
+state on it.  Keep this module free of imports: ingest loads it without the
+app's dependencies.
+"""
+
+
+def _flag(col: str) -> str:
+    """Y/N play flag as a non-null BOOLEAN (NULL means no).
+
+    Accepts the CSV's VARCHAR 'Y'/'N' and ingest's schema-contract BOOLEAN.
+    """
+    return f"COALESCE(TRY_CAST({col} AS BOOLEAN), FALSE) AS {col}"
+
+
+# (name, SELECT, dependencies).  Dependencies are raw parquet tables or other
+# canonical tables; the list is in dependency order.  `redzone` and `fgxp` are
+# not listed: DuckDB identifiers are case-insensitive, so those names already
+# resolve to the raw REDZONE / FGXP tables.
+CANONICAL_TABLES = [
+    ("games", """
+        SELECT g.gid, g.seas, g.wk, g.day, s.date,
+               g.v, g.h, g.stad, g.temp, g.humd, g.wspd, g.wdir, g.cond, g.surf,
+               g.ou, g.sprv, g.ptsv, g.ptsh
+        FROM "GAME" g LEFT JOIN "SCHEDULE" s ON g.gid = s.gid
+    """, ("GAME", "SCHEDULE")),
+    # One row per team per game: the home and away sides of `games`, each
+    # with its own line (sprv is the home line), cover margin and O/U result.
+    ("team_games", """
+        SELECT gid, seas, wk, day, team, opp, is_home,
+               CASE WHEN is_home THEN 'Home' ELSE 'Away' END AS perspective,
+               stad, temp, wspd, cond, surf, line, ou, pts, opp_pts,
+               pts - opp_pts AS margin,
+               pts - opp_pts + line AS cover_margin,
+               pts - opp_pts + line > 0 AS covered,
+               pts - opp_pts + line = 0 AS pushed,
+               pts + opp_pts AS total_pts,
+               CASE WHEN pts + opp_pts > ou THEN 'Over'
+                    WHEN pts + opp_pts < ou THEN 'Under'
+                    WHEN pts + opp_pts = ou THEN 'Push' END AS ou_result
+        FROM (
+            SELECT gid, seas, wk, day, stad, temp, wspd, cond, surf, ou,
+                   h AS team, v AS opp, TRUE AS is_home, sprv AS line, ptsh AS pts, ptsv AS opp_pts
+            FROM games
+            UNION ALL
+            SELECT gid, seas, wk, day, stad, temp, wspd, cond, surf, ou,
+                   v AS team, h AS opp, FALSE AS is_home, -sprv AS line, ptsv AS pts, ptsh AS opp_pts
+            FROM games
+        )
+        ORDER BY seas, gid, is_home
+    """, ("games",)),
+    ("plays", f"""
+        SELECT gid, pid, detail, off, def, type, dseq, len, qtr, min, sec,
+               ptso, ptsd, timo, timd, dwn, ytg, yfog, zone, yds,
+               {_flag("succ")}, {_flag("fd")}, {_flag("sg")}, {_flag("nh")},
+               pts, bc, {_flag("kne")}, dir, psr, comp, spk, loc, trg, dfb, eps, epa
+        FROM "PBP"
+    """, ("PBP",)),
+    ("drives", """
+        SELECT uid, gid, fpid, tname, drvn, obt, qtr, min, sec, yfog, plays,
+               succ, rfd, pfd, ofd, ry, ra, py, pa, pc, peyf, peya, net, res
+        FROM "DRIVE"
+    """, ("DRIVE",)),
+    ("passes", """
+        SELECT p.pid, p.psr, p.trg, p.loc, p.yds, p.comp, p.succ, p.spk, p.dfb,
+               pl.gid, pl.off, pl.def, pl.qtr, pl.min, pl.sec, pl.pts
+        FROM "PASS" p LEFT JOIN plays pl ON p.pid = pl.pid
+    """, ("PASS", "plays")),
+    ("rushes", """
+        SELECT r.pid, r.bc, r.dir, r.yds, r.succ, r.kne,
+               pl.gid, pl.off, pl.def, pl.qtr, pl.min, pl.sec, pl.pts
+        FROM "RUSH" r LEFT JOIN plays pl ON r.pid = pl.pid
+    """, ("RUSH", "plays")),
+    ("penalties",     'SELECT uid, pid, ptm, pen, "desc", cat, pey, act FROM "PENALTY"', ("PENALTY",)),
+    ("sacks",         'SELECT uid, pid, qb, sk, value, ydsl FROM "SACK"', ("SACK",)),
+    ("tackles",       'SELECT uid, pid, tck, value FROM "TACKLE"', ("TACKLE",)),
+    ("players",       'SELECT * FROM "PLAYER"', ("PLAYER",)),
+    ("offense_stats", 'SELECT * FROM "OFFENSE"', ("OFFENSE",)),
+    ("defense_stats", 'SELECT * FROM "DEFENSE"', ("DEFENSE",)),
+    ("injuries",      'SELECT * FROM "INJURY"', ("INJURY",)),
+    ("snaps",         'SELECT * FROM "SNAP"', ("SNAP",)),
+    ("touchdowns",    'SELECT * FROM "TD"', ("TD",)),
+    ("fumbles",       'SELECT * FROM "FUMBLE"', ("FUMBLE",)),
+    ("interceptions", 'SELECT * FROM "INTERCPT"', ("INTERCPT",)),
+    ("kickoffs",      'SELECT * FROM "KOFF"', ("KOFF",)),
+    ("punts",         'SELECT * FROM "PUNT"', ("PUNT",)),
+    ("blocks",        'SELECT * FROM "BLOCK"', ("BLOCK",)),
+    ("conversions",   'SELECT * FROM "CONV"', ("CONV",)),
+    ("safeties",      'SELECT * FROM "SAFETY"', ("SAFETY",)),
+    # Wide fact tables: play-level rows with the game's season/week, home and
+    # away teams and resolved player names already joined in.  Rows are sorted
+    # by (seas, gid, pid), so a season filter is a zone-map range scan with no
+    # join.  `play_succ` is the plays' BOOLEAN flag; PASS/RUSH keep their own
+    # integer `succ`.
+    ("plays_wide", """
+        SELECT g.seas, g.wk, p.*, g.v, g.h, g.ptsv, g.ptsh,
+               p.off = g.h AS off_is_home,
+               psr.pname AS psr_name, trg.pname AS trg_name, bc.pname AS bc_name
+        FROM plays p
+        LEFT JOIN games g ON p.gid = g.gid
+        LEFT JOIN players psr ON p.psr = psr.player
+        LEFT JOIN players trg ON p.trg = trg.player
+        LEFT JOIN players bc ON p.bc = bc.player
+        ORDER BY g.seas, p.gid, p.pid
+    """, ("plays", "games", "players")),
+    ("passes_wide", """
+        SELECT g.seas, g.wk, pa.*,
+               pl.detail, pl.dwn, pl.ytg, pl.yfog, pl.zone, pl.sg, pl.nh, pl.fd,
+               pl.succ AS play_succ, pl.eps, pl.epa,
+               g.v, g.h, pa.off = g.h AS off_is_home,
+               psr.pname AS psr_name, trg.pname AS trg_name
+        FROM passes pa
+        LEFT JOIN plays pl ON pa.pid = pl.pid
+        LEFT JOIN games g ON pa.gid = g.gid
+        LEFT JOIN players psr ON pa.psr = psr.player
+        LEFT JOIN players trg ON pa.trg = trg.player
+        ORDER BY g.seas, pa.gid, pa.pid
+    """, ("passes", "plays", "games", "players")),
+    ("rushes_wide", """
+        SELECT g.seas, g.wk, r.*,
+               pl.detail, pl.dwn, pl.ytg, pl.yfog, pl.zone, pl.sg, pl.nh, pl.fd,
+               pl.succ AS play_succ, pl.eps, pl.epa,
+               g.v, g.h, r.off = g.h AS off_is_home,
+               bc.pname AS bc_name
+        FROM rushes r
+        LEFT JOIN plays pl ON r.pid = pl.pid
+        LEFT JOIN games g ON r.gid = g.gid
+        LEFT JOIN players bc ON r.bc = bc.player
+        ORDER BY g.seas, r.gid, r.pid
+    """, ("rushes", "plays", "games", "players")),
+    ("sacks_wide", """
+        SELECT g.seas, g.wk, s.*,
+               pl.gid, pl.off, pl.def, pl.detail, pl.qtr, pl.min, pl.sec,
+               pl.dwn, pl.ytg, pl.yfog, pl.eps, pl.epa,
+               g.v, g.h, pl.off = g.h AS off_is_home,
+               qb.pname AS qb_name, sk.pname AS sk_name
+        FROM sacks s
+        LEFT JOIN plays pl ON s.pid = pl.pid
+        LEFT JOIN games g ON pl.gid = g.gid
+        LEFT JOIN players qb ON s.qb = qb.player
+        LEFT JOIN players sk ON s.sk = sk.player
+        ORDER BY g.seas, pl.gid, s.pid
+    """, ("sacks", "plays", "games", "players")),
+    ("penalties_wide", """
+        SELECT g.seas, g.wk, pen.*,
+               pl.gid, pl.off, pl.def, pl.type, pl.qtr, pl.dwn, pl.ytg, pl.yfog,
+               pl.ptso, pl.ptsd, pl.eps, pl.epa,
+               g.v, g.h, pl.off = g.h AS off_is_home,
+               pp.pname AS pen_name
+        FROM penalties pen
+        LEFT JOIN plays pl ON pen.pid = pl.pid
+        LEFT JOIN games g ON pl.gid = g.gid
+        LEFT JOIN players pp ON pen.pen = pp.player
+        ORDER BY g.seas, pl.gid, pen.pid
+    """, ("penalties", "plays", "games", "players")),
+]
@@ -7,12 +7,19 @@ Self-contained: paths are resolved relative to __file__ so this module
 works correctly regardless of working directory or sys.path order.
 """
 import os
+import sys
 import glob
+import time
+import atexit
 import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import NamedTuple
 
 import duckdb
 
+from app.canonical import CANONICAL_TABLES
+
 # ── Resolve paths relative to this file ──────────────────────────────────────
 _APP_DIR = Path(__file__).parent.resolve()
 _PROJ_DIR = _APP_DIR.parent.resolve()
@@ -32,92 +39,355 @@ def _choose_db_path() -> str:
 DB_PATH = _choose_db_path()
 DATA_DIR = str(_DATA_DIR)
 
+# "tables" (default): copy every parquet into nfl.duckdb at build time.
+# "views": no DB file at all — an in-memory DuckDB per process with views over
+#          read_parquet(); the joined tables in LAZY_TABLES are materialized
+#          the first time a query mentions them, except those over
+#          season-partitioned datasets, which stay views so `seas` filters
+#          prune partitions.  Near-instant startup and no disk use, which
+#          suits read-only hosts (e.g. Streamlit Cloud).
+DB_MODE = os.environ.get("NFL_DB_MODE", "tables").strip().lower()
+if DB_MODE not in ("tables", "views"):
+    raise ValueError(f"NFL_DB_MODE must be 'tables' or 'views', got {DB_MODE!r}")
+
 _build_lock = threading.Lock()
 
+# One row per source parquet, written at build time and compared on startup.
+MANIFEST_TABLE = "_manifest"
+
+
+def _list_parquets(data_dir: str) -> dict:
+    """Map raw table name -> parquet source for every table in data_dir.
+
+    A source is a single TABLE.parquet file or a TABLE/ directory of
+    hive-partitioned seas=YYYY/*.parquet files (ingest.py's season-partitioned
+    export).  If both exist the dataset wins.
+    """
+    sources = {
+        Path(pf).stem: pf
+        for pf in sorted(glob.glob(os.path.join(data_dir, "*.parquet")))
+    }
+    for partition in sorted(glob.glob(os.path.join(data_dir, "*", "seas=*"))):
+        dataset = os.path.dirname(partition)
+        sources[Path(dataset).name] = dataset
+    if not sources:
+        raise FileNotFoundError(
+            f"No .parquet files found in {data_dir!r}. "
+            "Check that data_processed/ is committed to the repo."
+        )
+    return dict(sorted(sources.items()))
+
+
+def _source_files(path: str) -> list:
+    """The parquet file(s) behind a source: the file itself, or every
+    partition file of a dataset directory."""
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "seas=*", "*.parquet")))
+    return [path]
+
+
+def _source_stat(path: str) -> tuple:
+    """(total size, newest mtime) of a source.  For a dataset the directory's
+    own mtime is included, so a removed partition also registers."""
+    stats = [os.stat(f) for f in _source_files(path)]
+    size = sum(st.st_size for st in stats)
+    mtime = max([st.st_mtime for st in stats] + [os.stat(path).st_mtime])
+    return size, mtime
+
+
+def _read_parquet_sql(path: str) -> str:
+    """read_parquet() call for a source; datasets are read with hive
+    partitioning so `seas` filters prune whole partitions."""
+    # Use forward slashes — DuckDB requires them on all platforms
+    safe_path = path.replace("\\", "/")
+    if os.path.isdir(path):
+        return f"read_parquet('{safe_path}/seas=*/*.parquet', hive_partitioning = true)"
+    return f"read_parquet('{safe_path}')"
+
+
+def _file_sha256(path: str) -> str:
+    import hashlib
+    h = hashlib.sha256()
+    for f in _source_files(path):
+        if f != path:
+            h.update(os.path.relpath(f, path).replace("\\", "/").encode())
+        with open(f, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def _fingerprint(path: str, sha256: str = None) -> dict:
+    size, mtime = _source_stat(path)
+    return {
+        "size_bytes": size,
+        "mtime": mtime,
+        "sha256": sha256 or _file_sha256(path),
+    }
+
+
+def _read_manifest(con) -> dict:
+    """Return {source: {size_bytes, mtime, sha256}} ({} if no manifest)."""
+    exists = con.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+        [MANIFEST_TABLE],
+    ).fetchone()[0]
+    if not exists:
+        return {}
+    rows = con.execute(
+        f"SELECT source, size_bytes, mtime, sha256 FROM {MANIFEST_TABLE}"
+    ).fetchall()
+    return {r[0]: {"size_bytes": r[1], "mtime": r[2], "sha256": r[3]} for r in rows}
+
+
+def _write_manifest(con, sources: dict, fingerprints: dict) -> None:
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+            source VARCHAR PRIMARY KEY, path VARCHAR, size_bytes BIGINT,
+            mtime DOUBLE, sha256 VARCHAR, loaded_at TIMESTAMP
+        )
+    """)
+    for name, fp in fingerprints.items():
+        con.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE source = ?", [name])
+        if fp is None:
+            continue
+        con.execute(
+            f"INSERT INTO {MANIFEST_TABLE} VALUES (?, ?, ?, ?, ?, current_timestamp)",
+            [name, sources[name], fp["size_bytes"], fp["mtime"], fp["sha256"]],
+        )
+
+
+def _changed_sources(manifest: dict, sources: dict) -> dict:
+    """Compare parquet files against the manifest.
+
+    Returns {source: fingerprint} for new, modified and removed files
+    (fingerprint None for removed).  Files whose size and mtime match the
+    manifest are not re-hashed; files that were only touched keep their
+    table but get a fresh manifest row.
+    """
+    changed = {}
+    for name, path in sources.items():
+        old = manifest.get(name)
+        size, mtime = _source_stat(path)
+        if old and old["size_bytes"] == size and old["mtime"] == mtime:
+            continue
+        fp = _fingerprint(path)
+        if old and old["sha256"] == fp["sha256"]:
+            fp["touched_only"] = True
+        changed[name] = fp
+    for name in manifest:
+        if name not in sources:
+            changed[name] = None
+    return changed
+
+
+# ── Catalog ──────────────────────────────────────────────────────────────────
+# Per-table metadata (row counts, schema, null rates, season range) written at
+# build time so pages can render overview numbers without scanning tables.
+CATALOG_TABLE = "_catalog"
+
+
+def _load_data_dictionary(data_dir: str) -> dict:
+    path = os.path.join(data_dir, "data_dictionary.json")
+    try:
+        import json
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _user_tables(con) -> list:
+    """Every table/view except internal ones (_manifest, _catalog, _mat_*)."""
+    rows = con.execute("""
+        SELECT table_name FROM information_schema.tables
+        WHERE table_schema = 'main' AND table_name NOT LIKE '\\_%' ESCAPE '\\'
+        ORDER BY table_name
+    """).fetchall()
+    return [r[0] for r in rows]
+
+
+def _profile_table(con, name: str, seed: dict = None) -> dict:
+    """Catalog row for one table: one DESCRIBE plus at most one scan.
+
+    Null rates and season range come from `seed` (a data_dictionary.json
+    entry) when its row count and columns still match the table.
+    """
+    schema = con.execute(f'DESCRIBE "{name}"').fetchall()
+    columns = [r[0] for r in schema]
+    dtypes = [r[1] for r in schema]
+    row_count = con.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+
+    if seed and seed.get("row_count") == row_count and seed.get("columns") == columns:
+        by_col = seed.get("missing_by_column") or {}
+        null_pct = [float(by_col.get(c) or 0.0) for c in columns]
+        season = seed.get("season_range") or (None, None)
+        source = "data_dictionary"
+    else:
+        exprs = [f'COUNT("{c}")' for c in columns]
+        if "seas" in columns:
+            exprs += ['MIN("seas")', 'MAX("seas")']
+        counts = con.execute(f'SELECT {", ".join(exprs)} FROM "{name}"').fetchone()
+        null_pct = [
+            round(100.0 * (row_count - n) / row_count, 2) if row_count else 0.0
+            for n in counts[:len(columns)]
+        ]
+        season = counts[len(columns):] if "seas" in columns else (None, None)
+        source = "computed"
 
-def _build_db_from_parquets(db_path: str, data_dir: str) -> None:
-    """Build nfl.duckdb from parquet files when the DB doesn't exist."""
+    return {
+        "table_name": name,
+        "kind": "canonical" if name in {n for n, _, _ in CANONICAL_TABLES} else "raw",
+        "row_count": row_count,
+        "column_count": len(columns),
+        "columns": columns,
+        "dtypes": dtypes,
+        "null_pct": null_pct,
+        "missing_pct": round(sum(null_pct) / len(null_pct), 2) if null_pct else 0.0,
+        "season_min": int(season[0]) if season[0] is not None else None,
+        "season_max": int(season[1]) if season[1] is not None else None,
+        "source": source,
+    }
+
+
+def _build_catalog_rows(con, names: list, data_dir: str) -> list:
+    seeds = _load_data_dictionary(data_dir)
+    return [_profile_table(con, name, seeds.get(name)) for name in names]
+
+
+def _write_catalog(con, rows: list, drop: list = ()) -> None:
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (
+            table_name VARCHAR PRIMARY KEY, kind VARCHAR, row_count BIGINT,
+            column_count INTEGER, columns VARCHAR[], dtypes VARCHAR[],
+            null_pct DOUBLE[], missing_pct DOUBLE, season_min INTEGER,
+            season_max INTEGER, source VARCHAR, built_at TIMESTAMP
+        )
+    """)
+    for name in list(drop) + [r["table_name"] for r in rows]:
+        con.execute(f"DELETE FROM {CATALOG_TABLE} WHERE table_name = ?", [name])
+    for r in rows:
+        con.execute(
+            f"INSERT INTO {CATALOG_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, current_timestamp)",
+            [r["table_name"], r["kind"], r["row_count"], r["column_count"], r["columns"],
+             r["dtypes"], r["null_pct"], r["missing_pct"], r["season_min"],
+             r["season_max"], r["source"]],
+        )
+
+
+def _load_raw_table(con, table_name: str, parquet_path: str) -> None:
+    con.execute(
+        f'CREATE OR REPLACE TABLE "{table_name}" AS '
+        f"SELECT * FROM {_read_parquet_sql(parquet_path)}"
+    )
+
+
+def _dependent_tables(dirty: set) -> list:
+    """Canonical tables (in build order) that depend on anything in `dirty`."""
+    dirty = set(dirty)
+    out = []
+    for name, _, deps in CANONICAL_TABLES:
+        if dirty.intersection(deps):
+            dirty.add(name)
+            out.append(name)
+    return out
+
+
+def _missing_canonical_tables(con) -> list:
+    """Canonical tables absent from the DB whose dependencies are all present.
+
+    Covers databases built before a table was added to CANONICAL_TABLES.
+    """
+    available = set(_user_tables(con))
+    missing = []
+    for name, _, deps in CANONICAL_TABLES:
+        if name not in available and all(d in available for d in deps):
+            missing.append(name)
+            available.add(name)
+    return missing
+
+
+def _build_canonical_tables(con, names=None) -> None:
+    for name, sql, _ in CANONICAL_TABLES:
+        if names is None or name in names:
+            con.execute(f"CREATE OR REPLACE TABLE {name} AS {sql}")
+
+
+BUILD_WORKERS = min(8, os.cpu_count() or 1)  # Concurrent CREATE TABLE statements
+
+
+def _run_build_jobs(con, jobs: list, workers: int = BUILD_WORKERS) -> dict:
+    """Run (name, deps, fn(cursor)) jobs concurrently, respecting deps.
+
+    Each job gets its own cursor on `con`; a job starts as soon as every
+    dependency that is itself a job has finished.  Returns {name: seconds}.
+    Stops submitting new work and re-raises on the first failure.
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    names = {name for name, _, _ in jobs}
+    waiting = {name: {d for d in deps if d in names} for name, deps, _ in jobs}
+    fns = {name: fn for name, _, fn in jobs}
+    timings = {}
+
+    def _run(name):
+        t0 = time.time()
+        cur = con.cursor()
+        try:
+            fns[name](cur)
+        finally:
+            cur.close()
+        return name, time.time() - t0
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        running = set()
+        while waiting or running:
+            ready = [n for n, deps in waiting.items() if not deps]
+            for name in ready:
+                del waiting[name]
+                running.add(pool.submit(_run, name))
+            if not running:
+                raise RuntimeError(f"Unresolvable build dependencies: {sorted(waiting)}")
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name, secs = fut.result()
+                timings[name] = secs
+                print(f"  ✅  Built {name} ({secs:.2f}s)")
+                for deps in waiting.values():
+                    deps.discard(name)
+    return timings
+
+
+def _build_db_from_parquets(db_path: str, data_dir: str) -> dict:
+    """Build nfl.duckdb from parquet files when the DB doesn't exist.
+
+    Raw parquet loads and canonical tables run on a worker pool; canonical
+    tables wait only for their own dependencies.  Returns per-table timings.
+    """
     import time
     t0 = time.time()
     print("⚙️  Building database from parquet files… (first-run only)")
 
     con = duckdb.connect(db_path)
     try:
-        parquet_files = sorted(glob.glob(os.path.join(data_dir, "*.parquet")))
-        if not parquet_files:
-            raise FileNotFoundError(
-                f"No .parquet files found in {data_dir!r}. "
-                "Check that data_processed/ is committed to the repo."
-            )
-
-        for pf in parquet_files:
-            table_name = Path(pf).stem
-            # Use forward slashes — DuckDB requires them on all platforms
-            safe_path = pf.replace("\\", "/")
-            con.execute(
-                f'CREATE TABLE IF NOT EXISTS "{table_name}" AS '
-                f"SELECT * FROM read_parquet('{safe_path}')"
-            )
-            print(f"  ✅  Loaded {table_name}")
-
-        # ── Canonical joined tables (mirrors ingest.py) ──────────────────────
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS games AS
-            SELECT g.gid, g.seas, g.wk, g.day, s.date,
-                   g.v, g.h, g.stad, g.temp, g.humd, g.wspd, g.wdir, g.cond, g.surf,
-                   g.ou, g.sprv, g.ptsv, g.ptsh
-            FROM "GAME" g LEFT JOIN "SCHEDULE" s ON g.gid = s.gid
-        """)
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS plays AS
-            SELECT gid, pid, detail, off, def, type, dseq, len, qtr, min, sec,
-                   ptso, ptsd, timo, timd, dwn, ytg, yfog, zone, yds, succ, fd,
-                   sg, nh, pts, bc, kne, dir, psr, comp, spk, loc, trg, dfb, eps, epa
-            FROM "PBP"
-        """)
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS drives AS
-            SELECT uid, gid, fpid, tname, drvn, obt, qtr, min, sec, yfog, plays,
-                   succ, rfd, pfd, ofd, ry, ra, py, pa, pc, peyf, peya, net, res
-            FROM "DRIVE"
-        """)
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS passes AS
-            SELECT p.pid, p.psr, p.trg, p.loc, p.yds, p.comp, p.succ, p.spk, p.dfb,
-                   pl.gid, pl.off, pl.def, pl.qtr, pl.min, pl.sec, pl.pts
-            FROM "PASS" p LEFT JOIN plays pl ON p.pid = pl.pid
-        """)
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS rushes AS
-            SELECT r.pid, r.bc, r.dir, r.yds, r.succ, r.kne,
-                   pl.gid, pl.off, pl.def, pl.qtr, pl.min, pl.sec, pl.pts
-            FROM "RUSH" r LEFT JOIN plays pl ON r.pid = pl.pid
-        """)
-
-        for view_name, sql in [
-            ("penalties",     'SELECT uid, pid, ptm, pen, "desc", cat, pey, act FROM "PENALTY"'),
-            ("sacks",         'SELECT uid, pid, qb, sk, value, ydsl FROM "SACK"'),
-            ("tackles",       'SELECT uid, pid, tck, value FROM "TACKLE"'),
-            ("players",       'SELECT * FROM "PLAYER"'),
-            ("offense_stats", 'SELECT * FROM "OFFENSE"'),
-            ("defense_stats", 'SELECT * FROM "DEFENSE"'),
-            ("injuries",      'SELECT * FROM "INJURY"'),
-            ("snaps",         'SELECT * FROM "SNAP"'),
-            ("redzone",       'SELECT * FROM "REDZONE"'),
-            ("fgxp",          'SELECT * FROM "FGXP"'),
-            ("touchdowns",    'SELECT * FROM "TD"'),
-            ("fumbles",       'SELECT * FROM "FUMBLE"'),
-            ("interceptions", 'SELECT * FROM "INTERCPT"'),
-            ("kickoffs",      'SELECT * FROM "KOFF"'),
-            ("punts",         'SELECT * FROM "PUNT"'),
-            ("blocks",        'SELECT * FROM "BLOCK"'),
-            ("conversions",   'SELECT * FROM "CONV"'),
-            ("safeties",      'SELECT * FROM "SAFETY"'),
-        ]:
-            con.execute(f"CREATE TABLE IF NOT EXISTS {view_name} AS {sql}")
+        sources = _list_parquets(data_dir)
+        jobs = [
+            (table_name, (), lambda cur, t=table_name, pf=pf: _load_raw_table(cur, t, pf))
+            for table_name, pf in sources.items()
+        ]
+        jobs += [
+            (name, deps, lambda cur, n=name, q=sql: cur.execute(f"CREATE OR REPLACE TABLE {n} AS {q}"))
+            for name, sql, deps in CANONICAL_TABLES
+        ]
+        timings = _run_build_jobs(con, jobs)
+        _write_manifest(con, sources, {name: _fingerprint(pf) for name, pf in sources.items()})
+        _write_catalog(con, _build_catalog_rows(con, _user_tables(con), data_dir))
 
         elapsed = round(time.time() - t0, 1)
-        print(f"✅  Database ready ({elapsed}s)")
+        slowest = sorted(timings.items(), key=lambda kv: -kv[1])[:3]
+        print(f"✅  Database ready ({elapsed}s; slowest: "
+              + ", ".join(f"{n} {s:.1f}s" for n, s in slowest) + ")")
     except Exception as exc:
         con.close()
         try:
@@ -126,43 +396,1025 @@ def _build_db_from_parquets(db_path: str, data_dir: str) -> None:
             pass
         raise RuntimeError(f"Failed to build DuckDB from parquets: {exc}") from exc
     con.close()
+    return timings
+
+
+def _refresh_db_from_parquets(db_path: str, data_dir: str, changed: dict = None) -> list:
+    """Re-create only the raw tables whose parquet changed, plus dependents,
+    and build any canonical tables the DB does not have yet.
+
+    Runs in a single transaction, so a failed refresh leaves the previous
+    database intact.  Returns the list of tables that were rebuilt.
+    """
+    import time
+    t0 = time.time()
+    con = duckdb.connect(db_path)
+    try:
+        sources = _list_parquets(data_dir)
+        if changed is None:
+            changed = _changed_sources(_read_manifest(con), sources)
+        missing = _missing_canonical_tables(con)
+        if not changed and not missing:
+            return []
+        dirty = {n for n, fp in changed.items() if not (fp and fp.get("touched_only"))}
+        stale = set(_dependent_tables(dirty | set(missing))) | set(missing)
+        canonical = [name for name, _, _ in CANONICAL_TABLES if name in stale]
+        print(f"⚙️  Refreshing database: {', '.join(sorted(dirty) + missing) or 'manifest only'}")
+
+        con.execute("BEGIN TRANSACTION")
+        try:
+            for name in sorted(dirty):
+                if changed[name] is None:
+                    con.execute(f'DROP TABLE IF EXISTS "{name}"')
+                    print(f"  🗑️  Dropped {name}")
+                else:
+                    _load_raw_table(con, name, sources[name])
+                    print(f"  ✅  Reloaded {name}")
+            _build_canonical_tables(con, set(canonical))
+            _write_manifest(con, sources, changed)
+            existing = set(_user_tables(con))
+            rebuilt = [n for n in sorted(dirty) + canonical if n in existing]
+            _write_catalog(
+                con,
+                _build_catalog_rows(con, rebuilt, data_dir),
+                drop=[n for n in dirty if n not in existing],
+            )
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+
+        elapsed = round(time.time() - t0, 1)
+        print(f"✅  Database refreshed: {len(dirty)} raw + {len(canonical)} canonical tables ({elapsed}s)")
+        return sorted(dirty) + canonical
+    except Exception as exc:
+        raise RuntimeError(f"Failed to refresh DuckDB from parquets: {exc}") from exc
+    finally:
+        con.close()
+
+
+# ── Views-over-parquet mode ──────────────────────────────────────────────────
+LAZY_TABLES = (
+    "games", "team_games", "passes", "rushes",
+    "plays_wide", "passes_wide", "rushes_wide", "sacks_wide", "penalties_wide",
+)
+
+_materialize_lock = threading.Lock()
+_materialized = set()
+# LAZY_TABLES left as views because they read `seas` from a partition
+_season_views = set()
+
+_SQL_KEYWORDS = {"LEFT", "RIGHT", "INNER", "JOIN", "ON", "WHERE", "ORDER", "GROUP"}
+
+
+def _season_view_sql(sql: str, seasoned: set):
+    """Views-mode variant of a canonical SELECT that reads `seas` from a
+    season-partitioned source, or None if it needs none.
+
+    `seasoned` names the views exposing a hive `seas` column.  The variant
+    takes `seas` from the first such source in the FROM / JOIN clauses
+    instead of the games join (or adds it), and joins between two of them
+    also match on `seas`.  A `seas` filter on the view then reaches every
+    partitioned scan in it and skips the other seasons' files.  ORDER BY
+    is dropped, since it only lays out a materialized table.
+    """
+    import re
+    aliases = []
+    for name, alias in re.findall(r'(?:FROM|JOIN)\s+"?(\w+)"?(?:[ \t]+(\w+))?', sql):
+        if name in seasoned:
+            aliases.append(name if not alias or alias.upper() in _SQL_KEYWORDS else alias)
+    select, rest = re.split(r"\bFROM\b", sql, maxsplit=1)
+    if not aliases or re.search(r"\bSELECT\s+\*\s*$", select):
+        return None  # no partitioned source, or `*` already passes seas through
+    first = aliases[0]
+    select = re.sub(rf"\b({'|'.join(aliases)})\.\*", r"\1.* EXCLUDE (seas)", select)
+    if re.search(r"\bg\.seas\b", select):
+        select = re.sub(r"\bg\.seas\b", f"{first}.seas", select)
+    else:
+        select = f"{select.rstrip()}, {first}.seas\n        "
+    rest = re.sub(r"\s+ORDER BY .*$", "\n    ", rest, flags=re.DOTALL)
+    for alias in aliases[1:]:
+        rest = re.sub(
+            rf"(JOIN\s+\S+\s+{alias}\s+ON\s+({'|'.join(aliases)})\.(\w+)\s*=\s*{alias}\.\3)\b",
+            rf"\1 AND \2.seas = {alias}.seas",
+            rest,
+        )
+    return f"{select}FROM{rest}"
+
+
+def _parquet_views_connection(data_dir: str = None):
+    """In-memory DuckDB with every raw and canonical table defined as a view.
+
+    Canonical views whose raw parquet is missing are skipped with a warning
+    rather than failing the whole app, since nothing is copied up front.
+    Views over season-partitioned datasets expose the partitions' `seas`
+    (see _season_view_sql()); the LAZY_TABLES among them stay views, since
+    materializing would read every season.
+    """
+    data_dir = data_dir or DATA_DIR
+    con = duckdb.connect(":memory:")
+    sources = _list_parquets(data_dir)
+    for table_name, pf in sources.items():
+        con.execute(
+            f'CREATE VIEW "{table_name}" AS '
+            f"SELECT * FROM {_read_parquet_sql(pf)}"
+        )
+    available = set(sources)
+    seasoned = {t for t, pf in sources.items() if os.path.isdir(pf)}
+    season_views = set()
+    for name, sql, deps in CANONICAL_TABLES:
+        missing = [d for d in deps if d not in available]
+        if missing:
+            print(f"⚠️  Skipping view {name}: missing {', '.join(missing)}")
+            continue
+        season_sql = _season_view_sql(sql, seasoned)
+        if season_sql is not None:
+            sql = season_sql
+            seasoned.add(name)
+            season_views.add(name)
+        con.execute(f"CREATE VIEW {name} AS {sql}")
+        available.add(name)
+    with _materialize_lock:
+        _season_views.clear()
+        _season_views.update(season_views.intersection(LAZY_TABLES))
+    return con
+
+
+def _pooled_views_connection():
+    # A new in-memory root starts with every LAZY_TABLES entry as a plain view.
+    with _materialize_lock:
+        _materialized.clear()
+    return _parquet_views_connection()
+
+
+def _ensure_materialized(con, sql: str) -> None:
+    """Materialize any LAZY_TABLES the statement references (views mode only).
+
+    The view is swapped to point at a real table, so concurrent readers see
+    either the join view or the finished table, never a missing name.
+    """
+    import re
+    wanted = [
+        t for t in LAZY_TABLES
+        if t not in _materialized and t not in _season_views and re.search(rf"\b{t}\b", sql, re.IGNORECASE)
+    ]
+    if not wanted:
+        return
+    sqls = {name: q for name, q, _ in CANONICAL_TABLES}
+    with _materialize_lock:
+        for name in wanted:
+            if name in _materialized:
+                continue
+            con.execute(f'CREATE OR REPLACE TABLE "_mat_{name}" AS {sqls[name]}')
+            con.execute(f'CREATE OR REPLACE VIEW {name} AS SELECT * FROM "_mat_{name}"')
+            _materialized.add(name)
+
+
+def _stale_sources(db_path: str, data_dir: str) -> tuple:
+    """Cheap startup check: parquets that differ from the DB's manifest, and
+    canonical tables that have not been built yet."""
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        changed = _changed_sources(_read_manifest(con), _list_parquets(data_dir))
+        return changed, _missing_canonical_tables(con)
+    finally:
+        con.close()
 
 
 def _ensure_db() -> None:
-    """Build DB if needed (thread-safe).  Called once at module import."""
-    if not os.path.exists(DB_PATH):
-        with _build_lock:
-            if not os.path.exists(DB_PATH):
-                _build_db_from_parquets(DB_PATH, DATA_DIR)
+    """Build DB if needed, or refresh tables whose parquet changed (thread-safe).
+
+    Called once at module import.  A no-op in views mode.
+    """
+    if DB_MODE == "views":
+        return
+    with _build_lock:
+        if not os.path.exists(DB_PATH):
+            _build_db_from_parquets(DB_PATH, DATA_DIR)
+            return
+        try:
+            changed, missing = _stale_sources(DB_PATH, DATA_DIR)
+            if changed or missing:
+                _refresh_db_from_parquets(DB_PATH, DATA_DIR, changed)
+        except Exception as exc:
+            # Another process may hold the DB open; serve the existing build.
+            print(f"⚠️  Skipping database refresh: {exc}")
 
 
 # Build at import time — no Streamlit UI calls here
 _ensure_db()
 
 
+# ── Connection pool ───────────────────────────────────────────────────────────
+# Every Streamlit rerun issues several queries from the script thread of each
+# session.  Opening a fresh duckdb.connect() per query pays catalog load and a
+# cold buffer cache each time, so instead we keep one read-only database handle
+# per process and hand out warm cursors on it.  Cursors share the same buffer
+# manager but are independent connections, so each is used by one thread at a
+# time and returned to the pool afterwards.
+
+POOL_MAX_SIZE = 8            # Max cursors checked out at once (per process)
+POOL_ACQUIRE_TIMEOUT = 30.0  # Seconds to wait for a free cursor before failing
+
+
+class ConnectionPool:
+    """Bounded pool of warm read-only DuckDB cursors on one shared database."""
+
+    def __init__(self, db_path: str, max_size: int = POOL_MAX_SIZE, connect=None):
+        self.db_path = db_path
+        self._connect = connect or (lambda: duckdb.connect(self.db_path, read_only=True))
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._root = None
+        self._idle = []
+        self._generation = 0   # bumped by close_all(); stale cursors are dropped
+        self._checked_out = {}  # id(cursor) -> generation it was opened under
+
+    def _root_connection(self):
+        # Caller holds self._lock.
+        if self._root is None:
+            self._root = self._connect()
+        return self._root
+
+    @staticmethod
+    def _is_healthy(con) -> bool:
+        try:
+            con.execute("SELECT 1").fetchone()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: float = POOL_ACQUIRE_TIMEOUT):
+        """Check out a cursor, blocking while `max_size` are already in use."""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(
+                f"No free DuckDB connection after {timeout}s "
+                f"(pool size {self.max_size})"
+            )
+        try:
+            while True:
+                with self._lock:
+                    con = self._idle.pop() if self._idle else None
+                    if con is None:
+                        con = self._root_connection().cursor()
+                        self._checked_out[id(con)] = self._generation
+                        return con
+                if self._is_healthy(con):
+                    with self._lock:
+                        self._checked_out[id(con)] = self._generation
+                    return con
+                _close_quietly(con)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, con, discard: bool = False) -> None:
+        """Return a cursor to the pool (or close it if `discard`)."""
+        try:
+            with self._lock:
+                generation = self._checked_out.pop(id(con), None)
+                if not discard and generation == self._generation:
+                    self._idle.append(con)
+                    return
+            _close_quietly(con)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled cursor for the duration of a `with` block."""
+        con = self.acquire()
+        discard = False
+        try:
+            yield con
+        except duckdb.ConnectionException:
+            discard = True
+            raise
+        finally:
+            self.release(con, discard=discard)
+
+    def close_all(self) -> None:
+        """Close idle cursors and the shared database handle.
+
+        Cursors currently checked out are closed when they are released.
+        The next acquire() reopens the database, so this is also how callers
+        drop a stale handle after the DB file has been rebuilt.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+            root, self._root = self._root, None
+            self._generation += 1
+        for con in idle:
+            _close_quietly(con)
+        if root is not None:
+            _close_quietly(root)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "idle": len(self._idle),
+                "open": self._root is not None,
+            }
+
+
+def _close_quietly(con) -> None:
+    try:
+        con.close()
+    except Exception:
+        pass
+
+
+_pool = ConnectionPool(
+    DB_PATH, connect=_pooled_views_connection if DB_MODE == "views" else None
+)
+atexit.register(_pool.close_all)
+
+
+# ── Persistent result cache ─────────────────────────────────────────────────
+# st.cache_data is per process and per function.  This cache is shared by every
+# Streamlit worker on the host: results are stored as zstd-compressed Arrow IPC
+# files keyed by (normalized SQL, params, database fingerprint), so a rebuilt
+# DB or changed parquet automatically misses and old entries age out via LRU.
+
+RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _choose_cache_dir() -> str:
+    candidate = str(_DATA_DIR / ".query_cache")
+    if os.name == "nt" or os.access(str(_DATA_DIR), os.W_OK):
+        return candidate
+    return "/tmp/nfl_query_cache"
+
+
+RESULT_CACHE_DIR = _choose_cache_dir()
+
+
+def db_fingerprint() -> str:
+    """Identify the data a query would see, for cache keys.
+
+    Tables mode: the DB file's size/mtime (only builds and refreshes write
+    it).  Views mode: every parquet's size/mtime.  Both include the canonical
+    table SQL, so editing a definition also invalidates.
+    """
+    import hashlib
+    h = hashlib.sha256(DB_MODE.encode())
+    if DB_MODE == "views":
+        paths = sorted(_list_parquets(DATA_DIR).values())
+    else:
+        paths = [DB_PATH]
+    for path in paths:
+        size, mtime = _source_stat(path)
+        h.update(f"{Path(path).name}:{size}:{mtime}".encode())
+    for name, sql, _ in CANONICAL_TABLES:
+        h.update(f"{name}:{sql}".encode())
+    return h.hexdigest()[:16]
+
+
+class ResultCache:
+    """Disk-backed, cross-process LRU cache of Arrow query results."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(sql: str, params=None) -> str:
+        import hashlib
+        import json
+        normalized = " ".join(sql.split())
+        payload = json.dumps(
+            [normalized, list(params) if params else None, db_fingerprint()],
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.arrow")
+
+    def get(self, key: str):
+        """Return the cached pyarrow.Table, or None on a miss."""
+        import pyarrow as pa
+        path = self._path(key)
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            os.utime(path)  # bump recency for LRU across processes
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, pa.ArrowInvalid):
+            # Partially written or corrupt entry — drop it and recompute.
+            self.misses += 1
+            _remove_quietly(path)
+            return None
+        self.hits += 1
+        return table
+
+    def put(self, key: str, table) -> None:
+        import pyarrow as pa
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            options = pa.ipc.IpcWriteOptions(compression="zstd")
+            with pa.OSFile(tmp, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                    writer.write_table(table)
+            os.replace(tmp, path)  # atomic: readers never see a partial file
+        except OSError:
+            _remove_quietly(tmp)
+            return
+        self.evict()
+
+    def _entries(self) -> list:
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith(".arrow"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self) -> None:
+        """Delete least-recently-used entries until under the byte budget."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            _remove_quietly(path)
+            total -= size
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            _remove_quietly(path)
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_result_cache = ResultCache(RESULT_CACHE_DIR)
+
+
+# ── Query instrumentation ───────────────────────────────────────────────────
+# Opt-in (NFL_QUERY_PROFILE=1 or enable_profiling()).  Every query records wall
+# time, rows, result bytes, cache outcome and the calling page/function into an
+# in-memory ring buffer and, if configured, a JSONL log shared by all workers.
+# Queries slower than `explain_slower_than` also get an EXPLAIN ANALYZE plan.
+
+PROFILE_RING_SIZE = 5000
+PROFILE_LOG_PATH = os.path.join(os.path.dirname(DB_PATH), "query_log.jsonl")
+# Columns query_log() always returns, whatever the recorded queries logged
+QUERY_LOG_COLUMNS = ("wall_ms", "rows", "bytes", "cache", "page", "function", "sql", "params", "error")
+
+def _internal_files() -> set:
+    import contextlib
+    return {os.path.abspath(__file__), os.path.abspath(contextlib.__file__)}
+
+
+_INTERNAL_FILES = _internal_files()
+
+
+class QueryProfiler:
+    """Ring buffer (+ optional JSONL log) of per-query timings."""
+
+    def __init__(self, ring_size: int = PROFILE_RING_SIZE):
+        from collections import deque
+        self.enabled = False
+        self.log_path = None
+        self.explain_slower_than = None
+        self.records = deque(maxlen=ring_size)
+        self._lock = threading.Lock()
+        self._explained = set()
+
+    def enable(self, log_path: str = None, explain_slower_than: float = None) -> None:
+        self.log_path = log_path
+        self.explain_slower_than = explain_slower_than
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def record(self, rec: dict, sql: str, params=None) -> None:
+        if (
+            self.explain_slower_than is not None
+            and rec["wall_ms"] >= self.explain_slower_than * 1000
+            and "error" not in rec
+        ):
+            rec["explain"] = self._explain(sql, params)
+        with self._lock:
+            self.records.append(rec)
+            if self.log_path:
+                import json
+                try:
+                    with open(self.log_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(rec, default=str) + "\n")
+                except OSError:
+                    pass
+
+    def _explain(self, sql: str, params=None):
+        # Profile each distinct statement once; the plan shape rarely changes.
+        normalized = " ".join(sql.split())
+        with self._lock:
+            if normalized in self._explained:
+                return None
+            self._explained.add(normalized)
+        try:
+            with _pool.connection() as con:
+                rows = _execute(con, f"EXPLAIN ANALYZE {sql}", params).fetchall()
+            return "\n".join(str(r[-1]) for r in rows)
+        except Exception as exc:
+            return f"EXPLAIN ANALYZE failed: {exc}"
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return list(self.records)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+            self._explained.clear()
+
+
+_call_site = threading.local()  # set by query_many() workers to the submitter's site
+
+
+def _calling_site():
+    """(page, function) of the first caller outside this module."""
+    inherited = getattr(_call_site, "value", None)
+    if inherited is not None:
+        return inherited
+    frame = sys._getframe(1)
+    while frame is not None and os.path.abspath(frame.f_code.co_filename) in _INTERNAL_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return None, None
+    return Path(frame.f_code.co_filename).stem, frame.f_code.co_name
+
+
+def _result_size(result):
+    """(rows, bytes) for a pandas, Arrow or Polars result."""
+    if hasattr(result, "num_rows"):        # pyarrow.Table
+        return result.num_rows, result.nbytes
+    if hasattr(result, "estimated_size"):  # polars.DataFrame
+        return result.height, result.estimated_size()
+    return len(result), int(result.memory_usage(index=True).sum())
+
+
+@contextmanager
+def _profiled(kind: str, sql: str, params=None, cache: bool = False):
+    """Time the wrapped query; the body fills in rec['result'] and rec['cache']."""
+    if not _profiler.enabled:
+        yield {}
+        return
+    page, function = _calling_site()
+    rec = {
+        "ts": time.time(),
+        "kind": kind,
+        "page": page,
+        "function": function,
+        "sql": " ".join(sql.split())[:2000],
+        "params": list(params) if params else None,
+        "cache": "miss" if cache else None,
+    }
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    except Exception as exc:
+        rec["error"] = str(exc)[:500]
+        raise
+    finally:
+        rec["wall_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        result = rec.pop("result", None)
+        if result is not None:
+            rec["rows"], rec["bytes"] = _result_size(result)
+        _profiler.record(rec, sql, params)
+
+
+_profiler = QueryProfiler()
+if os.environ.get("NFL_QUERY_PROFILE", "").strip() not in ("", "0"):
+    _explain_ms = os.environ.get("NFL_QUERY_EXPLAIN_MS")
+    _profiler.enable(
+        log_path=PROFILE_LOG_PATH,
+        explain_slower_than=float(_explain_ms) / 1000 if _explain_ms else None,
+    )
+
+
 # ── Public API ────────────────────────────────────────────────────────────────
 
 def get_connection():
-    """Return a fresh read-only DuckDB connection (caller must close it)."""
+    """Return a fresh read-only DuckDB connection (caller must close it).
+
+    Prefer `connection()` in app code; this bypasses the pool.  In views
+    mode this is a private in-memory database with its own views.
+    """
+    if DB_MODE == "views":
+        return _parquet_views_connection()
     return duckdb.connect(DB_PATH, read_only=True)
 
 
-def query(sql: str, params=None):
-    """Execute SQL and return a pandas DataFrame."""
-    con = get_connection()
-    try:
-        if params:
-            return con.execute(sql, params).fetchdf()
-        return con.execute(sql).fetchdf()
-    finally:
-        con.close()
+def connection():
+    """Context manager yielding a pooled read-only connection."""
+    return _pool.connection()
+
+
+def close_all_connections() -> None:
+    """Close every pooled connection (called automatically at exit)."""
+    _pool.close_all()
+
+
+def rebuild_db(full: bool = False) -> list:
+    """Pick up changed parquet files in data_processed/ without a restart.
+
+    Incremental by default: only raw tables whose parquet changed (by the
+    manifest's size/mtime/sha256) and the canonical tables that depend on
+    them are re-created.  `full=True` deletes and rebuilds everything.
+    Pooled connections are closed first, since DuckDB needs exclusive
+    access to write.  Returns the list of rebuilt tables.
+
+    In views mode there is nothing to rebuild: closing the pool drops the
+    in-memory database, and the next query re-creates the views (and lazily
+    re-materializes LAZY_TABLES) from the current parquet files.
+    """
+    with _build_lock:
+        _pool.close_all()
+        _result_cache.clear()
+        if DB_MODE == "views":
+            return []
+        if full or not os.path.exists(DB_PATH):
+            if os.path.exists(DB_PATH):
+                os.remove(DB_PATH)
+            _build_db_from_parquets(DB_PATH, DATA_DIR)
+            return sorted(_list_parquets(DATA_DIR)) + [name for name, _, _ in CANONICAL_TABLES]
+        return _refresh_db_from_parquets(DB_PATH, DATA_DIR)
+
+
+def _execute(con, sql: str, params=None):
+    if DB_MODE == "views":
+        _ensure_materialized(con, sql)
+    if params:
+        return con.execute(sql, params)
+    return con.execute(sql)
+
+
+def _fetch_arrow_table(result):
+    # duckdb >= 1.4 renamed fetch_arrow_table() -> to_arrow_table()
+    if hasattr(result, "to_arrow_table"):
+        return result.to_arrow_table()
+    return result.fetch_arrow_table()
 
 
-def query_polars(sql: str):
-    """Execute SQL and return a Polars DataFrame."""
-    import polars as pl
-    con = get_connection()
+def _fetch_arrow_reader(result, batch_size: int):
+    if hasattr(result, "to_arrow_reader"):
+        return result.to_arrow_reader(batch_size)
+    return result.fetch_record_batch(batch_size)
+
+
+def clear_query_cache() -> None:
+    """Delete every persisted query result (all processes share the cache)."""
+    _result_cache.clear()
+
+
+def _cached_arrow(sql: str, params=None, rec: dict = None):
+    key = _result_cache.key(sql, params)
+    table = _result_cache.get(key)
+    if table is None:
+        with _pool.connection() as con:
+            table = _fetch_arrow_table(_execute(con, sql, params))
+        _result_cache.put(key, table)
+    elif rec:
+        rec["cache"] = "hit"
+    return table
+
+
+def query(sql: str, params=None, arrow_dtypes: bool = False, cache: bool = False):
+    """Execute SQL and return a pandas DataFrame.
+
+    With `arrow_dtypes=True` the frame is built from DuckDB's Arrow result
+    and keeps Arrow-backed columns (pd.ArrowDtype), which avoids the object
+    dtype for strings and keeps integer columns nullable.
+
+    With `cache=True` the result goes through the persistent on-disk cache
+    shared by all app processes (see ResultCache).
+    """
+    with _profiled("pandas", sql, params, cache) as rec:
+        if cache:
+            table = _cached_arrow(sql, params, rec)
+            if arrow_dtypes:
+                import pandas as pd
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
+            else:
+                # Convert through DuckDB so dtypes match an uncached fetchdf().
+                with _pool.connection() as con:
+                    df = con.from_arrow(table).fetchdf()
+        else:
+            with _pool.connection() as con:
+                result = _execute(con, sql, params)
+                if arrow_dtypes:
+                    import pandas as pd
+                    df = _fetch_arrow_table(result).to_pandas(types_mapper=pd.ArrowDtype)
+                else:
+                    df = result.fetchdf()
+        rec["result"] = df
+    return df
+
+
+def query_arrow(sql: str, params=None, cache: bool = False):
+    """Execute SQL and return a pyarrow.Table (no pandas round-trip)."""
+    with _profiled("arrow", sql, params, cache) as rec:
+        if cache:
+            table = _cached_arrow(sql, params, rec)
+        else:
+            with _pool.connection() as con:
+                table = _fetch_arrow_table(_execute(con, sql, params))
+        rec["result"] = table
+    return table
+
+
+def iter_arrow_batches(sql: str, params=None, batch_size: int = 1_000_000):
+    """Yield pyarrow.RecordBatch chunks of a result without materializing it.
+
+    The pooled connection is held until the generator is exhausted or closed.
+    """
+    with _pool.connection() as con:
+        reader = _fetch_arrow_reader(_execute(con, sql, params), batch_size)
+        for batch in reader:
+            yield batch
+
+
+def query_polars(sql: str, params=None, cache: bool = False):
+    """Execute SQL and return a Polars DataFrame (zero-copy via Arrow)."""
+    with _profiled("polars", sql, params, cache) as rec:
+        if cache:
+            import polars as pl
+            df = pl.from_arrow(_cached_arrow(sql, params, rec))
+        else:
+            with _pool.connection() as con:
+                df = _execute(con, sql, params).pl()
+        rec["result"] = df
+    return df
+
+
+def enable_profiling(log_path: str = PROFILE_LOG_PATH, explain_slower_than: float = None) -> None:
+    """Start recording every query (see QueryProfiler).
+
+    `log_path=None` keeps records in memory only; `explain_slower_than`
+    (seconds) attaches an EXPLAIN ANALYZE plan to slow statements.
+    """
+    _profiler.enable(log_path=log_path, explain_slower_than=explain_slower_than)
+
+
+def disable_profiling() -> None:
+    _profiler.disable()
+
+
+def profiling_enabled() -> bool:
+    return _profiler.enabled
+
+
+def query_log(include_file: bool = False):
+    """Recorded queries as a pandas DataFrame (newest last).
+
+    `include_file=True` reads the JSONL log instead of this process's ring
+    buffer, which covers every worker that shares the log.
+    """
+    import pandas as pd
+    if include_file and _profiler.log_path and os.path.exists(_profiler.log_path):
+        log = pd.read_json(_profiler.log_path, lines=True)
+    else:
+        log = pd.DataFrame(_profiler.snapshot())
+    # rows / bytes only exist once a query returned something, and error only
+    # once one failed, so pin the columns callers aggregate on.
+    extra = [c for c in log.columns if c not in QUERY_LOG_COLUMNS]
+    log = log.reindex(columns=list(QUERY_LOG_COLUMNS) + extra)
+    for column in QUERY_LOG_COLUMNS:
+        if column in ("wall_ms", "rows", "bytes"):
+            log[column] = pd.to_numeric(log[column], errors="coerce").astype(float)
+        else:
+            log[column] = log[column].astype(object)
+    return log
+
+
+def cache_stats() -> dict:
+    """Persistent result cache and connection pool counters."""
+    return {"result_cache": _result_cache.stats(), "pool": _pool.stats()}
+
+
+# ── Concurrent execution ────────────────────────────────────────────────────
+_executor = None
+_executor_lock = threading.Lock()
+
+_QUERY_FUNCS = {"pandas": query, "arrow": query_arrow, "polars": query_polars}
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            # No point running more queries at once than there are pooled cursors.
+            _executor = ThreadPoolExecutor(
+                max_workers=_pool.max_size, thread_name_prefix="nfl-query"
+            )
+            atexit.register(_executor.shutdown, wait=False)
+        return _executor
+
+
+def _run_with_site(site, func, *args, **kwargs):
+    _call_site.value = site
     try:
-        return pl.from_pandas(con.execute(sql).fetchdf())
+        return func(*args, **kwargs)
     finally:
-        con.close()
+        _call_site.value = None
+
+
+def submit_query(sql: str, params=None, kind: str = "pandas", **kwargs):
+    """Run a query on the shared worker pool; returns a concurrent Future.
+
+    `kind` is "pandas", "arrow" or "polars"; other kwargs (cache,
+    arrow_dtypes) go to the matching query function.
+    """
+    func = _QUERY_FUNCS[kind]
+    site = _calling_site() if _profiler.enabled else None
+    return _get_executor().submit(_run_with_site, site, func, sql, params, **kwargs)
+
+
+def query_many(queries, kind: str = "pandas", **kwargs):
+    """Run independent queries concurrently and return all results together.
+
+    `queries` is a dict {name: sql | (sql, params)} or a list of the same
+    values; the result has the same shape (dict of frames or list of frames).
+    Wall time is bounded by the slowest query rather than the sum.  The
+    first failure is re-raised after every query has finished.
+    """
+    items = queries.items() if isinstance(queries, dict) else enumerate(queries)
+    futures = {}
+    for key, q in items:
+        sql, params = (q, None) if isinstance(q, str) else q
+        futures[key] = submit_query(sql, params, kind=kind, **kwargs)
+    results = {}
+    error = None
+    for key, fut in futures.items():
+        try:
+            results[key] = fut.result()
+        except Exception as exc:
+            error = error or exc
+    if error is not None:
+        raise error
+    if isinstance(queries, dict):
+        return results
+    return [results[i] for i in range(len(queries))]
+
+
+# ── Catalog API ─────────────────────────────────────────────────────────────
+_catalog_cache = {}
+_catalog_lock = threading.Lock()
+
+
+def catalog():
+    """Per-table metadata as a pandas DataFrame (one row per table).
+
+    Columns: table_name, kind, row_count, column_count, columns, dtypes,
+    null_pct, missing_pct, season_min, season_max, source.  Read from the
+    _catalog table written at build time (profiled on the fly for older
+    builds and in views mode), then cached per process until the database
+    fingerprint changes.
+    """
+    fingerprint = db_fingerprint()
+    with _catalog_lock:
+        df = _catalog_cache.get(fingerprint)
+        if df is None:
+            df = _load_catalog()
+            _catalog_cache.clear()
+            _catalog_cache[fingerprint] = df
+    return df.copy()
+
+
+def _load_catalog():
+    import pandas as pd
+    with _pool.connection() as con:
+        has_catalog = con.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+            [CATALOG_TABLE],
+        ).fetchone()[0]
+        if has_catalog:
+            df = con.execute(f"SELECT * EXCLUDE (built_at) FROM {CATALOG_TABLE}").fetchdf()
+            df["columns"] = df["columns"].map(list)
+            df["dtypes"] = df["dtypes"].map(list)
+            df["null_pct"] = df["null_pct"].map(list)
+        else:
+            df = pd.DataFrame(_build_catalog_rows(con, _user_tables(con), DATA_DIR))
+    return df.sort_values("table_name").set_index("table_name", drop=False)
+
+
+def table_info(name: str) -> dict:
+    """Catalog entry for one table (KeyError if unknown)."""
+    return catalog().loc[name].to_dict()
+
+
+# ── Dimensions API ──────────────────────────────────────────────────────────
+class Dimensions(NamedTuple):
+    """Option lists for sidebars and filters (see dimensions())."""
+    teams: tuple       # team codes, home or away in any game
+    seasons: tuple     # every season in games
+    stadiums: tuple
+    surfaces: tuple
+    play_types: tuple  # plays.type values (PASS, RUSH, ...)
+    players: tuple     # (player, pname, pos1) rows, by player id
+
+
+# Each query reads one small table.  Play types come from the data dictionary
+# (see _play_types()).
+_DIMENSION_SQL = {
+    "teams": """
+        SELECT team FROM (
+            SELECT v::VARCHAR AS team FROM games UNION SELECT h::VARCHAR FROM games
+        ) WHERE team IS NOT NULL ORDER BY team
+    """,
+    "stadiums": "SELECT DISTINCT stad FROM games WHERE stad IS NOT NULL ORDER BY stad",
+    "surfaces": "SELECT DISTINCT surf FROM games WHERE surf IS NOT NULL ORDER BY surf",
+    "players": "SELECT player, pname, pos1 FROM players WHERE player IS NOT NULL ORDER BY player",
+}
+
+_dimensions_cache = {}
+_dimensions_lock = threading.Lock()
+
+
+def dimensions() -> Dimensions:
+    """Team, season, stadium, surface, play-type and player lists.
+
+    Loaded once per process (and again only when the database fingerprint
+    changes), so sidebars can render on every rerun without touching the
+    fact tables.  Seasons come from the catalog's season range for games
+    and play types from the data dictionary; the rest are small queries
+    over games and players.  Every list is a tuple, so callers can't
+    change the shared copy.
+    """
+    fingerprint = db_fingerprint()
+    with _dimensions_lock:
+        dims = _dimensions_cache.get(fingerprint)
+        if dims is None:
+            dims = _load_dimensions()
+            _dimensions_cache.clear()
+            _dimensions_cache[fingerprint] = dims
+    return dims
+
+
+def _load_dimensions() -> Dimensions:
+    import pandas as pd
+    games = table_info("games")
+    if pd.isna(games["season_min"]):
+        seasons = ()
+    else:
+        seasons = tuple(range(int(games["season_min"]), int(games["season_max"]) + 1))
+    lists = {}
+    with _pool.connection() as con:
+        for name, sql in _DIMENSION_SQL.items():
+            rows = _execute(con, sql).fetchall()
+            lists[name] = tuple(rows) if name == "players" else tuple(r[0] for r in rows)
+        lists["play_types"] = _play_types(con)
+    return Dimensions(seasons=seasons, **lists)
+
+
+def _play_types(con) -> tuple:
+    """plays.type values, read without scanning plays.
+
+    Ingest records the play_type ENUM's values for PBP.type in
+    data_dictionary.json; dictionaries written before it did fall back to
+    one DISTINCT scan.
+    """
+    entry = _load_data_dictionary(DATA_DIR).get("PBP") or {}
+    values = (entry.get("values_by_column") or {}).get("type")
+    if values is None:
+        rows = _execute(con, "SELECT DISTINCT type FROM plays WHERE type IS NOT NULL").fetchall()
+        values = [r[0] for r in rows]
+    return tuple(sorted(values))
@@ -0,0 +1,89 @@
+"""ATS and over/under records over the team_games table.
+
+team_games (see CANONICAL_TABLES in app.canonical) has one row per team per game,
+with that team's line, cover margin and O/U result already computed at build
+time.  Every record here is therefore a single GROUP BY in DuckDB instead of
+a pandas loop over teams, and a team x season table costs the same one scan
+as a per-team table.
+"""
+from app.db import query
+
+# Columns records can be grouped by
+GROUP_COLUMNS = ("team", "opp", "seas", "wk", "day", "stad", "surf", "cond")
+
+
+def team_game_filters(seasons=None, weeks=None, temp=None, surfaces=None,
+                      teams=None, perspective=None) -> tuple:
+    """WHERE clause and params for the usual sidebar filters on team_games.
+
+    seasons, weeks and temp are inclusive (min, max) ranges; games with no
+    temperature are kept by a temp filter.  teams and surfaces are lists
+    (empty or None for all); perspective is 'Home' or 'Away' (None for
+    both).
+    """
+    clauses, params = [], []
+    if seasons is not None:
+        clauses.append("seas BETWEEN ? AND ?")
+        params += list(seasons)
+    if weeks is not None:
+        clauses.append("wk BETWEEN ? AND ?")
+        params += list(weeks)
+    if temp is not None:
+        clauses.append("(temp IS NULL OR temp BETWEEN ? AND ?)")
+        params += list(temp)
+    if surfaces:
+        clauses.append("list_contains(?, surf)")
+        params.append(list(surfaces))
+    if teams:
+        clauses.append("list_contains(?, team::VARCHAR)")
+        params.append(list(teams))
+    if perspective in ("Home", "Away"):
+        clauses.append("perspective = ?")
+        params.append(perspective)
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def ats_ou_records(by=("team",), overall: bool = True, **filters):
+    """Home, away and overall ATS and O/U records per `by` group.
+
+    One GROUPING SETS query over team_games: a row per group and
+    perspective ('Home' / 'Away'), plus an 'Overall' row per group when
+    `overall` is set.  `filters` are those of team_game_filters().  With
+    by=() the records are league-wide, where 'Overall' counts every game
+    once per team.
+
+    Columns: the `by` columns, perspective, games, ats_wins, ats_losses,
+    ats_pushes, ats_pct, overs, unders, ou_pushes, over_pct,
+    avg_cover_margin, avg_total, avg_ou_line.  Percentages are of all
+    games, pushes and games without a line included.
+    """
+    by = tuple(by)
+    unknown = [c for c in by if c not in GROUP_COLUMNS]
+    if unknown:
+        raise ValueError(f"Can't group team_games by {', '.join(unknown)}")
+    where, params = team_game_filters(**filters)
+
+    keys = ", ".join(by)
+    sets = f"({', '.join(by + ('perspective',))})" + (f", ({keys})" if overall else "")
+    select_keys = f"{keys}, " if by else ""
+    sql = f"""
+        SELECT {select_keys}
+               CASE WHEN GROUPING(perspective) = 1 THEN 'Overall' ELSE perspective END AS perspective,
+               COUNT(*) AS games,
+               COUNT(*) FILTER (WHERE covered) AS ats_wins,
+               COUNT(*) FILTER (WHERE NOT covered AND NOT pushed) AS ats_losses,
+               COUNT(*) FILTER (WHERE pushed) AS ats_pushes,
+               100.0 * COUNT(*) FILTER (WHERE covered) / COUNT(*) AS ats_pct,
+               COUNT(*) FILTER (WHERE ou_result = 'Over') AS overs,
+               COUNT(*) FILTER (WHERE ou_result = 'Under') AS unders,
+               COUNT(*) FILTER (WHERE ou_result = 'Push') AS ou_pushes,
+               100.0 * COUNT(*) FILTER (WHERE ou_result = 'Over') / COUNT(*) AS over_pct,
+               AVG(cover_margin)::DOUBLE AS avg_cover_margin,
+               AVG(total_pts)::DOUBLE AS avg_total,
+               AVG(ou)::DOUBLE AS avg_ou_line
+        FROM team_games
+        {where}
+        GROUP BY GROUPING SETS ({sets})
+        ORDER BY {select_keys}perspective
+    """
+    return query(sql, params, cache=True)
@@ -3,13 +3,17 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import pandas as pd
 import numpy as np
 import sys
 import os
+import time
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
-from app.db import query
+from app.db import dimensions, query
+from app.market import ats_ou_records
+from app.binning import SPREAD, WEATHER
+from app.bootstrap import rate_ci
+from app.backtest import BETS, backtest, strategy_grid
 from app.config import COLORS, TEAM_COLORS, SEASON_RANGE, SHARED_CSS, CHART_LAYOUT, metric_card, page_footer
 
 st.set_page_config(page_title="Market & CLV Lab", layout="wide", initial_sidebar_state="expanded")
@@ -50,7 +54,7 @@ with st.sidebar:
         step=1
     )
 
-    teams_list = query("SELECT DISTINCT v FROM games WHERE v IS NOT NULL ORDER BY v").iloc[:, 0].tolist()
+    teams_list = list(dimensions().teams)
     selected_teams = st.multiselect("Teams (Leave empty for all)", teams_list, default=[])
 
     game_perspective = st.radio("Game Perspective", ["All", "Home", "Away"], horizontal=True)
@@ -85,20 +89,9 @@ def load_games_data(season_min, season_max, week_min, week_max, temp_min, temp_m
     df['total_pts'] = df['ptsv'] + df['ptsh']
     df['ou_result'] = df['total_pts'] - df['ou']  # Positive = over hits
 
-    # Weather categorization
-    def categorize_weather(temp):
-        if pd.isna(temp):
-            return "Unknown"
-        if temp < 35:
-            return "Cold"
-        elif temp < 55:
-            return "Cool"
-        elif temp < 75:
-            return "Moderate"
-        else:
-            return "Warm"
-
-    df['weather_cat'] = df['temp'].apply(categorize_weather)
+    # Weather and spread buckets (ordered categoricals, see app.binning)
+    df['weather_cat'] = WEATHER.apply(df['temp'])
+    df['spread_bucket'] = SPREAD.apply(df['sprv'])
 
     # Dome identification (simplified)
     df['is_dome'] = df['cond'].astype(str).str.contains("DOME|INDOOR", case=False, na=False)
@@ -120,6 +113,19 @@ if selected_teams:
 if surface_filter:
     games_df = games_df[games_df['surf'].isin(surface_filter)]
 
+# Home / away / overall ATS and O/U records per team, from one group-by over
+# team_games; the perspective radio only narrows the selected teams' games
+team_records = ats_ou_records(
+    by=("team",),
+    seasons=season_range, weeks=week_range, temp=temp_range, surfaces=surface_filter,
+    teams=selected_teams,
+    perspective=game_perspective if selected_teams and game_perspective != "All" else None,
+)
+# 95% bootstrap intervals for the ATS and Over rates
+team_records['ats_lo'], team_records['ats_hi'] = rate_ci(team_records['ats_wins'], team_records['games'], scale=100)
+team_records['over_lo'], team_records['over_hi'] = rate_ci(team_records['overs'], team_records['games'], scale=100)
+overall_records = team_records[team_records['perspective'] == 'Overall']
+
 # ============================================================================
 # METRIC CARDS
 # ============================================================================
@@ -156,67 +162,29 @@ st.header("A) Against the Spread (ATS) Analysis")
 col_a1, col_a2 = st.columns(2)
 
 with col_a1:
-    # Home/Away ATS records by team
-    ats_records = []
-    for team in sorted(games_df['h'].unique()):
-        home_games = games_df[games_df['h'] == team]
-        away_games = games_df[games_df['v'] == team]
-
-        if len(home_games) > 0:
-            home_wins = (home_games['spread_result'] > 0).sum()
-            home_pushes = (home_games['spread_result'] == 0).sum()
-            ats_records.append({
-                'Team': team,
-                'Perspective': 'Home',
-                'Games': len(home_games),
-                'ATS_Wins': home_wins,
-                'Win%': home_wins / len(home_games) * 100,
-                'Pushes': home_pushes
-            })
-
-        if len(away_games) > 0:
-            away_wins = (away_games['spread_result'] < 0).sum()
-            away_pushes = (away_games['spread_result'] == 0).sum()
-            ats_records.append({
-                'Team': team,
-                'Perspective': 'Away',
-                'Games': len(away_games),
-                'ATS_Wins': away_wins,
-                'Win%': away_wins / len(away_games) * 100,
-                'Pushes': away_pushes
-            })
-
-        # Overall
-        all_games = pd.concat([home_games, away_games])
-        if len(all_games) > 0:
-            overall_wins = ((all_games['h'] == team) & (all_games['spread_result'] > 0)).sum() + \
-                          ((all_games['v'] == team) & (all_games['spread_result'] < 0)).sum()
-            overall_pushes = (all_games['spread_result'] == 0).sum()
-            ats_records.append({
-                'Team': team,
-                'Perspective': 'Overall',
-                'Games': len(all_games),
-                'ATS_Wins': overall_wins,
-                'Win%': overall_wins / len(all_games) * 100,
-                'Pushes': overall_pushes
-            })
-
-    ats_df = pd.DataFrame(ats_records).sort_values(['Team', 'Perspective'])
+    # Home/Away/Overall ATS records by team
+    ats_df = team_records[['team', 'perspective', 'games', 'ats_wins', 'ats_pct', 'ats_lo', 'ats_hi', 'ats_pushes']].rename(columns={
+        'team': 'Team', 'perspective': 'Perspective', 'games': 'Games',
+        'ats_wins': 'ATS_Wins', 'ats_pct': 'Win%', 'ats_lo': 'Win% Lo', 'ats_hi': 'Win% Hi',
+        'ats_pushes': 'Pushes',
+    })
+    ats_df['Team'] = ats_df['Team'].astype(str)
     # Apply team full names
     ats_df['Team'] = ats_df['Team'].map(lambda x: TEAM_FULL_NAMES.get(x, x))
 
-    st.subheader("ATS Record by Team & Perspective", help="Home/Away/Overall ATS records with win % and pushes")
+    st.subheader("ATS Record by Team & Perspective",
+                 help="Home/Away/Overall ATS records with win % (95% bootstrap interval) and pushes")
     st.dataframe(
-        ats_df.style.format({'Win%': '{:.1f}%', 'ATS_Wins': '{:.0f}'}),
+        ats_df.style.format({'Win%': '{:.1f}%', 'Win% Lo': '{:.1f}%', 'Win% Hi': '{:.1f}%', 'ATS_Wins': '{:.0f}'}),
         use_container_width=True,
         height=400
     )
 
 with col_a2:
-    # ATS Win% bar chart - need to recreate from original team codes since we mapped them
-    ats_summary_orig = pd.DataFrame(ats_records).sort_values(['Team', 'Perspective'])
-    ats_summary = ats_summary_orig[ats_summary_orig['Perspective'] == 'Overall'].sort_values('Win%', ascending=False).head(15)
-    ats_summary['Team Full'] = ats_summary['Team'].map(lambda x: TEAM_FULL_NAMES.get(x, x))
+    # ATS Win% bar chart
+    ats_summary = overall_records.rename(columns={'ats_pct': 'Win%', 'games': 'Games'})
+    ats_summary = ats_summary.sort_values('Win%', ascending=False).head(15)
+    ats_summary['Team Full'] = ats_summary['team'].astype(str).map(lambda x: TEAM_FULL_NAMES.get(x, x))
 
     fig_ats = go.Figure()
 
@@ -230,6 +198,9 @@ with col_a2:
         y=ats_summary['Team Full'],
         orientation='h',
         marker=dict(color=colors_list),
+        error_x=dict(type='data', symmetric=False,
+                     array=ats_summary['ats_hi'] - ats_summary['Win%'],
+                     arrayminus=ats_summary['Win%'] - ats_summary['ats_lo']),
         text=[f"{w:.1f}% (n={g})" for w, g in zip(ats_summary['Win%'], ats_summary['Games'])],
         textposition='auto',
         hovertemplate='<b>%{y}</b><br>ATS Win%: %{x:.1f}%<extra></extra>'
@@ -275,30 +246,19 @@ col_b1, col_b2 = st.columns(2)
 
 with col_b1:
     # O/U by team
-    ou_records = []
-    for team in sorted(games_df['h'].unique()):
-        home_games = games_df[games_df['h'] == team]
-        away_games = games_df[games_df['v'] == team]
-        all_games = pd.concat([home_games, away_games])
-
-        if len(all_games) > 0:
-            overs = (all_games['ou_result'] > 0).sum()
-            ou_records.append({
-                'Team': team,
-                'Games': len(all_games),
-                'Overs': overs,
-                'Over%': overs / len(all_games) * 100,
-                'Avg Total': all_games['total_pts'].mean(),
-                'Avg OU Line': all_games['ou'].mean()
-            })
-
-    ou_df = pd.DataFrame(ou_records).sort_values('Over%', ascending=False)
+    ou_df = overall_records[['team', 'games', 'overs', 'over_pct', 'over_lo', 'over_hi', 'avg_total', 'avg_ou_line']].rename(columns={
+        'team': 'Team', 'games': 'Games', 'overs': 'Overs', 'over_pct': 'Over%',
+        'over_lo': 'Over% Lo', 'over_hi': 'Over% Hi',
+        'avg_total': 'Avg Total', 'avg_ou_line': 'Avg OU Line',
+    }).sort_values('Over%', ascending=False)
+    ou_df['Team'] = ou_df['Team'].astype(str)
     # Apply team full names
     ou_df['Team'] = ou_df['Team'].map(lambda x: TEAM_FULL_NAMES.get(x, x))
 
-    st.subheader("O/U Records by Team", help="Over hit percentage and average total points vs line")
+    st.subheader("O/U Records by Team", help="Over hit percentage (95% bootstrap interval) and average total points vs line")
     st.dataframe(
-        ou_df.style.format({'Over%': '{:.1f}%', 'Avg Total': '{:.1f}', 'Avg OU Line': '{:.1f}'}),
+        ou_df.style.format({'Over%': '{:.1f}%', 'Over% Lo': '{:.1f}%', 'Over% Hi': '{:.1f}%',
+                            'Avg Total': '{:.1f}', 'Avg OU Line': '{:.1f}'}),
         use_container_width=True,
         height=400
     )
@@ -376,51 +336,16 @@ st.divider()
 # ============================================================================
 st.header("C) Spread Accuracy & Calibration")
 
-# Create spread buckets
-def bucket_spread(spread):
-    if pd.isna(spread):
-        return "Unknown"
-    spread = float(spread)
-    if spread <= -14:
-        return "-14 or more"
-    elif spread <= -10:
-        return "-10 to -13.5"
-    elif spread <= -7:
-        return "-7 to -9.5"
-    elif spread <= -3:
-        return "-3 to -6.5"
-    elif spread < 0:
-        return "-1 to -2.5"
-    elif spread == 0:
-        return "PK"
-    elif spread < 3:
-        return "+1 to +2.5"
-    elif spread < 7:
-        return "+3 to +6.5"
-    elif spread < 10:
-        return "+7 to +9.5"
-    else:
-        return "+10 or more"
-
-games_df['spread_bucket'] = games_df['sprv'].apply(bucket_spread)
-
 col_c1, col_c2 = st.columns(2)
 
 with col_c1:
     # Spread bucket outcomes
-    spread_calibration = games_df.groupby('spread_bucket').agg({
+    spread_calibration = games_df.groupby('spread_bucket', observed=True).agg({
         'spread_result': ['count', lambda x: (x > 0).sum(), lambda x: (x < 0).sum()]
     }).reset_index()
     spread_calibration.columns = ['Spread Bucket', 'Total Games', 'Home Covers', 'Away Covers']
     spread_calibration['Home Win%'] = (spread_calibration['Home Covers'] / spread_calibration['Total Games'] * 100)
 
-    # Order the buckets properly
-    bucket_order = ["-14 or more", "-10 to -13.5", "-7 to -9.5", "-3 to -6.5", "-1 to -2.5",
-                   "PK", "+1 to +2.5", "+3 to +6.5", "+7 to +9.5", "+10 or more"]
-    spread_calibration['Spread Bucket'] = pd.Categorical(spread_calibration['Spread Bucket'],
-                                                         categories=bucket_order, ordered=True)
-    spread_calibration = spread_calibration.sort_values('Spread Bucket')
-
     st.subheader("Spread Calibration by Range", help="Win % by spread range (should approach 50%)")
     st.dataframe(
         spread_calibration.style.format({'Home Win%': '{:.1f}%'}),
@@ -462,7 +387,7 @@ col_d1, col_d2 = st.columns(2)
 
 with col_d1:
     st.subheader("Weather Impact on ATS", help="Performance in different weather conditions")
-    weather_ats = games_df.groupby('weather_cat').agg({
+    weather_ats = games_df.groupby('weather_cat', observed=True).agg({
         'spread_result': ['count', lambda x: (x > 0).sum()]
     }).reset_index()
     weather_ats.columns = ['Weather', 'Games', 'Home Covers']
@@ -553,4 +478,81 @@ st.info("""
     - **Situational Splits**: Look for persistent edges in specific conditions (weather, dome, etc).
 """)
 
+st.divider()
+
+# ============================================================================
+# SECTION E: STRATEGY BACKTESTER
+# ============================================================================
+st.header("E) Strategy Backtester")
+st.markdown("Every combination of the conditions below is backtested over the filtered games: "
+            "1 unit per bet at -110, pushes refunded.")
+
+col_e1, col_e2, col_e3 = st.columns(3)
+with col_e1:
+    bt_bets = st.multiselect("Bets", list(BETS), default=list(BETS), key="bt_bets")
+    bt_min_bets = st.slider("Minimum Bets", 10, 200, 50, step=10, key="bt_min_bets")
+with col_e2:
+    bt_spreads = st.multiselect("Home Line", list(SPREAD.labels), default=list(SPREAD.labels), key="bt_spreads")
+    bt_weather = st.multiselect("Weather", list(WEATHER.labels), default=list(WEATHER.labels), key="bt_weather")
+with col_e3:
+    bt_wind = st.multiselect("Wind Above (mph)", [10, 15, 20], default=[10, 15, 20], key="bt_wind")
+    bt_venue = st.checkbox("Split Dome / Open Air", value=True, key="bt_venue")
+
+# Each column's options include "no condition" (None)
+strategies = strategy_grid(
+    bt_bets,
+    spread_bucket=[None] + [("==", label) for label in bt_spreads],
+    weather_cat=[None] + [("==", label) for label in bt_weather],
+    wspd=[None] + [(">", wind) for wind in bt_wind],
+    is_dome=[None, ("==", True), ("==", False)] if bt_venue else [None],
+)
+bt_start = time.perf_counter()
+bt_result = backtest(games_df, strategies)
+bt_elapsed = time.perf_counter() - bt_start
+st.caption(f"{len(strategies):,} strategies over {len(games_df):,} games in {bt_elapsed:.2f}s")
+
+ranked = bt_result.summary[bt_result.summary['bets'] >= bt_min_bets].sort_values('roi', ascending=False)
+top_strategies = ranked.head(20).rename(columns={
+    'strategy': 'Strategy', 'bets': 'Bets', 'wins': 'W', 'losses': 'L', 'pushes': 'P',
+    'win_pct': 'Win%', 'units': 'Units', 'roi': 'ROI%', 'max_drawdown': 'Max Drawdown',
+})
+
+col_e4, col_e5 = st.columns(2)
+
+with col_e4:
+    st.subheader("Top Strategies by ROI", help=f"Strategies with at least {bt_min_bets} bets")
+    st.dataframe(
+        top_strategies[['Strategy', 'Bets', 'W', 'L', 'P', 'Win%', 'Units', 'ROI%', 'Max Drawdown']].style.format({
+            'Win%': '{:.1f}%', 'Units': '{:+.1f}', 'ROI%': '{:+.1f}%', 'Max Drawdown': '{:.1f}',
+        }),
+        use_container_width=True,
+        height=400
+    )
+
+with col_e5:
+    if len(top_strategies) > 0:
+        bt_selected = st.selectbox("Season Breakdown", top_strategies['Strategy'].tolist(), key="bt_selected")
+        bt_seasons = bt_result.by_season[bt_result.by_season['strategy'] == bt_selected]
+
+        fig_bt = go.Figure()
+        fig_bt.add_trace(go.Bar(
+            x=bt_seasons['seas'],
+            y=bt_seasons['units'],
+            marker=dict(color=[COLORS['positive'] if u >= 0 else COLORS['negative'] for u in bt_seasons['units']]),
+            text=[f"{w}-{l}" for w, l in zip(bt_seasons['wins'], bt_seasons['losses'])],
+            textposition='auto'
+        ))
+        fig_bt.add_hline(y=0, line_color=COLORS['neutral'])
+
+        fig_bt.update_layout(**CHART_LAYOUT,
+            title="Units Won by Season",
+            xaxis_title="Season",
+            yaxis_title="Units",
+            height=400,
+            showlegend=False
+        )
+        st.plotly_chart(fig_bt, use_container_width=True)
+    else:
+        st.info(f"No strategy has {bt_min_bets}+ bets with these filters.")
+
 st.markdown(page_footer(), unsafe_allow_html=True)
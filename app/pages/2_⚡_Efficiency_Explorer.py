@@ -10,6 +10,8 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 from app.db import query
+from app.binning import MISSING_LABEL, YARDS_TO_GO
+from app.bootstrap import bootstrap_ci
 from app.config import COLORS, TEAM_COLORS, SEASON_RANGE, SHARED_CSS, CHART_LAYOUT, metric_card, page_footer
 
 st.set_page_config(page_title="Efficiency Explorer", layout="wide", initial_sidebar_state="expanded")
@@ -64,14 +66,13 @@ def load_plays_data(season_select):
     """Load plays with game context."""
     sql = """
     SELECT
-        p.gid, p.pid, p.off, p.def, p.type, p.dseq, p.qtr, p.dwn, p.ytg, p.yfog,
-        p.yds, p.succ, p.fd, p.sg, p.nh, p.pts, p.epa,
-        g.seas, g.v, g.h, g.ptsv, g.ptsh
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
-    WHERE g.seas = ? AND p.epa IS NOT NULL
+        gid, pid, off, def, type, dseq, qtr, dwn, ytg, yfog,
+        yds, succ, fd, sg, nh, pts, epa,
+        seas, v, h, ptsv, ptsh
+    FROM plays_wide
+    WHERE seas = ? AND epa IS NOT NULL
     """
-    return query(sql, [season_select])
+    return query(sql, [season_select], arrow_dtypes=True, cache=True)
 
 plays_df = load_plays_data(season_select)
 
@@ -93,9 +94,9 @@ if "All Plays" not in situation_select:
     if "Late & Close" in situation_select:
         mask |= (plays_df['qtr'] >= 4) & (abs(plays_df['ptsv'] - plays_df['ptsh']) <= 8)
     if "Shotgun" in situation_select:
-        mask |= (plays_df['sg'] == 'Y')
+        mask |= plays_df['sg']
     if "No Huddle" in situation_select:
-        mask |= (plays_df['nh'] == 'Y')
+        mask |= plays_df['nh']
 
     plays_df = plays_df[mask]
 
@@ -105,7 +106,7 @@ if "All Plays" not in situation_select:
 col1, col2, col3, col4 = st.columns(4)
 
 league_epa = plays_df['epa'].mean()
-league_success = (plays_df['succ'] == 'Y').sum() / len(plays_df) * 100 if len(plays_df) > 0 else 0
+league_success = plays_df['succ'].sum() / len(plays_df) * 100 if len(plays_df) > 0 else 0
 
 # Best offense
 off_epa = plays_df.groupby('off')['epa'].mean().sort_values(ascending=False)
@@ -140,21 +141,36 @@ st.header("A) Team Efficiency Rankings")
 
 col_a1, col_a2 = st.columns(2)
 
+@st.cache_data
+def team_intervals(_plays, side, season_select, play_type_select, down_select, situation_select):
+    """95% bootstrap intervals of EPA/play and success % per team, resampling whole games.
+
+    Cached on the filters that produced `_plays` rather than on the frame itself.
+    """
+    epa = bootstrap_ci(_plays, side, 'epa', cluster='gid')
+    succ = bootstrap_ci(_plays, side, 'succ', cluster='gid', scale=100)
+    return pd.DataFrame({
+        'Team': epa[side],
+        'EPA Lo': epa['ci_lo'], 'EPA Hi': epa['ci_hi'],
+        'Success Lo': succ['ci_lo'], 'Success Hi': succ['ci_hi'],
+    })
+
 # Calculate offensive EPA
 off_stats = plays_df.groupby('off').agg({
     'epa': ['mean', 'std', 'count'],
-    'succ': lambda x: (x == 'Y').sum() / len(x) * 100,
+    'succ': lambda x: x.sum() / len(x) * 100,
     'yds': 'mean'
 }).reset_index()
 off_stats.columns = ['Team', 'EPA/Play', 'EPA_Std', 'Plays', 'Success%', 'Avg Yards']
 off_stats = off_stats.sort_values('EPA/Play', ascending=False)
 off_stats['Team Full'] = off_stats['Team'].map(lambda x: TEAM_FULL_NAMES.get(x, x))
 off_stats['Type'] = 'Offense'
+off_stats = off_stats.merge(team_intervals(plays_df, 'off', season_select, play_type_select, down_select, situation_select), on='Team', how='left')
 
 # Calculate defensive EPA (flip sign)
 def_stats = plays_df.groupby('def').agg({
     'epa': ['mean', 'std', 'count'],
-    'succ': lambda x: (x == 'Y').sum() / len(x) * 100,
+    'succ': lambda x: x.sum() / len(x) * 100,
     'yds': 'mean'
 }).reset_index()
 def_stats.columns = ['Team', 'EPA/Play', 'EPA_Std', 'Plays', 'Success%', 'Avg Yards']
@@ -162,13 +178,20 @@ def_stats['EPA/Play'] = -def_stats['EPA/Play']  # Flip for defense
 def_stats = def_stats.sort_values('EPA/Play', ascending=True)
 def_stats['Team Full'] = def_stats['Team'].map(lambda x: TEAM_FULL_NAMES.get(x, x))
 def_stats['Type'] = 'Defense'
+def_ci = team_intervals(plays_df, 'def', season_select, play_type_select, down_select, situation_select)
+def_ci[['EPA Lo', 'EPA Hi']] = -def_ci[['EPA Hi', 'EPA Lo']].to_numpy()  # Flip for defense
+def_stats = def_stats.merge(def_ci, on='Team', how='left')
 
 with col_a1:
-    st.subheader("Offensive EPA/Play Ranking", help="Higher is better")
+    st.subheader("Offensive EPA/Play Ranking", help="Higher is better; Lo/Hi are 95% bootstrap intervals over games")
     st.dataframe(
-        off_stats[['Team', 'EPA/Play', 'Success%', 'Plays']].style.format({
+        off_stats[['Team', 'EPA/Play', 'EPA Lo', 'EPA Hi', 'Success%', 'Success Lo', 'Success Hi', 'Plays']].style.format({
             'EPA/Play': '{:.3f}',
+            'EPA Lo': '{:.3f}',
+            'EPA Hi': '{:.3f}',
             'Success%': '{:.1f}%',
+            'Success Lo': '{:.1f}%',
+            'Success Hi': '{:.1f}%',
             'Plays': '{:.0f}'
         }),
         use_container_width=True,
@@ -176,11 +199,15 @@ with col_a1:
     )
 
 with col_a2:
-    st.subheader("Defensive EPA/Play Ranking", help="Lower EPA against is better (shown as positive)")
+    st.subheader("Defensive EPA/Play Ranking", help="Lower EPA against is better (shown as positive); Lo/Hi are 95% bootstrap intervals over games")
     st.dataframe(
-        def_stats[['Team', 'EPA/Play', 'Success%', 'Plays']].style.format({
+        def_stats[['Team', 'EPA/Play', 'EPA Lo', 'EPA Hi', 'Success%', 'Success Lo', 'Success Hi', 'Plays']].style.format({
             'EPA/Play': '{:.3f}',
+            'EPA Lo': '{:.3f}',
+            'EPA Hi': '{:.3f}',
             'Success%': '{:.1f}%',
+            'Success Lo': '{:.1f}%',
+            'Success Hi': '{:.1f}%',
             'Plays': '{:.0f}'
         }),
         use_container_width=True,
@@ -198,6 +225,9 @@ off_top = off_stats.head(10)
 fig_dual.add_trace(go.Bar(
     y=off_top['Team Full'],
     x=off_top['EPA/Play'],
+    error_x=dict(type='data', symmetric=False,
+                 array=off_top['EPA Hi'] - off_top['EPA/Play'],
+                 arrayminus=off_top['EPA/Play'] - off_top['EPA Lo']),
     orientation='h',
     name='Offense',
     marker=dict(color=COLORS['positive']),
@@ -209,6 +239,9 @@ def_top = def_stats.head(10)
 fig_dual.add_trace(go.Bar(
     y=def_top['Team Full'],
     x=def_top['EPA/Play'],
+    error_x=dict(type='data', symmetric=False,
+                 array=def_top['EPA Hi'] - def_top['EPA/Play'],
+                 arrayminus=def_top['EPA/Play'] - def_top['EPA Lo']),
     orientation='h',
     name='Defense',
     marker=dict(color=COLORS['accent2']),
@@ -240,13 +273,12 @@ def compute_rolling_trends(season_select, selected_team):
     """Compute 4-game rolling EPA for a team."""
     sql = """
     SELECT
-        g.seas, g.wk, p.gid, p.off, p.def, p.epa
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
-    WHERE g.seas = ? AND p.epa IS NOT NULL
-    ORDER BY g.wk
+        seas, wk, gid, off, def, epa
+    FROM plays_wide
+    WHERE seas = ? AND epa IS NOT NULL
+    ORDER BY wk
     """
-    all_plays = query(sql, [season_select])
+    all_plays = query(sql, [season_select], arrow_dtypes=True, cache=True)
 
     # Offense rolling
     off_plays = all_plays[all_plays['off'] == selected_team].copy()
@@ -344,40 +376,25 @@ hm_plays = plays_df[plays_df['off'] == heatmap_team].copy()
 if heatmap_play_type != "All":
     hm_plays = hm_plays[hm_plays['type'] == heatmap_play_type]
 
-# Create buckets
-def ytg_bucket(ytg):
-    if pd.isna(ytg):
-        return "Unknown"
-    if ytg <= 3:
-        return "1-3"
-    elif ytg <= 6:
-        return "4-6"
-    elif ytg <= 10:
-        return "7-10"
-    elif ytg <= 15:
-        return "11-15"
-    else:
-        return "16+"
-
-hm_plays['ytg_bucket'] = hm_plays['ytg'].apply(ytg_bucket)
+hm_plays['ytg_bucket'] = YARDS_TO_GO.apply(hm_plays['ytg'])
 
 if heatmap_metric == "EPA/Play":
-    heatmap_data = hm_plays.groupby(['dwn', 'ytg_bucket'])['epa'].mean().reset_index()
+    heatmap_data = hm_plays.groupby(['dwn', 'ytg_bucket'], observed=True)['epa'].mean().reset_index()
     metric_col = 'epa'
     colorscale = "RdYlGn"
     title_suffix = "EPA/Play"
 else:
-    heatmap_data = hm_plays.groupby(['dwn', 'ytg_bucket']).agg({
-        'succ': lambda x: (x == 'Y').sum() / len(x) * 100
+    heatmap_data = hm_plays.groupby(['dwn', 'ytg_bucket'], observed=True).agg({
+        'succ': lambda x: x.sum() / len(x) * 100
     }).reset_index()
     metric_col = 'succ'
     colorscale = "RdYlGn"
     title_suffix = "Success %"
 
 # Pivot for heatmap
-hm_pivot = heatmap_data.pivot(index='dwn', columns='ytg_bucket', values=metric_col)
+hm_pivot = heatmap_data.pivot(index='dwn', columns='ytg_bucket', values=metric_col).astype(float)
 
-ytg_order = ["1-3", "4-6", "7-10", "11-15", "16+"]
+ytg_order = [label for label in YARDS_TO_GO.labels if label != MISSING_LABEL]
 hm_pivot = hm_pivot[[col for col in ytg_order if col in hm_pivot.columns]]
 
 fig_hm = go.Figure(data=go.Heatmap(
@@ -418,8 +435,8 @@ situations = {
     '4th Down': sit_plays[sit_plays['dwn'] == 4],
     'Red Zone': sit_plays[sit_plays['yfog'] >= 80],
     'Goal-to-Go': sit_plays[sit_plays['yfog'] >= 99],
-    'Shotgun': sit_plays[sit_plays['sg'] == 'Y'],
-    'No Huddle': sit_plays[sit_plays['nh'] == 'Y'],
+    'Shotgun': sit_plays[sit_plays['sg']],
+    'No Huddle': sit_plays[sit_plays['nh']],
 }
 
 sit_results = []
@@ -429,7 +446,7 @@ for sit_name, sit_data in situations.items():
             'Situation': sit_name,
             'Plays': len(sit_data),
             'EPA/Play': sit_data['epa'].mean(),
-            'Success%': (sit_data['succ'] == 'Y').sum() / len(sit_data) * 100,
+            'Success%': sit_data['succ'].sum() / len(sit_data) * 100,
             'Avg Yards': sit_data['yds'].mean()
         })
 
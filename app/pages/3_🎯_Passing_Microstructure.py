@@ -4,12 +4,12 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
-import numpy as np
 import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
-from app.db import query
+from app.db import query_many
+from app.binning import PASS_DEPTH, PASS_DIRECTION, pass_depth_yards
 from app.config import COLORS, TEAM_COLORS, SEASON_RANGE, SHARED_CSS, CHART_LAYOUT, metric_card, page_footer
 
 st.set_page_config(page_title="Passing Microstructure", layout="wide", initial_sidebar_state="expanded")
@@ -49,101 +49,60 @@ with st.sidebar:
 # ============================================================================
 # LOAD DATA
 # ============================================================================
-@st.cache_data
-def load_pass_data(season_select):
-    """Load comprehensive passing data with EPA and success metrics."""
-    sql = """
-    SELECT
-        pa.psr, pa.trg, pa.loc, pa.yds, pa.comp, pa.spk,
-        p.gid, p.epa, p.succ, p.pid, p.detail,
-        g.seas, g.v, g.h,
-        psr_pl.pname as psr_name,
-        trg_pl.pname as trg_name
-    FROM passes pa
-    JOIN plays p ON pa.pid = p.pid
-    JOIN games g ON p.gid = g.gid
-    LEFT JOIN players psr_pl ON pa.psr = psr_pl.player
-    LEFT JOIN players trg_pl ON pa.trg = trg_pl.player
-    WHERE g.seas = ?
-    """
-    return query(sql, [season_select])
-
-@st.cache_data
-def load_sack_data(season_select):
-    """Load sack data for pressure analysis."""
-    sql = """
-    SELECT
-        s.qb, s.sk, s.value,
-        p.gid, p.epa, p.detail,
-        g.seas,
-        qb_pl.pname as qb_name,
-        sk_pl.pname as sk_name
-    FROM sacks s
-    JOIN plays p ON s.pid = p.pid
-    JOIN games g ON p.gid = g.gid
-    LEFT JOIN players qb_pl ON s.qb = qb_pl.player
-    LEFT JOIN players sk_pl ON s.sk = sk_pl.player
-    WHERE g.seas = ?
-    """
-    return query(sql, [season_select])
+PASS_SQL = """
+SELECT
+    psr, trg, loc, yds, comp, spk,
+    gid, epa, play_succ AS succ, pid, detail,
+    seas, v, h,
+    psr_name, trg_name
+FROM passes_wide
+WHERE seas = ?
+"""
+
+SACK_SQL = """
+SELECT
+    qb, sk, value,
+    gid, epa, detail,
+    seas,
+    qb_name, sk_name
+FROM sacks_wide
+WHERE seas = ?
+"""
+
+# All plays, to compute dropback totals
+PLAY_TOTALS_SQL = """
+SELECT
+    gid, pid, off, type, detail, epa
+FROM plays_wide
+WHERE seas = ? AND type IN ('PASS', 'SACK')
+"""
+
+# Player names for QB matching
+QB_NAMES_SQL = """
+SELECT DISTINCT player, pname, pos1
+FROM players
+WHERE (pos1 = 'QB' OR pos1 LIKE '%QB%') AND player IS NOT NULL
+"""
 
 @st.cache_data
-def load_play_totals(season_select):
-    """Load all plays to compute dropback totals."""
-    sql = """
-    SELECT
-        p.gid, p.pid, p.off, p.type, p.detail, p.epa
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
-    WHERE g.seas = ? AND p.type IN ('PASS', 'SACK')
-    """
-    return query(sql, [season_select])
-
-@st.cache_data
-def load_player_names():
-    """Load player names for QB matching."""
-    sql = """
-    SELECT DISTINCT player, pname, pos1
-    FROM players
-    WHERE (pos1 = 'QB' OR pos1 LIKE '%QB%') AND player IS NOT NULL
-    """
-    return query(sql)
-
-passes_df = load_pass_data(season_select)
-sacks_df = load_sack_data(season_select)
-plays_df = load_play_totals(season_select)
-players_df = load_player_names()
+def load_season_data(season_select):
+    """Load passes, sacks, dropback totals and QB names concurrently."""
+    frames = query_many({
+        "passes": (PASS_SQL, [season_select]),
+        "sacks": (SACK_SQL, [season_select]),
+        "plays": (PLAY_TOTALS_SQL, [season_select]),
+        "players": QB_NAMES_SQL,
+    }, arrow_dtypes=True, cache=True)
+    return frames["passes"], frames["sacks"], frames["plays"], frames["players"]
+
+passes_df, sacks_df, plays_df, players_df = load_season_data(season_select)
 
 # Build qb_options: list of passer codes (used in Section D & E dropdowns)
 qb_options = sorted(passes_df['psr'].dropna().unique().tolist())
 
 # Parse location into depth and direction IMMEDIATELY after loading
-def parse_location(loc):
-    if pd.isna(loc):
-        return "Unknown", "Unknown"
-    loc_str = str(loc).upper()
-
-    # Determine depth
-    if 'D' in loc_str:
-        depth = "Deep"
-    elif 'I' in loc_str:
-        depth = "Intermediate"
-    else:
-        depth = "Short"
-
-    # Determine direction
-    if 'L' in loc_str:
-        direction = "Left"
-    elif 'R' in loc_str:
-        direction = "Right"
-    else:
-        direction = "Middle"
-
-    return depth, direction
-
-passes_df[['depth_cat', 'direction_cat']] = passes_df['loc'].apply(
-    lambda x: pd.Series(parse_location(x))
-)
+passes_df['depth_cat'] = PASS_DEPTH.apply(passes_df['loc'])
+passes_df['direction_cat'] = PASS_DIRECTION.apply(passes_df['loc'])
 
 # ============================================================================
 # METRIC CARDS
@@ -153,18 +112,7 @@ col1, col2, col3, col4 = st.columns(4)
 league_comp = (passes_df['comp'] == 1).sum() / len(passes_df) * 100 if len(passes_df) > 0 else 0
 
 # Average depth of target (estimate from location)
-def location_depth(loc):
-    if pd.isna(loc):
-        return np.nan
-    loc_str = str(loc).upper()
-    if 'D' in loc_str:  # Deep
-        return 15
-    elif 'I' in loc_str:  # Intermediate
-        return 10
-    else:  # Short
-        return 3
-
-passes_df['depth_est'] = passes_df['loc'].apply(location_depth)
+passes_df['depth_est'] = pass_depth_yards(passes_df['loc'])
 avg_depth = passes_df['depth_est'].mean()
 
 # Sack rate
@@ -222,13 +170,13 @@ if passer_filter != "All Teams":
 
 # Build heatmap data
 if depth_metric == "Completion %":
-    hm_data = depth_passes.groupby(['depth_cat', 'direction_cat']).agg({
+    hm_data = depth_passes.groupby(['depth_cat', 'direction_cat'], observed=True).agg({
         'comp': lambda x: (x == 1).sum() / len(x) * 100 if len(x) > 0 else 0,
         'pid': 'count'
     }).reset_index()
     hm_data.columns = ['Depth', 'Direction', 'Metric', 'Count']
 else:  # EPA/Attempt
-    hm_data = depth_passes.groupby(['depth_cat', 'direction_cat']).agg({
+    hm_data = depth_passes.groupby(['depth_cat', 'direction_cat'], observed=True).agg({
         'epa': 'mean',
         'pid': 'count'
     }).reset_index()
@@ -308,6 +256,7 @@ if len(qb_passes) > 0:
     with col_b_dist1:
         # Depth distribution
         depth_dist = qb_passes['depth_cat'].value_counts()
+        depth_dist = depth_dist[depth_dist > 0]
         fig_qb_depth = go.Figure(data=[go.Pie(
             labels=depth_dist.index,
             values=depth_dist.values,
@@ -319,6 +268,7 @@ if len(qb_passes) > 0:
     with col_b_dist2:
         # Direction distribution
         dir_dist = qb_passes['direction_cat'].value_counts()
+        dir_dist = dir_dist[dir_dist > 0]
         fig_qb_dir = go.Figure(data=[go.Pie(
             labels=dir_dist.index,
             values=dir_dist.values,
@@ -335,14 +285,14 @@ if len(qb_passes) > 0:
         'Comp%': qb_comp,
         'Yards/Attempt': qb_ypa * 10,  # Scale up for visibility
         'EPA/Attempt': (qb_epa + 0.5) * 100,  # Shift and scale
-        'Success Rate': (qb_passes['succ'] == 'Y').sum() / len(qb_passes) * 100,
+        'Success Rate': qb_passes['succ'].sum() / len(qb_passes) * 100,
     }
 
     league_metrics = {
         'Comp%': league_comp,
         'Yards/Attempt': passes_df['yds'].mean() * 10,
         'EPA/Attempt': (passes_df['epa'].mean() + 0.5) * 100,
-        'Success Rate': (passes_df['succ'] == 'Y').sum() / len(passes_df) * 100,
+        'Success Rate': passes_df['succ'].sum() / len(passes_df) * 100,
     }
 
     fig_radar = go.Figure()
@@ -55,17 +55,15 @@ st.markdown('<div class="ssa-info"><strong>Metric guide:</strong> Sacks Allowed
 def load_sack_stats(season_min, season_max):
     sql = """
     SELECT
-        g.seas AS season,
-        s.qb,
-        s.sk,
-        s.value,
-        s.ydsl,
-        p.off AS offense,
-        p.def AS defense
-    FROM sacks s
-    JOIN plays p ON s.pid = p.pid
-    JOIN games g ON p.gid = g.gid
-    WHERE g.seas >= ? AND g.seas <= ?
+        seas AS season,
+        qb,
+        sk,
+        value,
+        ydsl,
+        off AS offense,
+        def AS defense
+    FROM sacks_wide
+    WHERE seas >= ? AND seas <= ?
     """
     return query(sql, (season_min, season_max))
 
@@ -75,13 +73,12 @@ sack_data = load_sack_stats(season_range[0], season_range[1])
 def load_pass_attempts(season_min, season_max):
     sql = """
     SELECT
-        g.seas AS season,
-        p.off AS team,
+        seas AS season,
+        off AS team,
         COUNT(*) AS pass_attempts
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
-    WHERE p.type = 'PASS' AND g.seas >= ? AND g.seas <= ?
-    GROUP BY g.seas, p.off
+    FROM plays_wide
+    WHERE type = 'PASS' AND seas >= ? AND seas <= ?
+    GROUP BY seas, off
     """
     return query(sql, (season_min, season_max))
 
@@ -176,19 +173,16 @@ st.markdown('<div class="ssa-info"><strong>What to look for:</strong> Sack value
 def load_pass_rush_leaders(season_min, season_max):
     sql = """
     SELECT
-        g.seas AS season,
-        s.sk AS player_code,
-        COALESCE(pl.pname, s.sk) AS player_name,
-        SUM(s.value) AS total_sack_value,
+        seas AS season,
+        sk AS player_code,
+        COALESCE(sk_name, sk) AS player_name,
+        SUM(value) AS total_sack_value,
         COUNT(*) AS sack_count,
-        SUM(s.ydsl) AS total_yards_lost,
-        ROUND(SUM(s.ydsl) / COUNT(*), 2) AS avg_yards_lost_per_sack
-    FROM sacks s
-    LEFT JOIN players pl ON s.sk = pl.player
-    JOIN plays py ON s.pid = py.pid
-    JOIN games g ON py.gid = g.gid
-    WHERE g.seas >= ? AND g.seas <= ?
-    GROUP BY g.seas, s.sk, pl.pname
+        SUM(ydsl) AS total_yards_lost,
+        ROUND(SUM(ydsl) / COUNT(*), 2) AS avg_yards_lost_per_sack
+    FROM sacks_wide
+    WHERE seas >= ? AND seas <= ?
+    GROUP BY seas, sk, sk_name
     HAVING COUNT(*) > 0
     ORDER BY season DESC, total_sack_value DESC
     """
@@ -236,18 +230,16 @@ run_direction_down = st.sidebar.multiselect("Down", [1, 2, 3, 4], default=[1, 2,
 def load_run_direction_stats(season_min, season_max):
     sql = """
     SELECT
-        g.seas AS season,
-        r.dir,
-        p.off AS team,
-        AVG(r.yds) AS avg_yards,
+        seas AS season,
+        dir,
+        off AS team,
+        AVG(yds) AS avg_yards,
         COUNT(*) AS rush_count,
-        SUM(CASE WHEN r.succ = 1 THEN 1 ELSE 0 END) AS successful_rushes
-    FROM rushes r
-    JOIN plays p ON r.pid = p.pid
-    JOIN games g ON p.gid = g.gid
-    WHERE g.seas >= ? AND g.seas <= ? AND r.dir IS NOT NULL
-    GROUP BY g.seas, r.dir, p.off
-    ORDER BY season DESC, team, r.dir
+        SUM(CASE WHEN succ = 1 THEN 1 ELSE 0 END) AS successful_rushes
+    FROM rushes_wide
+    WHERE seas >= ? AND seas <= ? AND dir IS NOT NULL
+    GROUP BY seas, dir, off
+    ORDER BY season DESC, team, dir
     """
     return query(sql, (season_min, season_max))
 
@@ -326,14 +318,12 @@ with col2:
 def get_team_matchup_stats(t1, t2, season_min, season_max):
     sql = """
     SELECT
-        CASE WHEN p.off = ? THEN 'Team 1' ELSE 'Team 2' END AS perspective,
-        CASE WHEN p.off = ? THEN ? ELSE ? END AS team,
-        AVG(r.yds) AS avg_rush_yards,
-        100.0 * SUM(CASE WHEN r.succ = 1 THEN 1 ELSE 0 END) / NULLIF(COUNT(*), 0) AS rush_success_rate
-    FROM rushes r
-    JOIN plays p ON r.pid = p.pid
-    JOIN games g ON p.gid = g.gid
-    WHERE p.off IN (?, ?) AND g.seas >= ? AND g.seas <= ?
+        CASE WHEN off = ? THEN 'Team 1' ELSE 'Team 2' END AS perspective,
+        CASE WHEN off = ? THEN ? ELSE ? END AS team,
+        AVG(yds) AS avg_rush_yards,
+        100.0 * SUM(CASE WHEN succ = 1 THEN 1 ELSE 0 END) / NULLIF(COUNT(*), 0) AS rush_success_rate
+    FROM rushes_wide
+    WHERE off IN (?, ?) AND seas >= ? AND seas <= ?
     GROUP BY perspective, team
     """
     return query(sql, (t1, t1, t1, t2, t1, t2, season_min, season_max))
@@ -8,6 +8,7 @@ import numpy as np
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 from app.db import query
+from app.binning import FIELD_POSITION
 from app.config import COLORS, TEAM_COLORS, SEASON_RANGE, SHARED_CSS, CHART_LAYOUT, metric_card, page_footer
 
 st.set_page_config(page_title="Fourth Down Lab", layout="wide", initial_sidebar_state="expanded")
@@ -63,27 +64,26 @@ def load_fourth_down_decisions(season_start, season_end, team_filter):
     """
     sql = """
     SELECT
-        p.gid,
-        g.seas AS season,
-        p.off AS team,
-        p.type,
-        p.dwn,
-        p.ytg,
-        p.yfog,
-        p.qtr,
-        p.succ,
-        p.fd,
-        p.ptso,
-        p.ptsd,
-        p.pid
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
-    WHERE p.dwn = 4 AND g.seas >= ? AND g.seas <= ?
-    ORDER BY g.seas DESC, p.gid
+        gid,
+        seas AS season,
+        off AS team,
+        type,
+        dwn,
+        ytg,
+        yfog,
+        qtr,
+        succ,
+        fd,
+        ptso,
+        ptsd,
+        pid
+    FROM plays_wide
+    WHERE dwn = 4 AND seas >= ? AND seas <= ?
+    ORDER BY seas DESC, gid
     """
     params = [season_start, season_end]
 
-    df = query(sql, params)
+    df = query(sql, params, cache=True)
 
     # Apply team filter if specified
     if team_filter:
@@ -105,19 +105,7 @@ if not fourth_downs.empty:
     fourth_downs['score_diff'] = fourth_downs['ptso'] - fourth_downs['ptsd']
 
     # Field position buckets
-    def field_pos_bucket(yfog):
-        if pd.isna(yfog):
-            return 'Unknown'
-        if yfog <= 25:
-            return 'Own 1-25'
-        elif yfog <= 50:
-            return 'Own 26-50'
-        elif yfog <= 75:
-            return 'Opp 49-25'
-        else:
-            return 'Opp 24-1'
-
-    fourth_downs['field_pos_bucket'] = fourth_downs['yfog'].apply(field_pos_bucket)
+    fourth_downs['field_pos_bucket'] = FIELD_POSITION.apply(fourth_downs['yfog'])
 
     # Metric cards
     col1, col2, col3, col4 = st.columns(4)
@@ -129,14 +117,14 @@ if not fourth_downs.empty:
     with col3:
         go_for_it_success = fourth_downs[fourth_downs['decision'] == 'Go for It']
         if len(go_for_it_success) > 0:
-            success_pct = (len(go_for_it_success[go_for_it_success['succ'] == 'Y']) / len(go_for_it_success) * 100)
+            success_pct = (len(go_for_it_success[go_for_it_success['succ']]) / len(go_for_it_success) * 100)
             st.markdown(metric_card("Go-For-It Success %", f"{success_pct:.1f}%"), unsafe_allow_html=True)
     with col4:
         punts = fourth_downs[fourth_downs['decision'] == 'Punt']
         st.markdown(metric_card("Total Punts", str(len(punts))), unsafe_allow_html=True)
 
     # Decision rates by field position
-    decision_by_fp = fourth_downs.groupby(['field_pos_bucket', 'decision']).size().unstack(fill_value=0)
+    decision_by_fp = fourth_downs.groupby(['field_pos_bucket', 'decision'], observed=True).size().unstack(fill_value=0)
     decision_pct = decision_by_fp.div(decision_by_fp.sum(axis=1), axis=0) * 100
 
     fig = px.bar(
@@ -171,9 +159,9 @@ if len(go_for_it_plays) > 0:
         lambda x: f'{x}' if x <= 5 else '5+'
     )
 
-    # Compute success: succ is VARCHAR ('Y' or NULL from plays table)
+    # Compute success: succ and fd are BOOLEAN flags from the plays table
     success_by_ytg = go_for_it_plays.groupby('ytg_bucket').agg({
-        'succ': lambda x: (x == 'Y').sum(),  # Count successes
+        'succ': 'sum',  # Count successes
         'fd': 'sum'
     }).reset_index()
     success_by_ytg['total_attempts'] = go_for_it_plays.groupby('ytg_bucket').size().values
@@ -224,7 +212,7 @@ if len(reasonable_4th) > 0:
     if not latest_aggression.empty:
         # Success rate for those go-for-its
         go_for_it_by_team = reasonable_4th[reasonable_4th['decision'] == 'Go for It'].groupby(['season', 'team']).agg(
-            success_count=('succ', lambda x: (x == 'Y').sum()),
+            success_count=('succ', 'sum'),
             attempt_count=('succ', 'count')
         ).reset_index()
         go_for_it_by_team['success_rate'] = (go_for_it_by_team['success_count'] / go_for_it_by_team['attempt_count'] * 100).round(1)
@@ -331,7 +319,7 @@ if len(similar_4ths) > 0:
     # Go-for-it success
     go_for_it_similar = similar_4ths[similar_4ths['decision'] == 'Go for It']
     if len(go_for_it_similar) > 0:
-        go_success_pct = (len(go_for_it_similar[go_for_it_similar['succ'] == 'Y']) / len(go_for_it_similar) * 100)
+        go_success_pct = (len(go_for_it_similar[go_for_it_similar['succ']]) / len(go_for_it_similar) * 100)
         with col1:
             st.markdown(metric_card("Go-For-It Success %", f"{go_success_pct:.1f}%", sub=f"n={len(go_for_it_similar)}"), unsafe_allow_html=True)
 
@@ -8,6 +8,7 @@ import numpy as np
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 from app.db import query
+from app.bootstrap import bootstrap_ci
 from app.config import COLORS, TEAM_COLORS, SEASON_RANGE, SHARED_CSS, CHART_LAYOUT, metric_card, page_footer
 
 # Team mapping for full names
@@ -62,7 +63,7 @@ def load_games_count(season_min, season_max):
     WHERE g.seas >= ? AND g.seas <= ?
     GROUP BY g.seas
     """
-    return query(sql, (season_min, season_max))
+    return query(sql, (season_min, season_max), cache=True)
 
 
 @st.cache_data
@@ -70,20 +71,18 @@ def load_all_penalties(season_min, season_max, selected_teams_tuple):
     """Load all penalties (accepted, declined, offsetting)."""
     sql = """
     SELECT
-        pen.uid,
-        pen.pid,
-        pen.ptm AS penalized_team,
-        pen."desc" AS penalty_desc,
-        pen.cat AS category,
-        pen.pey AS penalty_yards,
-        pen.act AS action,
-        g.seas AS season
-    FROM penalties pen
-    JOIN plays p ON pen.pid = p.pid
-    JOIN games g ON p.gid = g.gid
-    WHERE g.seas >= ? AND g.seas <= ?
+        uid,
+        pid,
+        ptm AS penalized_team,
+        "desc" AS penalty_desc,
+        cat AS category,
+        pey AS penalty_yards,
+        act AS action,
+        seas AS season
+    FROM penalties_wide
+    WHERE seas >= ? AND seas <= ?
     """
-    return query(sql, (season_min, season_max))
+    return query(sql, (season_min, season_max), cache=True)
 
 
 @st.cache_data
@@ -93,27 +92,26 @@ def load_penalties(season_min, season_max, selected_teams_tuple, penalty_accepte
     Fixed: accept filter values as explicit parameters for proper cache invalidation."""
     sql = """
     SELECT
-        pen.uid,
-        pen.pid,
-        pen.ptm AS penalized_team,
-        pen."desc" AS penalty_desc,
-        pen.cat AS category,
-        pen.pey AS penalty_yards,
-        pen.act AS action,
-        g.seas AS season,
-        p.off AS offensive_team,
-        p.def AS defensive_team,
-        p.type AS play_type,
-        p.dwn AS down,
-        p.qtr AS quarter,
-        p.ptso,
-        p.ptsd
-    FROM penalties pen
-    JOIN plays p ON pen.pid = p.pid
-    JOIN games g ON p.gid = g.gid
-    WHERE g.seas >= ? AND g.seas <= ?
+        uid,
+        pid,
+        ptm AS penalized_team,
+        "desc" AS penalty_desc,
+        cat AS category,
+        pey AS penalty_yards,
+        act AS action,
+        seas AS season,
+        gid,
+        off AS offensive_team,
+        def AS defensive_team,
+        type AS play_type,
+        dwn AS down,
+        qtr AS quarter,
+        ptso,
+        ptsd
+    FROM penalties_wide
+    WHERE seas >= ? AND seas <= ?
     """
-    return query(sql, (season_min, season_max))
+    return query(sql, (season_min, season_max), cache=True)
 
 penalties_df = load_penalties(
     season_range[0],
@@ -214,16 +212,30 @@ if not penalties_df.empty:
     penalties_per_game['penalties_per_game'] = penalties_per_game['penalty_count'] / penalties_per_game['game_count']
     penalties_per_game['yards_per_game'] = penalties_per_game['penalty_yards'] / penalties_per_game['game_count']
 
+    # 95% bootstrap intervals for both rates, resampling whole games.  Poisson
+    # weights make games with no penalties (absent here) irrelevant to a sum.
+    keys = ['season', 'penalized_team']
+    count_ci = bootstrap_ci(working_penalties_df.assign(penalty=1), keys, 'penalty', cluster='gid', stat='sum')
+    yards_ci = bootstrap_ci(working_penalties_df, keys, 'penalty_yards', cluster='gid', stat='sum')
+    rate_cis = count_ci[keys + ['ci_lo', 'ci_hi']].merge(
+        yards_ci[keys + ['ci_lo', 'ci_hi']], on=keys, how='outer', suffixes=('_count', '_yards')
+    ).rename(columns={'penalized_team': 'team'})
+    penalties_per_game = penalties_per_game.merge(rate_cis, on=['season', 'team'], how='left')
+    for rate, ci in (('penalties_per_game', 'count'), ('yards_per_game', 'yards')):
+        penalties_per_game[f'{rate}_lo'] = penalties_per_game[f'ci_lo_{ci}'] / penalties_per_game['game_count']
+        penalties_per_game[f'{rate}_hi'] = penalties_per_game[f'ci_hi_{ci}'] / penalties_per_game['game_count']
+
     # Map team codes to full names for display
     penalties_per_game['team_name'] = penalties_per_game['team'].map(TEAM_FULL_NAMES)
 
     latest_season_penalties = penalties_per_game[penalties_per_game['season'] == season_range[1]].sort_values('penalties_per_game', ascending=False)
+    top_penalized = latest_season_penalties.head(16)
 
     col1, col2 = st.columns(2)
 
     with col1:
         fig = px.bar(
-            latest_season_penalties.head(16),
+            top_penalized,
             x='team_name',
             y='penalties_per_game',
             title=f"Penalties per Game by Team ({season_range[1]})",
@@ -231,12 +243,17 @@ if not penalties_df.empty:
             color='penalties_per_game',
             color_continuous_scale=[(0, COLORS['positive']), (1, COLORS['negative'])]
         )
+        fig.update_traces(error_y=dict(
+            type='data', symmetric=False,
+            array=top_penalized['penalties_per_game_hi'] - top_penalized['penalties_per_game'],
+            arrayminus=top_penalized['penalties_per_game'] - top_penalized['penalties_per_game_lo'],
+        ))
         fig.update_layout(**CHART_LAYOUT, height=450, showlegend=False, xaxis_tickangle=-45)
         st.plotly_chart(fig, use_container_width=True)
 
     with col2:
         fig = px.bar(
-            latest_season_penalties.head(16),
+            top_penalized,
             x='team_name',
             y='yards_per_game',
             title=f"Penalty Yards per Game by Team ({season_range[1]})",
@@ -244,6 +261,11 @@ if not penalties_df.empty:
             color='yards_per_game',
             color_continuous_scale=[(0, COLORS['positive']), (1, COLORS['negative'])]
         )
+        fig.update_traces(error_y=dict(
+            type='data', symmetric=False,
+            array=top_penalized['yards_per_game_hi'] - top_penalized['yards_per_game'],
+            arrayminus=top_penalized['yards_per_game'] - top_penalized['yards_per_game_lo'],
+        ))
         fig.update_layout(**CHART_LAYOUT, height=450, showlegend=False, xaxis_tickangle=-45)
         st.plotly_chart(fig, use_container_width=True)
 
@@ -7,7 +7,7 @@ import pandas as pd
 import numpy as np
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
-from app.db import query
+from app.db import dimensions, query
 from app.config import COLORS, TEAM_COLORS, SEASON_RANGE, SHARED_CSS, CHART_LAYOUT, metric_card, page_footer
 
 # Team name mapping
@@ -47,8 +47,7 @@ with st.sidebar:
         key="rz_seasons"
     )
 
-    teams_df = query("SELECT DISTINCT off as team FROM plays WHERE off IS NOT NULL ORDER BY off")
-    teams_list = teams_df['team'].tolist()
+    teams_list = list(dimensions().teams)
     selected_teams = st.multiselect(
         "Teams (leave empty for league view)",
         teams_list,
@@ -80,21 +79,20 @@ def get_rz_efficiency(seasons_tuple, zone_cond):
     sql = f"""
     SELECT
         p.off as team,
-        g.seas as season,
+        p.seas as season,
         COUNT(*) as plays,
         SUM(CASE WHEN p.type = 'PASS' THEN 1 ELSE 0 END) as pass_plays,
         SUM(CASE WHEN p.type = 'RUSH' THEN 1 ELSE 0 END) as rush_plays,
-        AVG(CASE WHEN p.succ='Y' THEN 1.0 ELSE 0.0 END) as success_rate,
+        AVG(CASE WHEN p.succ THEN 1.0 ELSE 0.0 END) as success_rate,
         AVG(p.eps) as epa_per_play,
         COUNT(DISTINCT CASE WHEN p.pts > 0 THEN p.gid ELSE NULL END) as scoring_drives,
         COUNT(DISTINCT p.gid) as total_drives
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
+    FROM plays_wide p
     WHERE {zone_cond}
-        AND g.seas IN ({','.join(map(str, seasons_tuple))})
+        AND p.seas IN ({','.join(map(str, seasons_tuple))})
         AND p.off IS NOT NULL
         AND p.type IN ('PASS', 'RUSH')
-    GROUP BY p.off, g.seas
+    GROUP BY p.off, p.seas
     ORDER BY season DESC, epa_per_play DESC
     """
     return query(sql)
@@ -195,10 +193,9 @@ def get_playcall_heatmap(seasons_tuple, zone_cond, teams_tuple=None):
         SUM(CASE WHEN p.type = 'PASS' THEN 1 ELSE 0 END) as passes,
         SUM(CASE WHEN p.type = 'RUSH' THEN 1 ELSE 0 END) as rushes,
         COUNT(*) as total_plays
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
+    FROM plays_wide p
     WHERE {zone_cond}
-        AND g.seas IN ({','.join(map(str, seasons_tuple))})
+        AND p.seas IN ({','.join(map(str, seasons_tuple))})
         AND p.off IS NOT NULL
         AND p.type IN ('PASS', 'RUSH')
         AND p.dwn IS NOT NULL
@@ -281,13 +278,12 @@ def get_goal_to_go_stats(seasons_tuple, teams_tuple=None):
         p.type,
         CASE WHEN p.type = 'RUSH' THEN p.dir ELSE 'PASS' END as play_direction,
         COUNT(*) as attempts,
-        SUM(CASE WHEN p.yds >= 1 AND (p.type = 'PASS' OR (p.type = 'RUSH' AND (p.kne IS NULL OR p.kne != 'Y'))) THEN 1 ELSE 0 END) as successful,
-        ROUND(100.0 * SUM(CASE WHEN p.yds >= 1 AND (p.type = 'PASS' OR (p.type = 'RUSH' AND (p.kne IS NULL OR p.kne != 'Y'))) THEN 1 ELSE 0 END) / COUNT(*), 1) as success_rate,
+        SUM(CASE WHEN p.yds >= 1 AND (p.type = 'PASS' OR (p.type = 'RUSH' AND NOT p.kne)) THEN 1 ELSE 0 END) as successful,
+        ROUND(100.0 * SUM(CASE WHEN p.yds >= 1 AND (p.type = 'PASS' OR (p.type = 'RUSH' AND NOT p.kne)) THEN 1 ELSE 0 END) / COUNT(*), 1) as success_rate,
         ROUND(AVG(p.eps), 2) as avg_epa
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
+    FROM plays_wide p
     WHERE p.yfog >= 99
-        AND g.seas IN ({','.join(map(str, seasons_tuple))})
+        AND p.seas IN ({','.join(map(str, seasons_tuple))})
         AND p.off IS NOT NULL
         AND p.type IN ('PASS', 'RUSH')
         {team_filter}
@@ -442,28 +438,25 @@ def get_rz_receivers(seasons_tuple, teams_tuple=None, limit=15):
     team_filter = ""
     if teams_tuple and len(teams_tuple) > 0:
         teams_str = "', '".join(teams_tuple)
-        team_filter = f" AND p.off IN ('{teams_str}')"
+        team_filter = f" AND ps.off IN ('{teams_str}')"
 
     sql = f"""
     SELECT
         ps.trg as player_code,
-        pl.pname as player_name,
+        ps.trg_name as player_name,
         COUNT(*) as targets,
         SUM(CASE WHEN ps.comp = 1 THEN 1 ELSE 0 END) as catches,
         ROUND(100.0 * SUM(CASE WHEN ps.comp = 1 THEN 1 ELSE 0 END) / COUNT(*), 1) as catch_rate,
         SUM(ps.yds) as yards,
-        SUM(CASE WHEN p.pts > 0 THEN 1 ELSE 0 END) as tds,
-        ROUND(AVG(p.eps), 2) as epa_per_target
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
-    INNER JOIN passes ps ON p.pid = ps.pid
-    LEFT JOIN players pl ON ps.trg = pl.player
-    WHERE p.yfog >= 80
-        AND g.seas IN ({','.join(map(str, seasons_tuple))})
-        AND p.off IS NOT NULL
+        SUM(CASE WHEN ps.pts > 0 THEN 1 ELSE 0 END) as tds,
+        ROUND(AVG(ps.eps), 2) as epa_per_target
+    FROM passes_wide ps
+    WHERE ps.yfog >= 80
+        AND ps.seas IN ({','.join(map(str, seasons_tuple))})
+        AND ps.off IS NOT NULL
         AND ps.trg IS NOT NULL
         {team_filter}
-    GROUP BY ps.trg, pl.pname
+    GROUP BY ps.trg, ps.trg_name
     HAVING COUNT(*) >= 3
     ORDER BY targets DESC
     LIMIT {limit}
@@ -480,24 +473,22 @@ def get_rz_rushers(seasons_tuple, teams_tuple=None, limit=15):
     sql = f"""
     SELECT
         p.bc as player_code,
-        pl.pname as player_name,
+        p.bc_name as player_name,
         COUNT(*) as attempts,
         SUM(p.yds) as yards,
         ROUND(AVG(p.yds), 2) as avg_yards,
-        SUM(CASE WHEN p.succ = 'Y' THEN 1 ELSE 0 END) as successful,
-        ROUND(100.0 * SUM(CASE WHEN p.succ = 'Y' THEN 1 ELSE 0 END) / COUNT(*), 1) as success_rate,
+        SUM(CASE WHEN p.succ THEN 1 ELSE 0 END) as successful,
+        ROUND(100.0 * SUM(CASE WHEN p.succ THEN 1 ELSE 0 END) / COUNT(*), 1) as success_rate,
         SUM(CASE WHEN p.pts > 0 THEN 1 ELSE 0 END) as tds,
         ROUND(AVG(p.eps), 2) as epa_per_carry
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
-    LEFT JOIN players pl ON p.bc = pl.player
+    FROM plays_wide p
     WHERE p.yfog >= 80
         AND p.type = 'RUSH'
-        AND g.seas IN ({','.join(map(str, seasons_tuple))})
+        AND p.seas IN ({','.join(map(str, seasons_tuple))})
         AND p.off IS NOT NULL
         AND p.bc IS NOT NULL
         {team_filter}
-    GROUP BY p.bc, pl.pname
+    GROUP BY p.bc, p.bc_name
     HAVING COUNT(*) >= 3
     ORDER BY attempts DESC
     LIMIT {limit}
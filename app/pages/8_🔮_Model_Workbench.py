@@ -193,15 +193,14 @@ def get_offensive_epa():
     """Get offensive EPA per play (offense side)."""
     sql = """
     SELECT
-        p.off as team,
-        g.seas as season,
-        AVG(p.eps) as off_epa,
+        off as team,
+        seas as season,
+        AVG(eps) as off_epa,
         COUNT(*) as plays
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
-    WHERE p.type IN ('PASS', 'RUSH')
-    GROUP BY p.off, g.seas
-    ORDER BY g.seas DESC
+    FROM plays_wide
+    WHERE type IN ('PASS', 'RUSH') AND seas IS NOT NULL
+    GROUP BY off, seas
+    ORDER BY seas DESC
     """
     return query(sql)
 
@@ -210,15 +209,14 @@ def get_defensive_epa():
     """Get defensive EPA per play (defense side)."""
     sql = """
     SELECT
-        p.def as team,
-        g.seas as season,
-        AVG(p.eps) as def_epa,
+        def as team,
+        seas as season,
+        AVG(eps) as def_epa,
         COUNT(*) as plays
-    FROM plays p
-    JOIN games g ON p.gid = g.gid
-    WHERE p.type IN ('PASS', 'RUSH')
-    GROUP BY p.def, g.seas
-    ORDER BY g.seas DESC
+    FROM plays_wide
+    WHERE type IN ('PASS', 'RUSH') AND seas IS NOT NULL
+    GROUP BY def, seas
+    ORDER BY seas DESC
     """
     return query(sql)
 
@@ -6,7 +6,7 @@ import numpy as np
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
-from app.db import query
+from app.db import catalog
 from app.config import COLORS, TEAM_COLORS, SEASON_RANGE
 
 st.set_page_config(page_title="Glossary & Methods", layout="wide", initial_sidebar_state="expanded")
@@ -167,35 +167,28 @@ with st.expander("⚠️ B. Data Coverage & Limitations", expanded=False):
 with st.expander("📋 C. Database Table Descriptions", expanded=False):
     st.subheader("Query Table Information")
 
-    @st.cache_data
     def get_table_info():
-        """Get row counts and basic schema info for all tables."""
+        """Get row counts and basic schema info for all tables (from the catalog)."""
         tables = [
             'games', 'plays', 'passes', 'rushes', 'drives', 'penalties',
             'sacks', 'players', 'offense_stats', 'defense_stats',
             'touchdowns', 'redzone', 'fgxp'
         ]
 
+        meta = catalog()
         table_info = []
         for table in tables:
-            try:
-                count_sql = f"SELECT COUNT(*) as cnt FROM {table}"
-                count_result = query(count_sql)
-                row_count = count_result['cnt'].iloc[0] if len(count_result) > 0 else 0
-
-                # Get column info
-                cols_sql = f"DESCRIBE {table}"
-                cols_result = query(cols_sql)
-                col_names = cols_result['column_name'].tolist() if 'column_name' in cols_result.columns else []
-
-                table_info.append({
-                    'Table': table,
-                    'Rows': int(row_count),
-                    'Columns': len(col_names),
-                    'Key Columns': ', '.join(col_names[:5]) + ('...' if len(col_names) > 5 else '')
-                })
-            except:
-                pass
+            # redzone / fgxp are the raw REDZONE / FGXP tables (case-insensitive names)
+            key = table if table in meta.index else table.upper()
+            if key not in meta.index:
+                continue
+            col_names = meta.loc[key, 'columns']
+            table_info.append({
+                'Table': table,
+                'Rows': int(meta.loc[key, 'row_count']),
+                'Columns': len(col_names),
+                'Key Columns': ', '.join(col_names[:5]) + ('...' if len(col_names) > 5 else '')
+            })
 
         return pd.DataFrame(table_info)
 
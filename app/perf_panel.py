@@ -0,0 +1,108 @@
+"""Query performance panel — admin only, opened via Home with ?admin=perf.
+
+Not a file in pages/ so it stays out of the sidebar navigation, but it runs in
+the same server process as the dashboards and can read app.db's ring buffer.
+"""
+import streamlit as st
+import plotly.graph_objects as go
+import pandas as pd
+
+from app.db import query_log, cache_stats, profiling_enabled, enable_profiling
+from app.config import COLORS, CHART_LAYOUT, metric_card
+
+
+def _pct(x):
+    return f"{x:.1f}%" if pd.notna(x) else "—"
+
+
+def render_performance_panel():
+    """Slowest queries, p50/p95 per loader and cache hit rates."""
+    st.title("🛠️ Query Performance")
+
+    if not profiling_enabled():
+        st.info("Query profiling is off. Start the app with `NFL_QUERY_PROFILE=1` "
+                "(optionally `NFL_QUERY_EXPLAIN_MS=500`), or enable it for this process.")
+        if st.button("Enable profiling for this process"):
+            enable_profiling()
+            st.rerun()
+
+    source = st.radio("Source", ["This process", "JSONL log (all workers)"], horizontal=True)
+    log = query_log(include_file=source.startswith("JSONL"))
+    stats = cache_stats()
+
+    if log.empty:
+        st.warning("No queries recorded yet. Browse a few dashboards and come back.")
+        return
+
+    cached = log[log["cache"].notna()] if "cache" in log else log.iloc[0:0]
+    hit_rate = (cached["cache"] == "hit").mean() * 100 if len(cached) else float("nan")
+    rc = stats["result_cache"]
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.markdown(metric_card("Queries", f"{len(log):,}"), unsafe_allow_html=True)
+    with col2:
+        st.markdown(metric_card("p50", f"{log['wall_ms'].quantile(0.5):.1f} ms"), unsafe_allow_html=True)
+    with col3:
+        st.markdown(metric_card("p95", f"{log['wall_ms'].quantile(0.95):.1f} ms"), unsafe_allow_html=True)
+    with col4:
+        st.markdown(metric_card("Result Cache Hit%", _pct(hit_rate), f"n={len(cached)} cached calls"),
+                    unsafe_allow_html=True)
+    with col5:
+        st.markdown(metric_card("Cache on Disk", f"{rc['bytes'] / 1e6:.1f} MB",
+                                f"{rc['entries']} entries"), unsafe_allow_html=True)
+
+    st.caption("Calls answered by st.cache_data never reach app.db and are not counted here.")
+
+    # ── Per-loader latency ──────────────────────────────────────────────
+    st.subheader("Latency by Loader")
+    by_loader = (
+        log.assign(loader=log["page"].fillna("?") + " · " + log["function"].fillna("?"))
+        .groupby("loader")
+        .agg(
+            calls=("wall_ms", "size"),
+            p50_ms=("wall_ms", lambda x: x.quantile(0.5)),
+            p95_ms=("wall_ms", lambda x: x.quantile(0.95)),
+            max_ms=("wall_ms", "max"),
+            rows=("rows", "mean"),
+            mb=("bytes", lambda x: x.mean() / 1e6),
+            cache_hit_pct=("cache", lambda x: (x == "hit").sum() / x.notna().sum() * 100
+                           if x.notna().any() else float("nan")),
+        )
+        .sort_values("p95_ms", ascending=False)
+        .reset_index()
+    )
+    st.dataframe(
+        by_loader.style.format({"p50_ms": "{:.1f}", "p95_ms": "{:.1f}", "max_ms": "{:.1f}",
+                                "rows": "{:,.0f}", "mb": "{:.2f}", "cache_hit_pct": _pct}),
+        use_container_width=True, hide_index=True,
+    )
+
+    top = by_loader.head(15).iloc[::-1]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(y=top["loader"], x=top["p50_ms"], orientation="h",
+                         name="p50", marker=dict(color=COLORS["accent"])))
+    fig.add_trace(go.Bar(y=top["loader"], x=top["p95_ms"] - top["p50_ms"], orientation="h",
+                         name="p95 − p50", marker=dict(color=COLORS["warn"])))
+    fig.update_layout(**CHART_LAYOUT, barmode="stack", height=450,
+                      title="Slowest Loaders (p95)", xaxis_title="Wall time (ms)")
+    st.plotly_chart(fig, use_container_width=True)
+
+    # ── Slowest individual queries ──────────────────────────────────────
+    st.subheader("Slowest Queries")
+    cols = [c for c in ["wall_ms", "rows", "bytes", "cache", "page", "function", "sql", "params", "error"]
+            if c in log.columns]
+    st.dataframe(log.sort_values("wall_ms", ascending=False).head(25)[cols],
+                 use_container_width=True, hide_index=True)
+
+    if "explain" in log.columns:
+        plans = log[log["explain"].notna()].sort_values("wall_ms", ascending=False)
+        if len(plans):
+            st.subheader("EXPLAIN ANALYZE Profiles")
+            for _, row in plans.head(10).iterrows():
+                with st.expander(f"{row['wall_ms']:.0f} ms — {row['page']} · {row['function']}"):
+                    st.code(row["sql"], language="sql")
+                    st.text(row["explain"])
+
+    st.subheader("Connection Pool")
+    st.json(stats["pool"])
@@ -5,13 +5,24 @@ Memory-optimized version using DuckDB for large files
 """
 
 import os
+import re
+import sys
 import json
 import glob
+import shutil
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 import duckdb
 
+# Canonical tables: (name, SELECT, dependencies) in dependency order, defined
+# once in app/canonical.py for both this pipeline and the app.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from app.canonical import CANONICAL_TABLES
+
 # Configuration
 NFL_DATA_DIR = "/sessions/clever-epic-galileo/mnt/NFL"
 OUTPUT_DIR = "/sessions/clever-epic-galileo/nfl_analytics/data_processed"
@@ -20,458 +31,1651 @@ DB_PATH = f"{OUTPUT_DIR}/nfl.duckdb"
 # Ensure output directory exists
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Column/type spec per CSV, written to OUTPUT_DIR on the first load and
+# reused afterwards so re-ingests skip type sniffing.  A table is re-sniffed
+# when its header line changes (or with --refresh-schemas).
+CSV_SCHEMAS_FILE = "csv_schemas.json"
+INGEST_WORKERS = min(4, os.cpu_count() or 2)
+
+# Bounded-memory mode (a memory_limit is given): CSVs larger than this are
+# loaded in line-aligned pieces of about this size, with progress reported
+# per piece, instead of in one read_csv.
+CSV_CHUNK_BYTES = 128 * 1024 * 1024
+RSS_SAMPLE_SECONDS = 0.05  # peak-RSS sampling interval per stage
+
+# Run report written after every run that built something (see
+# export_run_report()): per-stage time, rows, bytes written and peak RSS,
+# plus DuckDB profiles of the slowest statements.  With --compare, a stage
+# counts as a regression when it is REGRESSION_RATIO times slower than in
+# the earlier report and by more than a second.
+RUN_REPORT_FILE = "run_report.json"
+RUN_REPORT_TOP_STATEMENTS = 10
+REGRESSION_RATIO = 1.2
+
+# Build state for run_graph(): one row per node (raw or canonical table) with
+# the content hash it was last built from.
+NODES_TABLE = "_ingest_nodes"
+
+# Season-partitioned export: tables with at least PARTITION_MIN_ROWS rows are
+# written as hive-style datasets ({TABLE}/seas=YYYY/*.parquet), sorted by gid,
+# with row groups small enough that a single game or team-season filter skips
+# most of a partition.  Smaller tables stay single files.
+PARTITION_MIN_ROWS = 50_000
+PARTITION_ROW_GROUP_SIZE = 16_384
+
+# Compact export profile for the largest raw tables, small enough to commit
+# to data_processed/ so the app never has to ingest CSVs.  Columns are pruned
+# to what create_canonical_views() reads (None keeps every column), integers
+# are narrowed to the smallest type that holds the data (SMALLINT at least),
+# DOUBLEs become FLOAT, and files are ZSTD-compressed (DuckDB dictionary-
+# encodes low-cardinality columns on its own).
+COMPACT_TABLES = {
+    "PBP": (
+        "gid", "pid", "detail", "off", "def", "type", "dseq", "len", "qtr", "min", "sec",
+        "ptso", "ptsd", "timo", "timd", "dwn", "ytg", "yfog", "zone", "yds", "succ", "fd",
+        "sg", "nh", "pts", "bc", "kne", "dir", "psr", "comp", "spk", "loc", "trg", "dfb",
+        "eps", "epa",
+    ),
+    "PLAY": None,  # not read by any canonical table; every column is already numeric
+    "TACKLE": ("uid", "pid", "tck", "value"),
+}
+COMPACT_ZSTD_LEVEL = 9
+
+# Tables profiled at once by build_data_dictionary(); each profile is a single
+# scan that DuckDB already parallelizes, so a few workers are enough to keep
+# the small tables from queuing behind PBP/PLAY.
+PROFILE_WORKERS = min(8, os.cpu_count() or 4)
+
+# Table scans run at once by run_data_quality_checks() (see QA_CHECKS).
+QA_WORKERS = min(8, os.cpu_count() or 4)
+
+
+# Schema contract applied to the raw tables right after load (see
+# apply_schema_contract()).  read_csv_auto types every integer as BIGINT and
+# every flag or code as VARCHAR; the contract narrows them:
+#   - VARCHAR columns holding only 'Y'/'N' become BOOLEAN (NULLs kept)
+#   - small categorical integers become TINYINT; other integers the smallest
+#     of SMALLINT/INTEGER that fits (8-bit sums like yfog + ytg overflow)
+#   - team codes and play types become ENUMs
+#   - EPA columns become FLOAT; half-point lines and sack credits DECIMAL(4,1)
+TINYINT_COLUMNS = ("qtr", "dwn", "zone", "timo", "timd", "wk")
+ID_COLUMNS = ("gid", "pid", "uid", "fpid", "tid")  # at least INTEGER: one join type everywhere
+TEAM_COLUMNS = ("off", "def", "v", "h", "ptm", "ptm1", "ptm2", "ptm3", "tname", "team")
+PLAY_TYPE_TABLES = ("PBP", "PLAY")
+FLOAT_COLUMNS = ("eps", "epa")
+HALF_POINT_COLUMNS = ("ou", "sprv", "sck", "value")
+
+INTEGER_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT")
+
+
+def _enum_type(table_name: str, column: str):
+    """The contract's ENUM type for a VARCHAR column, or None."""
+    if column in TEAM_COLUMNS:
+        return "team_code"
+    if column == "type" and table_name in PLAY_TYPE_TABLES:
+        return "play_type"
+    return None
+
+
+def _narrowest_int_type(lo, hi) -> str:
+    """Smallest signed integer type, SMALLINT or wider, holding [lo, hi].
+
+    TINYINT is never chosen: Parquet stores it as INT32 just like SMALLINT,
+    so it saves nothing on disk, and 8-bit sums such as yfog + ytg overflow.
+    """
+    if lo is None:
+        return "SMALLINT"
+    for name, bits in (("SMALLINT", 16), ("INTEGER", 32)):
+        if -(1 << (bits - 1)) <= lo and hi < (1 << (bits - 1)):
+            return name
+    return "BIGINT"
+
+
+def _sort_keys(sql: str):
+    """Output columns a canonical SELECT's trailing ORDER BY sorts on, or None."""
+    match = re.search(r"\bORDER BY\s+([\w.,\s]+?)\s*$", sql)
+    if not match:
+        return None
+    return ", ".join(key.strip().split(".")[-1] for key in match.group(1).split(","))
+
+
+def _qa_gid_uniqueness(values):
+    total, unique = values
+    status = "PASS" if total == unique else "WARN"
+    return ({"total_games": total, "unique_gids": unique, "status": status},
+            status, f"{unique} unique out of {total} games")
+
+
+def _qa_pid_uniqueness(values):
+    total, unique, games = values
+    status = "PASS" if total == unique else "WARN"
+    return ({"total_plays": total, "unique_play_ids": unique, "unique_games": games, "status": status},
+            status, f"{unique} unique (gid, pid) out of {total} plays")
+
+
+def _qa_season_coverage(values):
+    lo, hi, seasons = values
+    if lo is None:
+        return None, "SKIP", "no seasons"
+    return ({"min_season": int(lo), "max_season": int(hi), "num_seasons": int(seasons)},
+            "PASS", f"{int(lo)}-{int(hi)} ({int(seasons)} seasons)")
+
+
+def _qa_missingness(data_dict):
+    report = {table: info["missing_percentage"] for table, info in data_dict.items()
+              if info["missing_percentage"] > 10}
+    return report, "PASS", f"{len(report)} tables >10% missing"
+
+
+def _qa_yards(values):
+    total, suspicious = values
+    status = "PASS" if suspicious == 0 else "WARN"
+    return ({"total_plays_with_yds": total, "suspicious_yards": suspicious, "status": status},
+            status, f"{suspicious} of {total} plays outside -100..100 yards")
+
+
+def _qa_quarters(values):
+    unique, lo, hi = values
+    status = "PASS" if (hi is None or hi <= 4) else "WARN"
+    return ({"unique_quarters": unique, "min_qtr": lo if lo is not None else 0,
+             "max_qtr": hi if hi is not None else 0, "status": status},
+            status, f"{unique} quarters, max {hi}")
+
+
+def _qa_play_types(values):
+    counts = sorted((values[0] or {}).items(), key=lambda kv: -kv[1])
+    return {t: int(n) for t, n in counts}, "PASS", f"{len(counts)} types"
+
+
+def _qa_join_integrity(values):
+    records, matched = values
+    pct = round(100.0 * matched / records, 2) if records else None
+    return ({"records": records, "matched_to_plays": matched, "match_percentage": pct},
+            "PASS", f"{pct}% matched to plays")
+
+
+# Data quality checks run by run_data_quality_checks():
+# (section, item, tables, aggregates, evaluate).  tables[0] is scanned; the
+# other tables only have to exist.  Checks on the same table are folded into
+# one aggregate query, so adding a check on `plays` does not add a scan of
+# `plays`.  evaluate(values) turns the aggregate values into
+# (result, status, message); the result is stored at qa_report[section], or
+# qa_report[section][item] when the check has an item.  A check with no
+# tables is evaluated on the data dictionary instead.
+QA_CHECKS = [
+    ("gid_uniqueness", None, ("games",),
+     ("COUNT(*)", "COUNT(DISTINCT gid)"), _qa_gid_uniqueness),
+    ("pid_uniqueness", None, ("plays",),
+     ("COUNT(*)", "COUNT(DISTINCT (gid, pid))", "COUNT(DISTINCT gid)"), _qa_pid_uniqueness),
+    *[("season_coverage", table, (table,),
+       ("MIN(seas)", "MAX(seas)", "COUNT(DISTINCT seas)"), _qa_season_coverage)
+      for table in ("games", "offense_stats", "defense_stats")],
+    ("high_missingness_tables", None, (), (), _qa_missingness),
+    ("sanity_checks", "yards", ("plays",),
+     ("COUNT(yds)", "COUNT(*) FILTER (WHERE yds < -100 OR yds > 100)"), _qa_yards),
+    ("sanity_checks", "quarters", ("plays",),
+     ("COUNT(DISTINCT qtr)", "MIN(qtr)", "MAX(qtr)"), _qa_quarters),
+    ("sanity_checks", "play_types", ("plays",),
+     ("histogram(type)",), _qa_play_types),
+    # A semi-join on pid: counts each record once, without joining plays' columns
+    *[("join_integrity", table, (table, "plays"),
+       ("COUNT(*)", "COUNT(*) FILTER (WHERE pid IN (SELECT pid FROM plays))"), _qa_join_integrity)
+      for table in ("PASS", "RUSH", "SACK")],
+]
+
+
+def _current_rss():
+    """Resident set size of this process in bytes (None where unsupported)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # Peak rather than current RSS, but still an upper bound per stage
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _bytes_written():
+    """Bytes this process has passed to write() so far (None where unsupported).
+
+    Covers the database file, spill files and parquet output alike.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+_SINK_OPERATORS = ("CREATE_TABLE_AS", "BATCH_CREATE_TABLE_AS", "INSERT", "BATCH_INSERT",
+                   "COPY_TO_FILE", "BATCH_COPY_TO_FILE")
+
+
+def _statement_profile(profile: dict) -> dict:
+    """Rows written, peak buffer memory and slowest operators of a DuckDB JSON profile."""
+    operators = []
+
+    def walk(node):
+        for child in node.get("children", []):
+            operators.append(child)
+            walk(child)
+
+    walk(profile)
+    root = (profile.get("children") or [{}])[0]
+    if root.get("operator_type") in _SINK_OPERATORS:
+        rows = sum(child.get("operator_cardinality", 0) for child in root.get("children", []))
+    else:
+        rows = root.get("operator_cardinality")
+    slowest = sorted(operators, key=lambda op: -op.get("operator_timing", 0.0))[:3]
+    return {
+        "rows": rows,
+        "cpu_seconds": round(profile.get("cpu_time", 0.0), 3),
+        "peak_buffer_mb": round(profile.get("system_peak_buffer_memory", 0) / 1e6, 1),
+        "operators": [
+            {"operator": op.get("operator_name"), "seconds": round(op.get("operator_timing", 0.0), 3),
+             "rows": op.get("operator_cardinality")}
+            for op in slowest
+        ],
+    }
+
+
+STAGE_TABLE_HEADER = f"{'Stage':<10} {'seconds':>8} {'peak RSS (MB)':>13} {'rows':>12} {'MB written':>10}"
+
+
+def _stage_row(stage: str, st: dict) -> str:
+    """One line of the stage table (see STAGE_TABLE_HEADER)."""
+    rss, rows, written = st.get("peak_rss_mb"), st.get("rows"), st.get("bytes_written")
+    return (f"{stage:<10} {st['seconds']:>8.1f} {'-' if rss is None else f'{rss:.0f}':>13} "
+            f"{'-' if rows is None else f'{rows:,}':>12} "
+            f"{'-' if written is None else f'{written / 1e6:.1f}':>10}")
+
+
+def _csv_chunks(csv_file: str, chunk_bytes: int, out_dir: str):
+    """Yield (path, bytes_read) for pieces of csv_file of about chunk_bytes.
+
+    Each piece is written to out_dir with the header repeated and is
+    deleted when the caller moves on.  Pieces end at a line break outside
+    quoted fields (an even number of quotes so far).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    stem = Path(csv_file).stem
+    with open(csv_file, "rb") as src:
+        header = src.readline()
+        done = len(header)
+        part = 0
+        while True:
+            block = src.read(chunk_bytes)
+            if not block:
+                return
+            block += src.readline()
+            while block.count(b'"') % 2:
+                line = src.readline()
+                if not line:
+                    break
+                block += line
+            done += len(block)
+            path = os.path.join(out_dir, f"{stem}.part{part}.csv")
+            with open(path, "wb") as out:
+                out.write(header)
+                out.write(block)
+            del block
+            try:
+                yield path, done
+            finally:
+                os.remove(path)
+            part += 1
+
 
 class NFLDataPipeline:
     """Main data ingestion and processing pipeline"""
 
-    def __init__(self):
-        """Initialize the pipeline"""
+    def __init__(self, memory_limit: str = None, threads: int = None, temp_dir: str = None):
+        """Initialize the pipeline
+
+        memory_limit (a DuckDB size such as "1.5GB"), threads and temp_dir
+        (where DuckDB spills) bound the build for small machines; with a
+        memory_limit, large CSVs are also loaded in CSV_CHUNK_BYTES pieces.
+        """
         self.data_dict = {}
         self.qa_report = {}
+        self.qa_checks = []
+        self.load_stats = {}
+        self.load_errors = {}
+        self.stage_stats = {}
+        self.statement_stats = []
+        self._stages = []
+        self.memory_limit = memory_limit
+        self.threads = threads
+        self.temp_dir = temp_dir
         self.conn = None
 
-    def connect_db(self):
-        """Create DuckDB connection"""
+    def connect_db(self, fresh: bool = True):
+        """Create DuckDB connection (fresh=False keeps the existing database)"""
         # Remove existing DB if it exists
-        if os.path.exists(DB_PATH):
+        if fresh and os.path.exists(DB_PATH):
             os.remove(DB_PATH)
         self.conn = duckdb.connect(DB_PATH)
         print(f"Connected to DuckDB: {DB_PATH}")
 
+        # Resource limits apply to every cursor on the database
+        if self.memory_limit:
+            self.conn.execute(f"SET memory_limit = '{self.memory_limit}'")
+            # Lets large CREATE TABLE AS / COPY stream without buffering rows
+            # to keep their order; ORDER BY clauses are still honoured
+            self.conn.execute("SET preserve_insertion_order = false")
+        if self.threads:
+            self.conn.execute(f"SET threads = {int(self.threads)}")
+        if self.temp_dir:
+            os.makedirs(self.temp_dir, exist_ok=True)
+            self.conn.execute(f"SET temp_directory = '{self.temp_dir}'")
+        if self.memory_limit or self.threads or self.temp_dir:
+            settings = self.conn.execute("""
+                SELECT current_setting('memory_limit'), current_setting('threads'),
+                       current_setting('temp_directory')
+            """).fetchone()
+            print(f"DuckDB limits: memory {settings[0]}, {settings[1]} threads, spill to {settings[2]}")
+
+    @contextmanager
+    def _stage(self, name: str):
+        """Time a pipeline stage and sample its peak RSS into stage_stats."""
+        peak = [_current_rss()]
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(RSS_SAMPLE_SECONDS):
+                rss = _current_rss()
+                if rss is not None and (peak[0] is None or rss > peak[0]):
+                    peak[0] = rss
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        self._stages.append(name)
+        first = len(self.statement_stats)
+        written = _bytes_written()
+        started = time.time()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+            seconds = time.time() - started
+            self._stages.pop()
+            rss = _current_rss()
+            if rss is not None and (peak[0] is None or rss > peak[0]):
+                peak[0] = rss
+            peak_mb = round(peak[0] / 1e6, 1) if peak[0] is not None else None
+            now = _bytes_written()
+            written = now - written if now is not None and written is not None else None
+            statements = [st for st in self.statement_stats[first:] if st["stage"] == name]
+            rows = sum(st["rows"] or 0 for st in statements) if statements else None
+            self.stage_stats[name] = {
+                "seconds": round(seconds, 3),
+                "peak_rss_mb": peak_mb,
+                "rows": rows,
+                "bytes_written": written,
+                "statements": len(statements),
+            }
+            print(f"⏱ {name}: {seconds:.1f}s"
+                  + (f", peak RSS {peak_mb:.0f} MB" if peak_mb is not None else "")
+                  + (f", {rows:,} rows" if rows is not None else "")
+                  + (f", {written / 1e6:.0f} MB written" if written is not None else ""))
+
+    def _execute(self, cur, label: str, sql: str, params: list = None) -> list:
+        """Run a heavy write (load, CREATE TABLE AS, COPY) with DuckDB profiling.
+
+        The statement's time, rows written and slowest operators go to
+        statement_stats under the current stage; returns its result rows.
+        """
+        cur.execute("PRAGMA enable_profiling = 'no_output'")
+        try:
+            started = time.time()
+            rows = cur.execute(sql, params).fetchall()
+            seconds = time.time() - started
+            profile = json.loads(cur.get_profiling_information(format="json"))
+        finally:
+            cur.execute("PRAGMA disable_profiling")
+        self.statement_stats.append({
+            "stage": self._stages[-1] if self._stages else None,
+            "statement": label,
+            "seconds": round(seconds, 3),
+            **_statement_profile(profile),
+        })
+        return rows
+
     def close_db(self):
         """Close DuckDB connection"""
         if self.conn:
             self.conn.close()
 
-    def load_raw_tables(self):
-        """Load all CSV files directly into DuckDB as raw tables"""
+    def load_raw_tables(self, workers: int = 1, refresh_schemas: bool = False,
+                        tables: list = None) -> list:
+        """Load all CSV files directly into DuckDB as raw tables
+
+        Column types come from the stored spec in CSV_SCHEMAS_FILE (sniffed
+        over the whole file once, then reused while the header is unchanged).
+        Rows that don't fit the spec are skipped and counted as rejected
+        instead of failing the table.  With workers > 1, files load
+        concurrently on separate cursors.  `tables` limits the load to those
+        CSVs.  Returns the tables loaded.
+        """
         print("\n=== LOADING RAW CSV TABLES ===")
+        from concurrent.futures import ThreadPoolExecutor
+
         csv_files = sorted(glob.glob(f"{NFL_DATA_DIR}/*.csv"))
+        if tables is not None:
+            csv_files = [f for f in csv_files if Path(f).stem in tables]
+        schemas = {} if refresh_schemas else self._read_csv_schemas()
 
-        for csv_file in csv_files:
+        def load(csv_file):
             table_name = Path(csv_file).stem
+            cur = self.conn.cursor()
             try:
-                # Use read_csv with relaxed parsing for PLAY file
-                if table_name == 'PLAY':
-                    self.conn.execute(f"""
-                        CREATE TABLE {table_name} AS
-                        SELECT * FROM read_csv('{csv_file}', ignore_errors=true)
-                    """)
-                else:
-                    self.conn.execute(f"""
-                        CREATE TABLE {table_name} AS
-                        SELECT * FROM read_csv_auto('{csv_file}')
-                    """)
-
-                # Get table stats
-                result = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchall()[0][0]
-                print(f"✓ {table_name}: {result} rows")
+                return table_name, self._load_csv(cur, csv_file, schemas), None
             except Exception as e:
-                print(f"✗ {table_name}: {e}")
-
-    def build_data_dictionary(self):
-        """Build comprehensive data dictionary for all tables"""
-        print("\n=== BUILDING DATA DICTIONARY ===")
+                return table_name, None, e
+            finally:
+                cur.close()
+
+        started = datetime.now()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(load, csv_files))
+        elapsed = (datetime.now() - started).total_seconds()
+
+        total_rows = 0
+        loaded = []
+        for table_name, stats, error in results:
+            if error is not None:
+                self.load_errors[table_name] = str(error)
+                print(f"✗ {table_name}: {error}")
+                continue
+            loaded.append(table_name)
+            self.load_stats[table_name] = stats
+            total_rows += stats["rows"]
+            rejected = f", {stats['rejected']} rejected" if stats["rejected"] else ""
+            print(f"✓ {table_name}: {stats['rows']} rows "
+                  f"({stats['rows_per_sec']:,.0f} rows/s{rejected})")
+
+        self._write_csv_schemas(schemas)
+        if elapsed > 0:
+            print(f"Loaded {total_rows} rows in {elapsed:.1f}s "
+                  f"({total_rows / elapsed:,.0f} rows/s, {max(1, workers)} workers)")
+        return loaded
+
+    def _load_csv(self, cur, csv_file: str, schemas: dict, staging: bool = False) -> dict:
+        """Load one CSV with its stored column spec; returns load stats.
+
+        `schemas` is updated in place when the file is (re-)sniffed.  With
+        staging, the rows go to a temp table _incoming_{table} on `cur`
+        instead of the table itself.
+        """
+        table_name = Path(csv_file).stem
+        target = f"_incoming_{table_name}" if staging else table_name
+        with open(csv_file, encoding="utf-8", errors="replace") as f:
+            header = f.readline().rstrip("\r\n")
+
+        spec = schemas.get(table_name)
+        sniffed = not spec or spec.get("header") != header
+        if sniffed:
+            # Sniff every row so the stored types hold for the whole file;
+            # malformed rows (PLAY has some) are left for the load to reject.
+            columns = cur.execute(f"""
+                DESCRIBE SELECT * FROM read_csv('{csv_file}', sample_size=-1, ignore_errors=true)
+            """).fetchall()
+            spec = {"header": header, "columns": {row[0]: row[1] for row in columns}}
+            schemas[table_name] = spec
+
+        columns_sql = ", ".join(
+            f"'{name.replace(chr(39), chr(39) * 2)}': '{dtype}'"
+            for name, dtype in spec["columns"].items()
+        )
+
+        # Oversized files go in pieces under a memory budget
+        size = os.path.getsize(csv_file)
+        chunked = bool(self.memory_limit) and size > CSV_CHUNK_BYTES
+        if chunked:
+            pieces = _csv_chunks(csv_file, CSV_CHUNK_BYTES, self.temp_dir or f"{DB_PATH}.tmp")
+        else:
+            pieces = [(csv_file, size)]
+
+        started = datetime.now()
+        rejected = 0
+        try:
+            for i, (path, done) in enumerate(pieces):
+                write = (f"CREATE OR REPLACE {'TEMP ' if staging else ''}TABLE {target} AS"
+                         if i == 0 else f"INSERT INTO {target}")
+                self._execute(cur, f"load {table_name}", f"""
+                    {write}
+                    SELECT * FROM read_csv('{path}', header=true, columns={{{columns_sql}}},
+                                           store_rejects=true,
+                                           rejects_table='_rejects_{table_name}',
+                                           rejects_scan='_rejects_scan_{table_name}')
+                """)
+                rejected += cur.execute(
+                    f"SELECT COUNT(DISTINCT line) FROM _rejects_{table_name}"
+                ).fetchall()[0][0]
+                cur.execute(f"DROP TABLE IF EXISTS _rejects_{table_name}")
+                cur.execute(f"DROP TABLE IF EXISTS _rejects_scan_{table_name}")
+                if chunked:
+                    so_far = cur.execute(f"SELECT COUNT(*) FROM {target}").fetchone()[0]
+                    print(f"  … {table_name}: {done / size:.0%} ({so_far} rows)")
+        finally:
+            if chunked:
+                pieces.close()  # removes the last piece if a load failed
+        seconds = (datetime.now() - started).total_seconds()
+
+        # Get table stats
+        rows = cur.execute(f"SELECT COUNT(*) FROM {target}").fetchall()[0][0]
+        if sniffed and rows == 0:
+            # A header-only file types every column VARCHAR; don't keep that
+            schemas.pop(table_name, None)
+
+        return {
+            "rows": rows,
+            "rejected": rejected,
+            "seconds": round(seconds, 3),
+            "rows_per_sec": rows / seconds if seconds > 0 else float(rows),
+        }
+
+    def load_incremental(self, workers: int = 1, refresh_schemas: bool = False) -> dict:
+        """Upsert the CSVs into the existing raw tables; returns what changed.
+
+        Each CSV is staged and compared with its table per grain key (gid,
+        else pid) using a row count and hash sum per key.  Rows of new or
+        changed keys are replaced; keys missing from the CSV are left alone,
+        so both full dumps and weekly delta drops work.  Tables without a
+        key are replaced when their contents differ, and CSVs with no table
+        yet (or new columns) are loaded whole.  Before the upserts, each
+        table's types are widened where the staged rows don't fit them (see
+        _fit_staged_types()).
+
+        Returns {table: {"key", "keys", "rows", "new"}} for changed tables;
+        "keys" is None when the whole table was (re)written or retyped.
+        """
+        print("\n=== LOADING CSV TABLES INCREMENTALLY ===")
+        from concurrent.futures import ThreadPoolExecutor
 
-        # Get all table names from DuckDB
-        tables = self.conn.execute("""
+        csv_files = sorted(glob.glob(f"{NFL_DATA_DIR}/*.csv"))
+        tables = [Path(f).stem for f in csv_files]
+        schemas = {} if refresh_schemas else self._read_csv_schemas()
+        existing = {row[0] for row in self.conn.execute("""
             SELECT table_name FROM information_schema.tables
-            WHERE table_schema='main'
-        """).fetchall()
+            WHERE table_schema='main' AND table_type='BASE TABLE'
+        """).fetchall()}
 
-        for (table_name,) in tables:
+        # Staged rows live in temp tables, so each CSV keeps its cursor from
+        # staging through its upsert.
+        cursors, changes, errors, retyped = {}, {}, {}, set()
+
+        def stage(csv_file):
+            table_name = Path(csv_file).stem
+            cur = self.conn.cursor()
+            cursors[table_name] = cur
             try:
-                # Get table info
-                schema = self.conn.execute(f"DESCRIBE {table_name}").fetchall()
-                columns = [row[0] for row in schema]
-                dtypes = {row[0]: row[1] for row in schema}
-
-                # Row count
-                row_count = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchall()[0][0]
-
-                # Missing percentage
-                missing_count = 0
-                total_cells = 0
-                for col in columns:
-                    null_count = self.conn.execute(
-                        f"SELECT COUNT(*) FROM {table_name} WHERE {col} IS NULL"
-                    ).fetchall()[0][0]
-                    missing_count += null_count
-                    total_cells += row_count
-
-                missing_pct = (missing_count / total_cells * 100) if total_cells > 0 else 0
-
-                # Season range
-                season_range = None
-                if 'seas' in columns:
-                    try:
-                        result = self.conn.execute(
-                            f"SELECT MIN(seas), MAX(seas) FROM {table_name} WHERE seas IS NOT NULL"
-                        ).fetchall()[0]
-                        if result[0] is not None:
-                            season_range = (int(result[0]), int(result[1]))
-                    except:
-                        pass
-
-                # Missing by column
-                missing_by_col = {}
-                for col in columns:
-                    null_pct = self.conn.execute(
-                        f"SELECT ROUND(100.0 * COUNT(*) FILTER (WHERE {col} IS NULL) / COUNT(*), 2) FROM {table_name}"
-                    ).fetchall()[0][0]
-                    missing_by_col[col] = null_pct
-
-                self.data_dict[table_name] = {
-                    "row_count": row_count,
-                    "column_count": len(columns),
-                    "columns": columns,
-                    "dtypes": dtypes,
-                    "missing_percentage": round(missing_pct, 2),
-                    "missing_by_column": missing_by_col,
-                    "season_range": season_range
-                }
-
-                print(f"✓ {table_name}: {row_count} rows, {missing_pct:.1f}% missing")
+                if table_name not in existing:
+                    stats = self._load_csv(cur, csv_file, schemas)
+                    changes[table_name] = {"key": None, "keys": None, "rows": stats["rows"], "new": True}
+                else:
+                    self._load_csv(cur, csv_file, schemas, staging=True)
             except Exception as e:
-                print(f"✗ {table_name}: {e}")
+                errors[table_name] = e
 
-    def export_to_parquet(self):
-        """Export all tables to Parquet format"""
-        print("\n=== EXPORTING TO PARQUET ===")
-
-        tables = self.conn.execute("""
-            SELECT table_name FROM information_schema.tables
-            WHERE table_schema='main'
-        """).fetchall()
-
-        for (table_name,) in tables:
+        def upsert(table_name):
             try:
-                output_path = f"{OUTPUT_DIR}/{table_name}.parquet"
-                self.conn.execute(f"""
-                    COPY {table_name} TO '{output_path}' (FORMAT PARQUET, COMPRESSION SNAPPY)
-                """)
-                print(f"✓ {table_name}.parquet")
+                change = self._upsert_table(cursors[table_name], table_name, f"_incoming_{table_name}",
+                                            retyped=table_name in retyped)
+                if change is not None:
+                    changes[table_name] = change
             except Exception as e:
-                print(f"✗ {table_name}.parquet: {e}")
+                errors[table_name] = e
 
-    def create_canonical_views(self):
-        """Create canonical views and tables from raw tables"""
-        print("\n=== CREATING CANONICAL VIEWS ===")
-
-        views_created = 0
-
-        # 1. GAMES view: GAME + SCHEDULE joined on gid
         try:
-            # Check if GAME and SCHEDULE tables exist
-            self.conn.execute("SELECT 1 FROM GAME LIMIT 1")
-            self.conn.execute("SELECT 1 FROM SCHEDULE LIMIT 1")
-
-            self.conn.execute("""
-                CREATE TABLE games AS
-                SELECT
-                    g.gid, g.seas, g.wk, g.day, s.date,
-                    g.v, g.h, g.stad, g.temp, g.humd, g.wspd, g.wdir, g.cond, g.surf,
-                    g.ou, g.sprv, g.ptsv, g.ptsh
-                FROM GAME g
-                LEFT JOIN SCHEDULE s ON g.gid = s.gid
-            """)
-            print("✓ games")
-            views_created += 1
-        except Exception as e:
-            if "does not exist" in str(e):
-                print(f"⊘ games: GAME or SCHEDULE table not loaded")
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                list(pool.map(stage, csv_files))
+                staged = [t for t in tables if t in existing and t not in errors]
+                # Extending an ENUM re-casts columns of every table, so types
+                # are fitted one table at a time, between the concurrent phases
+                for table_name in staged:
+                    try:
+                        if self._fit_staged_types(cursors[table_name], table_name, f"_incoming_{table_name}"):
+                            retyped.add(table_name)
+                    except Exception as e:
+                        errors[table_name] = e
+                list(pool.map(upsert, [t for t in staged if t not in errors]))
+        finally:
+            for cur in cursors.values():
+                cur.close()
+
+        for table_name in tables:
+            change = changes.get(table_name)
+            if table_name in errors:
+                self.load_errors[table_name] = str(errors[table_name])
+                print(f"✗ {table_name}: {errors[table_name]}")
+            elif change is None:
+                print(f"⊘ {table_name}: unchanged")
+            elif change["keys"] is None:
+                print(f"✓ {table_name}: rewritten ({change['rows']} rows)")
             else:
-                print(f"✗ games: {e}")
-
-        # 2. PLAYS view: from PBP with key columns
+                print(f"✓ {table_name}: {len(change['keys'])} {change['key']}s upserted ({change['rows']} rows)")
+
+        self._write_csv_schemas(schemas)
+        return {t: changes[t] for t in tables if t in changes}
+
+    def _fit_staged_types(self, cur, table_name: str, staging: str) -> bool:
+        """Widen table_name's contract types where the staged rows don't fit them.
+
+        ENUM columns get the staged values added (see _extend_enum());
+        narrowed integers are widened to the narrowest type holding the
+        staged MIN/MAX, and half-point DECIMALs go back to DOUBLE when a
+        staged value isn't one.  Returns True if a column of table_name
+        changed type (ENUM extensions don't count: the values are the same).
+        """
+        schema = {row[0]: row[1] for row in cur.execute(f"DESCRIBE {table_name}").fetchall()}
+        staged = {row[0]: row[1] for row in cur.execute(f"DESCRIBE {staging}").fetchall()}
+        if sorted(staged) != sorted(schema):
+            return False  # the upsert replaces the whole table
+
+        for type_name in ("team_code", "play_type"):
+            self._extend_enum(cur, type_name, [
+                (staging, c) for c, dtype in schema.items()
+                if dtype.startswith("ENUM(") and _enum_type(table_name, c) == type_name
+            ])
+
+        # One scan of the staged rows gathers every check
+        checks = {}
+        for col, dtype in schema.items():
+            q = f'"{col}"'
+            if dtype in INTEGER_TYPES and staged[col] in INTEGER_TYPES and staged[col] != dtype:
+                checks[col] = (f"MIN({q})", f"MAX({q})")
+            elif dtype.startswith("DECIMAL") and staged[col] in INTEGER_TYPES + ("DOUBLE",):
+                checks[col] = (f"bool_and({q} * 10 = ROUND({q} * 10) AND ABS({q}) < 1000)",)
+        if not checks:
+            return False
+        exprs = [e for col_exprs in checks.values() for e in col_exprs]
+        row = cur.execute(f"SELECT {', '.join(exprs)} FROM {staging}").fetchone()
+
+        widen = {}
+        i = 0
+        for col, col_exprs in checks.items():
+            values = row[i:i + len(col_exprs)]
+            i += len(col_exprs)
+            dtype = schema[col]
+            if dtype in INTEGER_TYPES:
+                lo, hi = values
+                bits = 8 << INTEGER_TYPES.index(dtype)
+                if lo is not None and not (-(1 << (bits - 1)) <= lo and hi < (1 << (bits - 1))):
+                    widen[col] = _narrowest_int_type(lo, hi)
+            elif values == (False,):
+                widen[col] = "DOUBLE"
+        if not widen:
+            return False
+
+        cur.execute("BEGIN TRANSACTION")
         try:
-            self.conn.execute("""
-                CREATE TABLE plays AS
-                SELECT
-                    gid, pid, detail, off, def, type, dseq, len, qtr, min, sec,
-                    ptso, ptsd, timo, timd, dwn, ytg, yfog, zone, yds, succ, fd, sg, nh, pts,
-                    bc, kne, dir, psr, comp, spk, loc, trg, dfb, eps, epa
-                FROM PBP
-            """)
-            print("✓ plays")
-            views_created += 1
-        except Exception as e:
-            print(f"✗ plays: {e}")
-
-        # 3. DRIVES view
-        try:
-            self.conn.execute("""
-                CREATE TABLE drives AS
-                SELECT
-                    uid, gid, fpid, tname, drvn, obt, qtr, min, sec, yfog, plays,
-                    succ, rfd, pfd, ofd, ry, ra, py, pa, pc, peyf, peya, net, res
-                FROM DRIVE
-            """)
-            print("✓ drives")
-            views_created += 1
-        except Exception as e:
-            print(f"✗ drives: {e}")
-
-        # 4. PASSES view: PASS joined to PLAYS
+            for col, target in widen.items():
+                self._execute(cur, f"widen {table_name}", f'ALTER TABLE {table_name} ALTER "{col}" TYPE {target}')
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+        print(f"✓ {table_name}: widened " + ", ".join(f"{c} {schema[c]} → {t}" for c, t in widen.items()))
+        return True
+
+    def _upsert_table(self, cur, table_name: str, staging: str, retyped: bool = False):
+        """Apply the staged rows to table_name; the change record or None.
+
+        A `retyped` table (see _fit_staged_types()) is reported as rewritten,
+        so its exports and downstream tables are rebuilt in the new types.
+        """
+        schema = cur.execute(f"DESCRIBE {table_name}").fetchall()
+        columns = [row[0] for row in schema]
+        staged = [row[0] for row in cur.execute(f"DESCRIBE {staging}").fetchall()]
+
+        empty = cur.execute(f"SELECT COUNT(*) = 0 FROM {table_name}").fetchone()[0]
+
+        cur.execute("BEGIN TRANSACTION")
         try:
+            if empty or sorted(staged) != sorted(columns):
+                # Columns changed (or nothing to keep): take the new file as is
+                self._execute(cur, f"upsert {table_name}",
+                              f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM {staging}")
+                rows = cur.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+                change = {"key": None, "keys": None, "rows": rows, "new": True}
+            else:
+                change = self._upsert_rows(cur, table_name, staging, schema)
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+        if change is not None and retyped:
+            change = {**change, "key": None, "keys": None}
+        return change
+
+    def _upsert_rows(self, cur, table_name: str, staging: str, schema: list):
+        # Staged rows cast to the table's (contract) types, so hashes compare
+        incoming = "SELECT " + ", ".join(f'CAST("{c}" AS {t}) AS "{c}"' for c, t, *_ in schema) + f" FROM {staging}"
+        row_hash = "SUM(hash(" + ", ".join(f'"{row[0]}"' for row in schema) + ")::HUGEINT)"
+        columns = [row[0] for row in schema]
+        key = next((k for k in ("gid", "pid") if k in columns), None)
+
+        if key is None:
+            same = cur.execute(f"""
+                SELECT (SELECT (COUNT(*), {row_hash}) FROM {table_name})
+                       IS NOT DISTINCT FROM (SELECT (COUNT(*), {row_hash}) FROM ({incoming}))
+            """).fetchone()[0]
+            if same:
+                return None
+            cur.execute(f"DELETE FROM {table_name}")
+            rows = self._execute(cur, f"upsert {table_name}", f"INSERT INTO {table_name} {incoming}")[0][0]
+            return {"key": None, "keys": None, "rows": rows, "new": False}
+
+        keys = [row[0] for row in cur.execute(f"""
+            SELECT i.k
+            FROM (SELECT "{key}" AS k, COUNT(*) AS n, {row_hash} AS h FROM ({incoming}) GROUP BY 1) i
+            LEFT JOIN (SELECT "{key}" AS k, COUNT(*) AS n, {row_hash} AS h FROM {table_name} GROUP BY 1) e
+                ON i.k IS NOT DISTINCT FROM e.k
+            WHERE i.n IS DISTINCT FROM e.n OR i.h IS DISTINCT FROM e.h
+        """).fetchall()]
+        if not keys:
+            return None
+        cur.execute(f"CREATE OR REPLACE TEMP TABLE _changed_keys AS SELECT unnest(?::BIGINT[]) AS k", [keys])
+        match = f'EXISTS (SELECT 1 FROM _changed_keys c WHERE c.k IS NOT DISTINCT FROM "{key}")'
+        cur.execute(f"DELETE FROM {table_name} WHERE {match}")
+        rows = self._execute(cur, f"upsert {table_name}",
+                             f"INSERT INTO {table_name} SELECT * FROM ({incoming}) WHERE {match}")[0][0]
+        return {"key": key, "keys": keys, "rows": rows, "new": False}
+
+    def _mark_affected(self, changes: dict) -> list:
+        """Register the games/plays touched by `changes`; returns their seasons.
+
+        Creates temp tables _affected_gids and _affected_pids: the upserted
+        gids plus the games of upserted pids, and every play of those games
+        plus the upserted pids.
+        """
+        gids = [k for c in changes.values() if c["key"] == "gid" for k in c["keys"]]
+        pids = [k for c in changes.values() if c["key"] == "pid" for k in c["keys"]]
+        self.conn.execute(
+            "CREATE OR REPLACE TEMP TABLE _affected_gids AS SELECT DISTINCT unnest(?::BIGINT[]) AS gid", [gids]
+        )
+        self.conn.execute(
+            "CREATE OR REPLACE TEMP TABLE _affected_pids AS SELECT DISTINCT unnest(?::BIGINT[]) AS pid", [pids]
+        )
+        if self._table_exists("PBP"):
             self.conn.execute("""
-                CREATE TABLE passes AS
-                SELECT
-                    p.pid, p.psr, p.trg, p.loc, p.yds, p.comp, p.succ, p.spk, p.dfb,
-                    pl.gid, pl.off, pl.def, pl.qtr, pl.min, pl.sec, pl.pts
-                FROM PASS p
-                LEFT JOIN plays pl ON p.pid = pl.pid
+                INSERT INTO _affected_gids
+                SELECT DISTINCT gid FROM PBP
+                WHERE pid IN (SELECT pid FROM _affected_pids)
+                  AND gid NOT IN (SELECT gid FROM _affected_gids)
             """)
-            print("✓ passes")
-            views_created += 1
-        except Exception as e:
-            print(f"✗ passes: {e}")
-
-        # 5. RUSHES view: RUSH joined to PLAYS
-        try:
             self.conn.execute("""
-                CREATE TABLE rushes AS
-                SELECT
-                    r.pid, r.bc, r.dir, r.yds, r.succ, r.kne,
-                    pl.gid, pl.off, pl.def, pl.qtr, pl.min, pl.sec, pl.pts
-                FROM RUSH r
-                LEFT JOIN plays pl ON r.pid = pl.pid
+                INSERT INTO _affected_pids
+                SELECT pid FROM PBP
+                WHERE gid IN (SELECT gid FROM _affected_gids)
+                  AND pid NOT IN (SELECT pid FROM _affected_pids)
             """)
-            print("✓ rushes")
-            views_created += 1
-        except Exception as e:
-            print(f"✗ rushes: {e}")
-
-        # 6-23: Simple views from individual tables
-        # Note: Some tables may not exist if they had load errors
-        simple_views = [
-            ("penalties", "SELECT uid, pid, ptm, pen, \"desc\", cat, pey, act FROM PENALTY", "PENALTY"),
-            ("sacks", "SELECT uid, pid, qb, sk, value, ydsl FROM SACK", "SACK"),
-            ("tackles", "SELECT uid, pid, tck, value FROM TACKLE", "TACKLE"),
-            ("players", "SELECT * FROM PLAYER", "PLAYER"),
-            ("offense_stats", "SELECT * FROM OFFENSE", "OFFENSE"),
-            ("defense_stats", "SELECT * FROM DEFENSE", "DEFENSE"),
-            ("injuries", "SELECT * FROM INJURY", "INJURY"),
-            ("snaps", "SELECT * FROM SNAP", "SNAP"),
-            ("redzone", "SELECT * FROM REDZONE", "REDZONE"),
-            ("fgxp", "SELECT * FROM FGXP", "FGXP"),
-            ("touchdowns", "SELECT * FROM TD", "TD"),
-            ("fumbles", "SELECT * FROM FUMBLE", "FUMBLE"),
-            ("interceptions", "SELECT * FROM INTERCPT", "INTERCPT"),
-            ("kickoffs", "SELECT * FROM KOFF", "KOFF"),
-            ("punts", "SELECT * FROM PUNT", "PUNT"),
-            ("blocks", "SELECT * FROM BLOCK", "BLOCK"),
-            ("conversions", "SELECT * FROM CONV", "CONV"),
-            ("safeties", "SELECT * FROM SAFETY", "SAFETY"),
-        ]
-
-        for view_name, sql, source_table in simple_views:
+        if not self._table_exists("GAME"):
+            return []
+        return [row[0] for row in self.conn.execute("""
+            SELECT DISTINCT seas FROM GAME WHERE gid IN (SELECT gid FROM _affected_gids)
+        """).fetchall()]
+
+    def refresh_canonical_tables(self, changes: dict) -> list:
+        """Bring canonical tables up to date after load_incremental()
+
+        Rows for the affected games and plays (see _mark_affected()) are
+        deleted and re-selected from each table's SQL.  Tables downstream of
+        a rewritten raw table, or with neither gid nor pid, are rebuilt.
+        The re-selected rows land at the end of the table, so a table whose
+        SQL has an ORDER BY (team_games and the *_wide tables, sorted by
+        season for zone-map pruning) is then rewritten in that order from
+        itself, which is cheaper than re-running its joins.  Returns the
+        tables brought up to date.
+        """
+        print("\n=== REFRESHING CANONICAL TABLES ===")
+
+        refreshed = []
+        dirty = set(changes)
+        rebuild = {t for t, c in changes.items() if c["keys"] is None}
+        for view_name, sql, deps in CANONICAL_TABLES:
+            if not dirty.intersection(deps):
+                continue
+            dirty.add(view_name)
+            missing = [d for d in deps if not self._table_exists(d)]
+            if missing:
+                print(f"⊘ {view_name}: source table {', '.join(missing)} not loaded")
+                continue
             try:
-                # Check if source table exists first
+                columns = []
+                if self._table_exists(view_name):
+                    columns = [row[0] for row in self.conn.execute(f"DESCRIBE {view_name}").fetchall()]
+                match = " OR ".join(
+                    f"{k} IN (SELECT {k} FROM _affected_{k}s)" for k in ("gid", "pid") if k in columns
+                )
+                if rebuild.intersection(deps) or not match:
+                    rebuild.add(view_name)
+                    self._execute(self.conn, f"canonical {view_name}",
+                                  f"CREATE OR REPLACE TABLE {view_name} AS {sql}")
+                    print(f"✓ {view_name}: rebuilt")
+                    refreshed.append(view_name)
+                    continue
+                self.conn.execute("BEGIN TRANSACTION")
                 try:
-                    self.conn.execute(f"SELECT 1 FROM {source_table} LIMIT 1")
-                    self.conn.execute(f"CREATE TABLE {view_name} AS {sql}")
-                    print(f"✓ {view_name}")
-                    views_created += 1
-                except Exception as check_err:
-                    if "does not exist" in str(check_err):
-                        print(f"⊘ {view_name}: source table {source_table} not loaded")
-                    else:
-                        raise check_err
+                    self.conn.execute(f"DELETE FROM {view_name} WHERE {match}")
+                    rows = self._execute(
+                        self.conn, f"canonical {view_name}",
+                        f"INSERT INTO {view_name} SELECT * FROM ({sql}) WHERE {match}",
+                    )[0][0]
+                    order = _sort_keys(sql)
+                    if order:
+                        self._execute(
+                            self.conn, f"canonical {view_name}",
+                            f"CREATE OR REPLACE TABLE {view_name} AS SELECT * FROM {view_name} ORDER BY {order}",
+                        )
+                    self.conn.execute("COMMIT")
+                except Exception:
+                    self.conn.execute("ROLLBACK")
+                    raise
+                print(f"✓ {view_name}: {rows} rows refreshed")
+                refreshed.append(view_name)
             except Exception as e:
                 print(f"✗ {view_name}: {e}")
+        return refreshed
+
+    def run_graph(self, partition_by_season: bool = False, compact: bool = False,
+                  workers: int = 1, refresh_schemas: bool = False, only: list = None) -> bool:
+        """Rebuild the nodes whose inputs changed since the last build.
+
+        Nodes are the raw tables (one per CSV) and CANONICAL_TABLES.  A node
+        is rebuilt when its table is missing or its content hash (see
+        _node_hashes()) differs from the one recorded in NODES_TABLE; rebuilt
+        raw tables are also narrowed, profiled and exported.  `only`
+        rebuilds exactly the named nodes, whatever their hashes.  Returns
+        False when there was nothing to do.
+        """
+        print("\n=== PLANNING BUILD ===")
+
+        csv_files = {Path(f).stem: f for f in sorted(glob.glob(f"{NFL_DATA_DIR}/*.csv"))}
+        stored = self._read_node_state()
+        with self._stage("plan"):
+            state = self._node_hashes(csv_files, stored)
+        nodes = list(csv_files) + [name for name, _, _ in CANONICAL_TABLES]
+
+        if only:
+            for name in only:
+                if name not in nodes:
+                    print(f"✗ {name}: no such table")
+            dirty = [n for n in nodes if n in only]
+        else:
+            dirty = [
+                n for n in nodes
+                if (refresh_schemas and n in csv_files)
+                or not self._table_exists(n)
+                or stored.get(n, {}).get("hash") != state[n]["hash"]
+            ]
+        print(f"{len(nodes) - len(dirty)} up to date, {len(dirty)} to build"
+              + (f": {', '.join(dirty)}" if dirty else ""))
+
+        # CSVs that were only touched keep their table but not a stale mtime
+        touched = {
+            n: state[n] for n in csv_files
+            if n not in dirty and n in stored and stored[n]["hash"] == state[n]["hash"]
+            and stored[n]["mtime"] != state[n]["mtime"]
+        }
+        if touched:
+            self._write_node_state(touched)
+        if not dirty:
+            return False
+
+        # Entries for tables not rebuilt this run carry over
+        if not self.data_dict:
+            self.data_dict = self._saved_data_dictionary()
+
+        built = []
+        raw = [t for t in csv_files if t in dirty]
+        if raw:
+            with self._stage("load"):
+                loaded = self.load_raw_tables(workers=workers, refresh_schemas=refresh_schemas, tables=raw)
+            if loaded:
+                with self._stage("contract"):
+                    self.apply_schema_contract(tables=loaded)
+                with self._stage("dictionary"):
+                    self.build_data_dictionary(tables=loaded)
+                self.data_dict = {t: e for t, e in self.data_dict.items() if t in csv_files}
+                # Every table's season partitions come from GAME (via PBP/PLAY
+                # for play-keyed tables)
+                export = loaded
+                if partition_by_season and {"GAME", "PBP", "PLAY"} & set(loaded):
+                    export = [t for t in csv_files if self._table_exists(t)]
+                with self._stage("export"):
+                    self.export_to_parquet(partition_by_season=partition_by_season, compact=compact,
+                                           tables=export)
+            built += loaded
+
+        canonical = [name for name, _, _ in CANONICAL_TABLES if name in dirty]
+        if canonical:
+            # A raw table that failed to reload still holds its old rows, so
+            # its dependents are skipped (and stay dirty) rather than rebuilt
+            # from stale data under the CSV's new hash.
+            with self._stage("canonical"):
+                built += self.create_canonical_views(names=canonical, workers=workers,
+                                                     failed=[t for t in raw if t in self.load_errors])
+
+        self._write_node_state({n: state[n] for n in built})
+        return True
+
+    def _node_hashes(self, csv_files: dict, stored: dict) -> dict:
+        """{node: {hash, size_bytes, mtime}} for every raw and canonical node.
+
+        Raw tables hash their CSV's bytes (skipped when size and mtime match
+        `stored`); canonical tables hash their SQL plus their inputs'
+        hashes, so a change anywhere upstream reaches them.
+        """
+        import hashlib
+
+        state = {}
+        for table_name, csv_file in csv_files.items():
+            stat = os.stat(csv_file)
+            old = stored.get(table_name)
+            if old and old["size_bytes"] == stat.st_size and old["mtime"] == stat.st_mtime:
+                digest = old["hash"]
+            else:
+                h = hashlib.sha256()
+                with open(csv_file, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+                digest = h.hexdigest()
+            state[table_name] = {"hash": digest, "size_bytes": stat.st_size, "mtime": stat.st_mtime}
+
+        for view_name, sql, deps in CANONICAL_TABLES:
+            h = hashlib.sha256(sql.encode())
+            for dep in deps:
+                h.update(f"{dep}={state.get(dep, {}).get('hash')}".encode())
+            state[view_name] = {"hash": h.hexdigest(), "size_bytes": None, "mtime": None}
+        return state
+
+    def _read_node_state(self) -> dict:
+        """{node: {hash, size_bytes, mtime}} from NODES_TABLE ({} if none)."""
+        if not self._table_exists(NODES_TABLE):
+            return {}
+        rows = self.conn.execute(f"SELECT node, hash, size_bytes, mtime FROM {NODES_TABLE}").fetchall()
+        return {r[0]: {"hash": r[1], "size_bytes": r[2], "mtime": r[3]} for r in rows}
+
+    def _write_node_state(self, state: dict):
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {NODES_TABLE} (
+                node VARCHAR PRIMARY KEY, hash VARCHAR, size_bytes BIGINT,
+                mtime DOUBLE, built_at TIMESTAMP
+            )
+        """)
+        for node, st in state.items():
+            self.conn.execute(f"DELETE FROM {NODES_TABLE} WHERE node = ?", [node])
+            self.conn.execute(
+                f"INSERT INTO {NODES_TABLE} VALUES (?, ?, ?, ?, current_timestamp)",
+                [node, st["hash"], st["size_bytes"], st["mtime"]],
+            )
+
+    def run_incremental(self, partition_by_season: bool = False, compact: bool = False,
+                        workers: int = 1, refresh_schemas: bool = False) -> bool:
+        """Load, profile, export and rebuild only what the new CSVs changed.
+
+        Returns False when nothing changed.
+        """
+        with self._stage("load"):
+            changes = self.load_incremental(workers=workers, refresh_schemas=refresh_schemas)
+        if not changes:
+            self._record_csv_state()
+            return False
+
+        # Narrow tables loaded from scratch; upserts were cast to the contract
+        new_tables = [t for t, c in changes.items() if c["new"]]
+        if new_tables:
+            with self._stage("contract"):
+                self.apply_schema_contract(tables=new_tables)
+        seasons = self._mark_affected(changes)
+
+        with self._stage("dictionary"):
+            self.build_data_dictionary(tables=list(changes))
+
+        keyed = [t for t, c in changes.items() if c["keys"] is not None]
+        rewritten = [t for t, c in changes.items() if c["keys"] is None]
+        with self._stage("export"):
+            if keyed:
+                self.export_to_parquet(partition_by_season=partition_by_season, compact=compact,
+                                       tables=keyed, seasons=seasons)
+            if rewritten:
+                self.export_to_parquet(partition_by_season=partition_by_season, compact=compact,
+                                       tables=rewritten)
+
+        with self._stage("canonical"):
+            refreshed = self.refresh_canonical_tables(changes)
+        self.conn.execute("DROP TABLE IF EXISTS _affected_gids")
+        self.conn.execute("DROP TABLE IF EXISTS _affected_pids")
+        self._record_csv_state(refreshed)
+        return True
+
+    def _record_csv_state(self, canonical: list = ()):
+        """Record the raw tables (now matching their CSVs) and `canonical` as built.
+
+        Neither a raw table in load_errors nor anything downstream of one is
+        recorded: their hashes already include the failed CSV's new
+        contents, so they must stay dirty until it loads.
+        """
+        csv_files = {Path(f).stem: f for f in sorted(glob.glob(f"{NFL_DATA_DIR}/*.csv"))}
+        state = self._node_hashes(csv_files, self._read_node_state())
+        stale = set(self.load_errors)
+        for view_name, _, deps in CANONICAL_TABLES:
+            if stale.intersection(deps):
+                stale.add(view_name)
+        self._write_node_state({
+            n: state[n] for n in list(csv_files) + list(canonical)
+            if n not in stale and self._table_exists(n)
+        })
+
+    def _read_csv_schemas(self) -> dict:
+        try:
+            with open(f"{OUTPUT_DIR}/{CSV_SCHEMAS_FILE}") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
 
-        print(f"\nTotal views created: {views_created}")
+    def _write_csv_schemas(self, schemas: dict):
+        try:
+            with open(f"{OUTPUT_DIR}/{CSV_SCHEMAS_FILE}", 'w') as f:
+                json.dump(schemas, f, indent=2)
+        except OSError as e:
+            print(f"✗ Failed to save CSV schemas: {e}")
+
+    def apply_schema_contract(self, tables: list = None):
+        """Narrow raw column types per the schema contract (see TINYINT_COLUMNS)
+
+        Each conversion is checked against the data first (flag values,
+        integer ranges, half-point precision, ENUM membership), so a column
+        that doesn't fit keeps its loaded type instead of failing the load.
+        `tables` limits the pass to those tables; their values are added to
+        the existing ENUM types (see _extend_enum()).
+        """
+        print("\n=== APPLYING SCHEMA CONTRACT ===")
+
+        if tables is None:
+            tables = [row[0] for row in self.conn.execute("""
+                SELECT table_name FROM information_schema.tables
+                WHERE table_schema='main' AND table_type='BASE TABLE' AND table_name NOT LIKE '\\_%' ESCAPE '\\'
+            """).fetchall()]
+        schemas = {
+            t: {row[0]: row[1] for row in self.conn.execute(f"DESCRIBE {t}").fetchall()}
+            for t in tables
+        }
+
+        # ENUM domains come from the data and grow with it, so every loaded
+        # value is a member
+        for type_name in ("team_code", "play_type"):
+            try:
+                self._extend_enum(self.conn, type_name, [
+                    (t, c) for t in tables for c, dtype in schemas[t].items()
+                    if dtype == "VARCHAR" and _enum_type(t, c) == type_name
+                ])
+            except Exception as e:
+                print(f"✗ ENUM {type_name}: {e}")
+        enum_types = {row[0] for row in self.conn.execute(
+            "SELECT type_name FROM duckdb_types() WHERE logical_type = 'ENUM'"
+        ).fetchall()}
 
-    def run_data_quality_checks(self):
-        """Run comprehensive data quality checks"""
-        print("\n=== RUNNING DATA QUALITY CHECKS ===")
+        for table_name in tables:
+            try:
+                targets = self._contract_types(table_name, schemas[table_name], enum_types)
+                if not targets:
+                    print(f"⊘ {table_name}: nothing to narrow")
+                    continue
+                exprs = [
+                    f'CAST("{col}" AS {targets[col]}) AS "{col}"' if col in targets else f'"{col}"'
+                    for col in schemas[table_name]
+                ]
+                self._execute(
+                    self.conn, f"contract {table_name}",
+                    f"CREATE OR REPLACE TABLE {table_name} AS SELECT {', '.join(exprs)} FROM {table_name}",
+                )
+                summary = {}
+                for target in targets.values():
+                    kind = "DECIMAL" if target.startswith("DECIMAL") else target
+                    summary[kind] = summary.get(kind, 0) + 1
+                print(f"✓ {table_name}: " + ", ".join(f"{n} → {k}" for k, n in summary.items()))
+            except Exception as e:
+                print(f"✗ {table_name}: {e}")
 
-        qa_results = {}
+    def _extend_enum(self, cur, type_name: str, columns: list) -> list:
+        """Create ENUM type_name, or add to it, so it holds every value in (table, column) pairs.
 
-        # 1. GID uniqueness in games
+        DuckDB can't add values to an ENUM, so a type missing some is
+        recreated with the sorted union and every table column of the old
+        type is re-cast to the new one, in one transaction.  Returns the
+        values added.
+        """
+        if not columns:
+            return []
+        union = " UNION ".join(
+            f'SELECT CAST("{c}" AS VARCHAR) AS v FROM {t} WHERE "{c}" IS NOT NULL' for t, c in columns
+        )
+        exists = cur.execute(
+            "SELECT COUNT(*) > 0 FROM duckdb_types() WHERE type_name = ? AND logical_type = 'ENUM'", [type_name]
+        ).fetchone()[0]
+        if not exists:
+            cur.execute(f"CREATE TYPE {type_name} AS ENUM (SELECT DISTINCT v FROM ({union}) ORDER BY v)")
+            return [row[0] for row in cur.execute(f"SELECT unnest(enum_range(NULL::{type_name}))").fetchall()]
+
+        members = [row[0] for row in cur.execute(f"SELECT unnest(enum_range(NULL::{type_name}))").fetchall()]
+        added = [row[0] for row in cur.execute(f"""
+            SELECT DISTINCT v FROM ({union})
+            WHERE v NOT IN (SELECT unnest(enum_range(NULL::{type_name}))::VARCHAR)
+            ORDER BY v
+        """).fetchall()]
+        if not added:
+            return []
+        # Columns store the ENUM structurally, so find them by its spelled-out type
+        old_type = cur.execute(f"SELECT typeof(NULL::{type_name})").fetchone()[0]
+        dependents = cur.execute("""
+            SELECT c.table_name, c.column_name
+            FROM duckdb_columns() c
+            JOIN duckdb_tables() t USING (database_name, schema_name, table_name)
+            WHERE NOT t.temporary AND c.data_type = ?
+        """, [old_type]).fetchall()
+        domain = ", ".join("'" + v.replace("'", "''") + "'" for v in sorted(members + added))
+
+        cur.execute("BEGIN TRANSACTION")
         try:
-            result = self.conn.execute("""
-                SELECT COUNT(*) as total, COUNT(DISTINCT gid) as unique_gids
-                FROM games
-            """).fetchall()[0]
-            qa_results['gid_uniqueness'] = {
-                'total_games': result[0],
-                'unique_gids': result[1],
-                'status': 'PASS' if result[0] == result[1] else 'WARN'
-            }
-            print(f"✓ GID uniqueness: {result[1]} unique out of {result[0]} games")
-        except Exception as e:
-            if "does not exist" in str(e):
-                print(f"⊘ GID uniqueness check: games table not available")
-            else:
-                print(f"✗ GID uniqueness check: {e}")
+            cur.execute(f"DROP TYPE {type_name}")
+            cur.execute(f"CREATE TYPE {type_name} AS ENUM ({domain})")
+            for t, c in dependents:
+                self._execute(cur, f"enum {type_name}", f'ALTER TABLE {t} ALTER "{c}" TYPE {type_name}')
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+        print(f"✓ {type_name}: added {', '.join(added)} ({len(dependents)} columns re-cast)")
+        return added
+
+    def _contract_types(self, table_name: str, dtypes: dict, enum_types: set) -> dict:
+        """{column: target type} for the columns of one table that fit the contract."""
+
+        # One scan gathers every check for the table
+        checks = {}
+        for col, dtype in dtypes.items():
+            q = f'"{col}"'
+            if dtype == "VARCHAR":
+                enum = _enum_type(table_name, col)
+                if enum in enum_types:
+                    checks[col] = (f"bool_and({q} IS NULL OR TRY_CAST({q} AS {enum}) IS NOT NULL)",)
+                else:
+                    checks[col] = (f"bool_and({q} IN ('Y', 'N'))",)
+            elif dtype in INTEGER_TYPES:
+                checks[col] = (f"MIN({q})", f"MAX({q})")
+            elif dtype == "DOUBLE" and col in HALF_POINT_COLUMNS:
+                checks[col] = (f"bool_and({q} * 10 = ROUND({q} * 10) AND ABS({q}) < 1000)",)
+        values = {}
+        if checks:
+            exprs = [e for col_exprs in checks.values() for e in col_exprs]
+            row = self.conn.execute(f"SELECT {', '.join(exprs)} FROM {table_name}").fetchone()
+            i = 0
+            for col, col_exprs in checks.items():
+                values[col] = row[i:i + len(col_exprs)]
+                i += len(col_exprs)
+
+        targets = {}
+        for col, dtype in dtypes.items():
+            enum = _enum_type(table_name, col) if dtype == "VARCHAR" else None
+            if enum in enum_types:
+                # Only when every value is a member; otherwise it stays VARCHAR
+                if values.get(col) == (True,):
+                    targets[col] = enum
+            elif dtype == "VARCHAR" and values.get(col) == (True,):
+                targets[col] = "BOOLEAN"
+            elif dtype in INTEGER_TYPES and col in values:
+                lo, hi = values[col]
+                if col in TINYINT_COLUMNS and (lo is None or (-128 <= lo and hi <= 127)):
+                    target = "TINYINT"
+                elif col in ID_COLUMNS:
+                    target = "INTEGER" if lo is None or (-(1 << 31) <= lo and hi < (1 << 31)) else "BIGINT"
+                else:
+                    target = _narrowest_int_type(lo, hi)
+                if INTEGER_TYPES.index(target) < INTEGER_TYPES.index(dtype):
+                    targets[col] = target
+            elif dtype == "DOUBLE" and col in FLOAT_COLUMNS:
+                targets[col] = "FLOAT"
+            elif dtype == "DOUBLE" and values.get(col) == (True,):
+                targets[col] = "DECIMAL(4,1)"
+        return targets
+
+    def build_data_dictionary(self, tables: list = None):
+        """Build comprehensive data dictionary for all tables
+
+        Each table is profiled in one aggregate scan (see _profile_table()),
+        and tables are profiled concurrently on separate cursors.  `tables`
+        re-profiles only those tables on top of the saved dictionary.
+        """
+        print("\n=== BUILDING DATA DICTIONARY ===")
+        from concurrent.futures import ThreadPoolExecutor
 
-        # 2. PID uniqueness per gid in plays
-        try:
-            result = self.conn.execute("""
-                SELECT COUNT(*) as total_plays,
-                       COUNT(DISTINCT (gid, pid)) as unique_play_ids,
-                       COUNT(DISTINCT gid) as unique_games
-                FROM plays
-            """).fetchall()[0]
-            qa_results['pid_uniqueness'] = {
-                'total_plays': result[0],
-                'unique_play_ids': result[1],
-                'unique_games': result[2],
-                'status': 'PASS' if result[0] == result[1] else 'WARN'
-            }
-            print(f"✓ PID uniqueness: {result[1]} unique (gid, pid) out of {result[0]} plays")
-        except Exception as e:
-            print(f"✗ PID uniqueness check: {e}")
+        if tables is None:
+            # Get all table names from DuckDB
+            tables = self.conn.execute("""
+                SELECT table_name FROM information_schema.tables
+                WHERE table_schema='main' AND table_name NOT LIKE '\\_%' ESCAPE '\\'
+            """).fetchall()
+        else:
+            if not self.data_dict:
+                self.data_dict = self._saved_data_dictionary()
+            tables = [(t,) for t in tables]
 
-        # 3. Season range coverage per table
-        try:
-            season_coverage = {}
-            for table in ['games', 'plays', 'drives', 'offense_stats', 'defense_stats']:
-                try:
-                    result = self.conn.execute(f"""
-                        SELECT MIN(seas) as min_season, MAX(seas) as max_season,
-                               COUNT(DISTINCT seas) as num_seasons
-                        FROM {table}
-                        WHERE seas IS NOT NULL
-                    """).fetchall()[0]
-                    if result[0] is not None:
-                        season_coverage[table] = {
-                            'min_season': int(result[0]),
-                            'max_season': int(result[1]),
-                            'num_seasons': int(result[2])
-                        }
-                except:
-                    pass
-            qa_results['season_coverage'] = season_coverage
-            print(f"✓ Season coverage checked for {len(season_coverage)} tables")
-        except Exception as e:
-            print(f"✗ Season coverage check: {e}")
+        def profile(table_name):
+            cur = self.conn.cursor()
+            try:
+                return table_name, self._profile_table(cur, table_name), None
+            except Exception as e:
+                return table_name, None, e
+            finally:
+                cur.close()
 
-        # 4. Missingness report
-        try:
-            missing_report = {}
-            for table_name, info in self.data_dict.items():
-                missing_pct = info['missing_percentage']
-                if missing_pct > 10:
-                    missing_report[table_name] = missing_pct
-            qa_results['high_missingness_tables'] = missing_report
-            print(f"✓ Missingness report: {len(missing_report)} tables >10% missing")
-        except Exception as e:
-            print(f"✗ Missingness check: {e}")
+        with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as pool:
+            results = list(pool.map(profile, [t for (t,) in tables]))
 
-        # 5. Sanity checks on yards, quarters, play types
-        try:
-            sanity_checks = {}
-
-            # Yards sanity check
-            yards_result = self.conn.execute("""
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN yds < -100 OR yds > 100 THEN 1 ELSE 0 END) as suspicious_yards
-                FROM plays
-                WHERE yds IS NOT NULL
-            """).fetchall()[0]
-            sanity_checks['yards'] = {
-                'total_plays_with_yds': yards_result[0],
-                'suspicious_yards': yards_result[1],
-                'status': 'PASS' if yards_result[1] == 0 else 'WARN'
-            }
+        for table_name, entry, error in results:
+            if error is not None:
+                print(f"✗ {table_name}: {error}")
+                continue
+            self.data_dict[table_name] = entry
+            print(f"✓ {table_name}: {entry['row_count']} rows, {entry['missing_percentage']:.1f}% missing")
 
-            # Quarter sanity check
-            qtr_result = self.conn.execute("""
-                SELECT COUNT(DISTINCT qtr) as unique_quarters,
-                       MIN(qtr) as min_qtr,
-                       MAX(qtr) as max_qtr
-                FROM plays
-                WHERE qtr IS NOT NULL
-            """).fetchall()[0]
-            sanity_checks['quarters'] = {
-                'unique_quarters': qtr_result[0],
-                'min_qtr': qtr_result[1] if qtr_result[1] is not None else 0,
-                'max_qtr': qtr_result[2] if qtr_result[2] is not None else 0,
-                'status': 'PASS' if (qtr_result[2] is None or qtr_result[2] <= 4) else 'WARN'
-            }
+    def _saved_data_dictionary(self) -> dict:
+        try:
+            with open(f"{OUTPUT_DIR}/data_dictionary.json") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _profile_table(self, cur, table_name: str) -> dict:
+        """Data dictionary entry for one table from a single aggregate scan.
+
+        Null counts, approximate distinct counts and min/max (as text) for
+        every column, plus the season range when the table has `seas`.
+        ENUM columns (see apply_schema_contract()) also list their values,
+        which come from the type rather than a scan; the app's dimensions()
+        reads play types from there.
+        """
+        schema = cur.execute(f'DESCRIBE "{table_name}"').fetchall()
+        columns = [row[0] for row in schema]
+        dtypes = {row[0]: row[1] for row in schema}
+        values_by_col = {
+            col: cur.execute(f"SELECT enum_range(NULL::{dtype})").fetchone()[0]
+            for col, dtype in dtypes.items() if dtype.startswith("ENUM(")
+        }
+
+        exprs = ["COUNT(*)"]
+        for col in columns:
+            exprs += [
+                f'COUNT("{col}")',
+                f'ROUND(100.0 * COUNT(*) FILTER (WHERE "{col}" IS NULL) / COUNT(*), 2)',
+                f'approx_count_distinct("{col}")',
+                f'CAST(MIN("{col}") AS VARCHAR)',
+                f'CAST(MAX("{col}") AS VARCHAR)',
+            ]
+        if 'seas' in columns:
+            exprs += ['MIN("seas")', 'MAX("seas")']
+        row = cur.execute(f'SELECT {", ".join(exprs)} FROM "{table_name}"').fetchone()
+
+        row_count = row[0]
+        missing_by_col, distinct_by_col, range_by_col = {}, {}, {}
+        missing_count = 0
+        for i, col in enumerate(columns):
+            non_null, null_pct, distinct, lo, hi = row[1 + 5 * i:6 + 5 * i]
+            missing_count += row_count - non_null
+            missing_by_col[col] = null_pct
+            distinct_by_col[col] = distinct
+            range_by_col[col] = (lo, hi)
+
+        total_cells = row_count * len(columns)
+        missing_pct = (missing_count / total_cells * 100) if total_cells > 0 else 0
+
+        # Season range
+        season_range = None
+        if 'seas' in columns and row[-2] is not None:
+            season_range = (int(row[-2]), int(row[-1]))
+
+        return {
+            "row_count": row_count,
+            "column_count": len(columns),
+            "columns": columns,
+            "dtypes": dtypes,
+            "missing_percentage": round(missing_pct, 2),
+            "missing_by_column": missing_by_col,
+            "distinct_by_column": distinct_by_col,
+            "range_by_column": range_by_col,
+            "values_by_column": values_by_col,
+            "season_range": season_range
+        }
+
+    def export_to_parquet(self, partition_by_season: bool = False, compact: bool = False,
+                          tables: list = None, seasons: list = None):
+        """Export all tables to Parquet format
+
+        With partition_by_season, large tables that can reach GAME.seas
+        through gid or pid are written as hive-partitioned seas=YYYY/
+        datasets instead of one monolithic file.  With compact, the tables in
+        COMPACT_TABLES are pruned, narrowed and ZSTD-compressed.  `tables`
+        limits the export; `seasons` then rewrites only those partitions of
+        an existing dataset.
+        """
+        print("\n=== EXPORTING TO PARQUET ===")
 
-            # Play type distribution
-            type_result = self.conn.execute("""
-                SELECT type, COUNT(*) as count
-                FROM plays
-                WHERE type IS NOT NULL
-                GROUP BY type
-                ORDER BY count DESC
+        if tables is None:
+            tables = self.conn.execute("""
+                SELECT table_name FROM information_schema.tables
+                WHERE table_schema='main' AND table_name NOT LIKE '\\_%' ESCAPE '\\'
             """).fetchall()
-            sanity_checks['play_types'] = {row[0]: int(row[1]) for row in type_result}
+        else:
+            tables = [(t,) for t in tables]
 
-            qa_results['sanity_checks'] = sanity_checks
-            print(f"✓ Sanity checks: yards={sanity_checks['yards']['status']}, quarters={sanity_checks['quarters']['status']}")
-        except Exception as e:
-            print(f"✗ Sanity checks: {e}")
+        for (table_name,) in tables:
+            file_path = f"{OUTPUT_DIR}/{table_name}.parquet"
+            dataset_dir = f"{OUTPUT_DIR}/{table_name}"
+            try:
+                source = table_name
+                options = "FORMAT PARQUET, COMPRESSION SNAPPY"
+                if compact and table_name in COMPACT_TABLES:
+                    source = f"({self._compact_sql(table_name)})"
+                    options = f"FORMAT PARQUET, COMPRESSION ZSTD, COMPRESSION_LEVEL {COMPACT_ZSTD_LEVEL}"
+
+                season_sql = self._season_keyed_sql(table_name, source) if partition_by_season else None
+                if season_sql is not None and seasons is not None and os.path.isdir(dataset_dir):
+                    # Replace just the affected season partitions
+                    for seas in seasons:
+                        name = "__HIVE_DEFAULT_PARTITION__" if seas is None else seas
+                        shutil.rmtree(f"{dataset_dir}/seas={name}", ignore_errors=True)
+                    keep = " OR ".join(
+                        "seas IS NULL" if seas is None else f"seas = {int(seas)}" for seas in seasons
+                    ) or "FALSE"
+                    self._execute(self.conn, f"export {table_name}", f"""
+                        COPY (SELECT * FROM ({season_sql}) WHERE {keep}) TO '{dataset_dir}'
+                        ({options}, PARTITION_BY (seas), ROW_GROUP_SIZE {PARTITION_ROW_GROUP_SIZE}, APPEND)
+                    """)
+                    print(f"✓ {table_name}/ ({len(seasons)} season partitions rewritten)")
+                elif season_sql is not None:
+                    shutil.rmtree(dataset_dir, ignore_errors=True)
+                    self._execute(self.conn, f"export {table_name}", f"""
+                        COPY ({season_sql}) TO '{dataset_dir}'
+                        ({options}, PARTITION_BY (seas), ROW_GROUP_SIZE {PARTITION_ROW_GROUP_SIZE})
+                    """)
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    n_parts = len(glob.glob(f"{dataset_dir}/seas=*"))
+                    size_mb = sum(os.path.getsize(f) for f in glob.glob(f"{dataset_dir}/*/*.parquet")) / 1e6
+                    print(f"✓ {table_name}/ ({n_parts} season partitions, {size_mb:.1f} MB)")
+                else:
+                    self._execute(self.conn, f"export {table_name}", f"""
+                        COPY (SELECT * FROM {source}) TO '{file_path}' ({options})
+                    """)
+                    # Drop a dataset left over from a partitioned export
+                    if os.path.isdir(dataset_dir):
+                        shutil.rmtree(dataset_dir)
+                    print(f"✓ {table_name}.parquet ({os.path.getsize(file_path) / 1e6:.1f} MB)")
+            except Exception as e:
+                print(f"✗ {table_name}.parquet: {e}")
 
-        # 6. Join integrity checks
-        try:
-            join_integrity = {}
+    def _compact_sql(self, table_name: str) -> str:
+        """SELECT implementing the compact profile for one COMPACT_TABLES entry."""
+        schema = self.conn.execute(f"DESCRIBE {table_name}").fetchall()
+        keep = COMPACT_TABLES[table_name]
+        dtypes = {row[0]: row[1] for row in schema if keep is None or row[0] in keep}
+
+        # One pass for the range of every integer column
+        int_cols = [c for c, t in dtypes.items() if t in INTEGER_TYPES]
+        ranges = {}
+        if int_cols:
+            row = self.conn.execute(
+                "SELECT " + ", ".join(f'MIN("{c}"), MAX("{c}")' for c in int_cols) + f" FROM {table_name}"
+            ).fetchone()
+            ranges = {c: (row[2 * i], row[2 * i + 1]) for i, c in enumerate(int_cols)}
+
+        exprs = []
+        for col, dtype in dtypes.items():
+            if col in ranges:
+                target = _narrowest_int_type(*ranges[col])
+                if INTEGER_TYPES.index(target) >= INTEGER_TYPES.index(dtype):
+                    target = None  # already as narrow (e.g. a contract TINYINT)
+            elif dtype == "DOUBLE":
+                target = "FLOAT"
+            else:
+                target = None
+            exprs.append(f'CAST("{col}" AS {target}) AS "{col}"' if target else f'"{col}"')
+        return f"SELECT {', '.join(exprs)} FROM {table_name}"
+
+    def _season_keyed_sql(self, table_name: str, source: str = None):
+        """SELECT adding GAME.seas to table_name, sorted by (seas, gid, pid).
+
+        `source` replaces the table in the FROM clause (e.g. a compact
+        subquery).  Returns None when the table is too small to be worth
+        partitioning, already has its own seas column, or has no way to
+        reach GAME.seas.
+        """
+        source = source or table_name
+        row_count = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+        if row_count < PARTITION_MIN_ROWS:
+            return None
+
+        columns = {row[0] for row in self.conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()}
+        if "seas" in columns:
+            # Only GAME/SCHEDULE use seas for the season (both are small); in
+            # the player stat tables it is years of experience.
+            return None
+        order = ", ".join(f"t.{c}" for c in ("gid", "pid") if c in columns)
+        if "gid" in columns:
+            return f"""
+                SELECT t.*, g.seas FROM {source} t
+                LEFT JOIN GAME g ON t.gid = g.gid
+                ORDER BY g.seas, {order}
+            """
+        if "pid" in columns:
+            # Play-keyed tables reach their game through the play-by-play table
+            plays = next(
+                (name for name in ("PBP", "PLAY") if name != table_name and self._table_exists(name)),
+                None,
+            )
+            if plays is None:
+                return None
+            return f"""
+                SELECT t.*, g.seas FROM {source} t
+                LEFT JOIN {plays} p ON t.pid = p.pid
+                LEFT JOIN GAME g ON p.gid = g.gid
+                ORDER BY g.seas, p.gid, t.pid
+            """
+        return None
+
+    def _table_exists(self, table_name: str) -> bool:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+            [table_name],
+        ).fetchone()[0] > 0
+
+    def create_canonical_views(self, names: list = None, workers: int = 1, failed: list = ()) -> list:
+        """Create canonical views and tables from raw tables
+
+        `names` limits the build to those CANONICAL_TABLES entries.  Tables
+        build concurrently on separate cursors as soon as their dependencies
+        are done (see _run_graph()); those downstream of a `failed` table
+        are skipped.  Returns the tables built.
+        """
+        print("\n=== CREATING CANONICAL VIEWS ===")
 
-            # PASS table join integrity
-            try:
-                pass_result = self.conn.execute("""
-                    SELECT COUNT(*) as pass_records,
-                           COUNT(CASE WHEN pl.pid IS NOT NULL THEN 1 END) as matched_to_plays,
-                           ROUND(100.0 * COUNT(CASE WHEN pl.pid IS NOT NULL THEN 1 END) / COUNT(*), 2) as match_pct
-                    FROM PASS p
-                    LEFT JOIN plays pl ON p.pid = pl.pid
-                """).fetchall()[0]
-                join_integrity['PASS'] = {
-                    'records': pass_result[0],
-                    'matched_to_plays': pass_result[1],
-                    'match_percentage': pass_result[2]
-                }
-            except:
-                pass
-
-            # RUSH table join integrity
+        jobs = []
+        for view_name, sql, deps in CANONICAL_TABLES:
+            if names is not None and view_name not in names:
+                continue
+            jobs.append((view_name, deps, lambda cur, name=view_name, sql=sql:
+                         self._execute(cur, f"canonical {name}", f"CREATE OR REPLACE TABLE {name} AS {sql}")))
+
+        built = self._run_graph(jobs, workers, failed=failed)
+        print(f"\nTotal views created: {len(built)}")
+        return built
+
+    def _run_graph(self, jobs: list, workers: int = 1, failed: list = ()) -> list:
+        """Run (name, deps, fn(cursor)) jobs concurrently, respecting deps.
+
+        A job starts once every dependency that is itself a job has been
+        built.  Dependencies that are not jobs must already exist as tables;
+        a job whose dependency is missing or failed (a failed job, or a name
+        in `failed`) is skipped.  Returns the names built, in completion
+        order.
+        """
+        from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+        names = {name for name, _, _ in jobs}
+        deps_of = {name: tuple(deps) for name, deps, _ in jobs}
+        waiting = {name: {d for d in deps if d in names} for name, deps, _ in jobs}
+        fns = {name: fn for name, _, fn in jobs}
+        built, failed = [], set(failed)
+
+        def run(name):
+            cur = self.conn.cursor()
             try:
-                rush_result = self.conn.execute("""
-                    SELECT COUNT(*) as rush_records,
-                           COUNT(CASE WHEN pl.pid IS NOT NULL THEN 1 END) as matched_to_plays,
-                           ROUND(100.0 * COUNT(CASE WHEN pl.pid IS NOT NULL THEN 1 END) / COUNT(*), 2) as match_pct
-                    FROM RUSH r
-                    LEFT JOIN plays pl ON r.pid = pl.pid
-                """).fetchall()[0]
-                join_integrity['RUSH'] = {
-                    'records': rush_result[0],
-                    'matched_to_plays': rush_result[1],
-                    'match_percentage': rush_result[2]
-                }
-            except:
-                pass
-
-            # SACK table join integrity (if available)
-            try:
-                sack_result = self.conn.execute("""
-                    SELECT COUNT(*) as sack_records,
-                           COUNT(CASE WHEN pl.pid IS NOT NULL THEN 1 END) as matched_to_plays,
-                           ROUND(100.0 * COUNT(CASE WHEN pl.pid IS NOT NULL THEN 1 END) / COUNT(*), 2) as match_pct
-                    FROM SACK s
-                    LEFT JOIN plays pl ON s.pid = pl.pid
-                """).fetchall()[0]
-                join_integrity['SACK'] = {
-                    'records': sack_result[0],
-                    'matched_to_plays': sack_result[1],
-                    'match_percentage': sack_result[2]
-                }
-            except:
-                pass
-
-            qa_results['join_integrity'] = join_integrity
-            print(f"✓ Join integrity checked for {len(join_integrity)} available tables")
-            for table, stats in join_integrity.items():
-                print(f"  {table}: {stats['match_percentage']}% matched to plays")
-        except Exception as e:
-            print(f"✗ Join integrity checks: {e}")
+                fns[name](cur)
+            finally:
+                cur.close()
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            running = {}
+            while waiting or running:
+                ready = [n for n, deps in waiting.items() if not deps]
+                if not ready and not running:
+                    raise RuntimeError(f"Unresolvable build dependencies: {sorted(waiting)}")
+                for name in ready:
+                    del waiting[name]
+                    skipped = [d for d in deps_of[name] if d in failed]
+                    missing = [d for d in deps_of[name] if d not in names and not self._table_exists(d)]
+                    if skipped or missing:
+                        failed.add(name)
+                        print(f"⊘ {name}: source table {', '.join(skipped + missing)} not loaded")
+                        for deps in waiting.values():
+                            deps.discard(name)
+                        continue
+                    running[pool.submit(run, name)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    try:
+                        fut.result()
+                        built.append(name)
+                        print(f"✓ {name}")
+                    except Exception as e:
+                        failed.add(name)
+                        print(f"✗ {name}: {e}")
+                    for deps in waiting.values():
+                        deps.discard(name)
+        return built
+
+    def run_data_quality_checks(self, workers: int = QA_WORKERS):
+        """Run the data quality checks in QA_CHECKS
+
+        Checks on the same table share one aggregate scan (see
+        _run_qa_scan()), and the scans run concurrently on separate cursors.
+        Results go to self.qa_report by section; self.qa_checks keeps one
+        entry per check with its status and time for data_qa_report.json.
+        """
+        print("\n=== RUNNING DATA QUALITY CHECKS ===")
+        from concurrent.futures import ThreadPoolExecutor
+
+        existing = {name.lower() for (name,) in self.conn.execute(
+            "SELECT table_name FROM information_schema.tables").fetchall()}
+        scans, values = {}, {}
+        for i, (_, _, tables, _, _) in enumerate(QA_CHECKS):
+            if tables and all(t.lower() in existing for t in tables):
+                scans.setdefault(tables[0], []).append(i)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for result in pool.map(lambda item: self._run_qa_scan(*item), scans.items()):
+                values.update(result)
+
+        self.qa_report, self.qa_checks = {}, []
+        for i, (section, item, tables, _, evaluate) in enumerate(QA_CHECKS):
+            name = f"{section}.{item}" if item else section
+            if item is not None:
+                self.qa_report.setdefault(section, {})
+            missing = [t for t in tables if t.lower() not in existing]
+            result, seconds = None, 0.0
+            if missing:
+                status, message = "SKIP", f"{', '.join(missing)} not available"
+                print(f"⊘ {name}: {message}")
+            else:
+                row, seconds = values[i] if tables else (self.data_dict, 0.0)
+                start = time.perf_counter()
+                try:
+                    if isinstance(row, Exception):
+                        raise row
+                    result, status, message = evaluate(row)
+                except Exception as e:
+                    status, message = "ERROR", str(e)
+                    print(f"✗ {name}: {e}")
+                else:
+                    flag = f" [{status}]" if status != "PASS" else ""
+                    print(f"✓ {name}: {message}{flag}")
+                seconds += time.perf_counter() - start
+            if result is not None:
+                if item is None:
+                    self.qa_report[section] = result
+                else:
+                    self.qa_report[section][item] = result
+            self.qa_checks.append({
+                "check": name,
+                "tables": list(tables),
+                "status": status,
+                "message": message,
+                "seconds": round(seconds, 4),
+            })
+
+    def _run_qa_scan(self, table: str, checks: list) -> dict:
+        """Aggregate values for the QA_CHECKS indexes `checks`, all on `table`.
+
+        All the checks' aggregates run as one query.  If that query fails,
+        each check is retried on its own so a bad column only fails its own
+        check.  Returns {index: (values, seconds)}, with the exception in
+        place of the values for checks that failed; seconds is the time of
+        the scan the check was part of.
+        """
+        cur = self.conn.cursor()
+
+        def scan(indexes):
+            exprs = [e for i in indexes for e in QA_CHECKS[i][3]]
+            start = time.perf_counter()
+            row = cur.execute(f'SELECT {", ".join(exprs)} FROM "{table}"').fetchone()
+            seconds = time.perf_counter() - start
+            out, pos = {}, 0
+            for i in indexes:
+                n = len(QA_CHECKS[i][3])
+                out[i] = (row[pos:pos + n], seconds)
+                pos += n
+            return out
 
-        self.qa_report = qa_results
+        try:
+            try:
+                return scan(checks)
+            except duckdb.Error as e:
+                if len(checks) == 1:
+                    return {checks[0]: (e, 0.0)}
+            results = {}
+            for i in checks:
+                try:
+                    results.update(scan([i]))
+                except duckdb.Error as e:
+                    results[i] = (e, 0.0)
+            return results
+        finally:
+            cur.close()
 
     def verify_database(self):
         """Verify all tables and views in DuckDB"""
@@ -480,7 +1684,7 @@ class NFLDataPipeline:
         try:
             result = self.conn.execute("""
                 SELECT table_name FROM information_schema.tables
-                WHERE table_schema='main'
+                WHERE table_schema='main' AND table_name NOT LIKE '\\_%' ESCAPE '\\'
                 ORDER BY table_name
             """).fetchall()
 
@@ -570,20 +1774,37 @@ class NFLDataPipeline:
                     for table, pct in sorted(self.qa_report['high_missingness_tables'].items(), key=lambda x: -x[1]):
                         f.write(f"  {table}: {pct}%\n")
 
-                if 'sanity_checks' in self.qa_report:
+                if self.qa_report.get('sanity_checks'):
                     f.write(f"\nSanity Checks:\n")
                     sc = self.qa_report['sanity_checks']
-                    f.write(f"  Yards: {sc['yards']['status']} ({sc['yards']['suspicious_yards']} suspicious)\n")
-                    f.write(f"  Quarters: {sc['quarters']['status']} (max={sc['quarters']['max_qtr']})\n")
-                    f.write(f"  Play types: {len(sc['play_types'])} types detected\n")
-                    for ptype, count in sorted(sc['play_types'].items(), key=lambda x: -x[1])[:10]:
-                        f.write(f"    - {ptype}: {count}\n")
+                    if 'yards' in sc:
+                        f.write(f"  Yards: {sc['yards']['status']} ({sc['yards']['suspicious_yards']} suspicious)\n")
+                    if 'quarters' in sc:
+                        f.write(f"  Quarters: {sc['quarters']['status']} (max={sc['quarters']['max_qtr']})\n")
+                    if 'play_types' in sc:
+                        f.write(f"  Play types: {len(sc['play_types'])} types detected\n")
+                        for ptype, count in sorted(sc['play_types'].items(), key=lambda x: -x[1])[:10]:
+                            f.write(f"    - {ptype}: {count}\n")
 
                 if 'join_integrity' in self.qa_report:
                     f.write(f"\nJoin Integrity:\n")
                     for table, stats in self.qa_report['join_integrity'].items():
                         f.write(f"  {table}: {stats['match_percentage']}% of records matched to plays\n")
 
+                if self.stage_stats:
+                    f.write("\n\n")
+                    f.write("PIPELINE PERFORMANCE\n")
+                    f.write("-" * 80 + "\n")
+                    f.write(STAGE_TABLE_HEADER + "\n")
+                    for stage, st in self.stage_stats.items():
+                        f.write(_stage_row(stage, st) + "\n")
+                    slowest = self._slowest_statements()
+                    if slowest:
+                        f.write(f"\nSlowest statements:\n")
+                        for st in slowest:
+                            ops = ", ".join(f"{op['operator']} {op['seconds']}s" for op in st["operators"])
+                            f.write(f"  {st['statement']}: {st['seconds']}s, {st['rows']} rows ({ops})\n")
+
                 f.write("\n" + "=" * 80 + "\n")
                 f.write("END OF REPORT\n")
 
@@ -591,45 +1812,158 @@ class NFLDataPipeline:
         except Exception as e:
             print(f"✗ Failed to export QA report: {e}")
 
-    def run(self):
-        """Run the complete pipeline"""
+        output_file = f"{OUTPUT_DIR}/data_qa_report.json"
+        try:
+            with open(output_file, 'w') as f:
+                json.dump({
+                    "generated": datetime.now().isoformat(),
+                    "checks": self.qa_checks,
+                    "results": self.qa_report,
+                }, f, indent=2, default=str)
+            print(f"✓ QA results saved to {output_file}")
+        except Exception as e:
+            print(f"✗ Failed to export QA results: {e}")
+
+    def _slowest_statements(self) -> list:
+        return sorted(self.statement_stats, key=lambda st: -st["seconds"])[:RUN_REPORT_TOP_STATEMENTS]
+
+    def export_run_report(self, options: dict, seconds: float, baseline: dict = None):
+        """Export the run's performance to RUN_REPORT_FILE
+
+        Per-stage stats, per-table load stats, QA check times and the
+        DuckDB profiles of the slowest statements.  With a baseline (an
+        earlier run report), the stage times are compared against it too.
+        """
+        print("\n=== EXPORTING RUN REPORT ===")
+        report = {
+            "generated": datetime.now().isoformat(),
+            "duckdb_version": duckdb.__version__,
+            "options": options,
+            "seconds": round(seconds, 3),
+            "stages": self.stage_stats,
+            "load": self.load_stats,
+            "load_errors": self.load_errors,
+            "qa_checks": self.qa_checks,
+            "slowest_statements": self._slowest_statements(),
+        }
+        if baseline is not None:
+            report["comparison"] = self.compare_run_reports(baseline, report)
+
+        output_file = f"{OUTPUT_DIR}/{RUN_REPORT_FILE}"
+        try:
+            with open(output_file, 'w') as f:
+                json.dump(report, f, indent=2, default=str)
+            print(f"✓ Run report saved to {output_file}")
+        except Exception as e:
+            print(f"✗ Failed to export run report: {e}")
+
+    def compare_run_reports(self, baseline: dict, report: dict) -> dict:
+        """Print stage times against an earlier run report; returns the comparison."""
+        print(f"\nCompared with the run of {baseline.get('generated', 'unknown date')}:")
+        print(f"{'Stage':<10} {'before':>8} {'now':>8} {'change':>8}")
+
+        before_stages = baseline.get("stages", {})
+        stages = list(report["stages"]) + [s for s in before_stages if s not in report["stages"]]
+        comparison = {}
+        for stage in stages + ["total"]:
+            if stage == "total":
+                before, now = baseline.get("seconds"), report["seconds"]
+                rss_before = rss_now = None
+            else:
+                old, new = before_stages.get(stage, {}), report["stages"].get(stage, {})
+                before, now = old.get("seconds"), new.get("seconds")
+                rss_before, rss_now = old.get("peak_rss_mb"), new.get("peak_rss_mb")
+            regression = (before is not None and now is not None
+                          and now > before * REGRESSION_RATIO and now - before > 1)
+            change = f"{(now - before) / before:+.0%}" if before and now is not None else "-"
+            print(f"{stage:<10} {'-' if before is None else f'{before:.1f}':>8} "
+                  f"{'-' if now is None else f'{now:.1f}':>8} {change:>8}"
+                  + ("  ✗ slower" if regression else ""))
+            comparison[stage] = {
+                "seconds_before": before, "seconds": now,
+                "peak_rss_mb_before": rss_before, "peak_rss_mb": rss_now,
+                "regression": regression,
+            }
+
+        regressions = [stage for stage, c in comparison.items() if c["regression"]]
+        if regressions:
+            print(f"✗ Slower than before: {', '.join(regressions)}")
+        return {"baseline_generated": baseline.get("generated"), "stages": comparison,
+                "regressions": regressions}
+
+    def run(self, partition_by_season: bool = False, compact: bool = False,
+            workers: int = 1, refresh_schemas: bool = False, incremental: bool = False,
+            rebuild: bool = False, only: list = None, compare: str = None):
+        """Run the complete pipeline
+
+        Builds through run_graph(), so a re-run only rebuilds tables whose
+        inputs changed; rebuild starts over from an empty database and
+        `only` rebuilds just the named tables.  With incremental, changed
+        games are upserted instead (see run_incremental()).  Runs that
+        build something write a run report; `compare` is the path of an
+        earlier one to compare stage times with.
+        """
         print("\n" + "=" * 80)
         print("NFL ANALYTICS DATA INGESTION PIPELINE")
         print("=" * 80)
 
-        try:
-            # Connect to DuckDB
-            self.connect_db()
-
-            # Load raw CSV tables
-            self.load_raw_tables()
+        started = time.time()
+        options = {
+            "partition_by_season": partition_by_season, "compact": compact, "workers": workers,
+            "refresh_schemas": refresh_schemas, "incremental": incremental, "rebuild": rebuild,
+            "only": only, "memory_limit": self.memory_limit, "threads": self.threads,
+        }
+        # Read before this run's report replaces it
+        baseline = None
+        if compare:
+            try:
+                with open(compare) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"✗ Can't read run report {compare}: {e}")
 
-            # Build data dictionary
-            self.build_data_dictionary()
+        if incremental and (rebuild or not os.path.exists(DB_PATH)):
+            print(f"No database at {DB_PATH} yet; running a full build" if not rebuild
+                  else "--rebuild given; running a full build")
+            incremental = False
 
-            # Export to Parquet
-            self.export_to_parquet()
+        try:
+            # Connect to DuckDB
+            self.connect_db(fresh=rebuild)
 
-            # Create canonical views
-            self.create_canonical_views()
+            if incremental:
+                updated = self.run_incremental(partition_by_season, compact, workers, refresh_schemas)
+            else:
+                updated = self.run_graph(partition_by_season, compact, workers, refresh_schemas, only)
+            if not updated:
+                print("\nNothing to update")
+                return
 
             # Run QA checks
-            self.run_data_quality_checks()
+            with self._stage("qa"):
+                self.run_data_quality_checks()
 
             # Verify database
-            self.verify_database()
+            with self._stage("verify"):
+                self.verify_database()
 
             # Export results
             self.export_data_dictionary()
             self.export_qa_report()
 
+            print("\n" + STAGE_TABLE_HEADER)
+            for stage, st in self.stage_stats.items():
+                print(_stage_row(stage, st))
+            self.export_run_report(options, time.time() - started, baseline)
+
             print("\n" + "=" * 80)
             print("PIPELINE COMPLETED SUCCESSFULLY")
             print("=" * 80)
             print(f"Database: {DB_PATH}")
             print(f"Parquet files: {OUTPUT_DIR}/*.parquet")
             print(f"Data dictionary: {OUTPUT_DIR}/data_dictionary.json")
-            print(f"QA report: {OUTPUT_DIR}/data_qa_report.txt")
+            print(f"QA report: {OUTPUT_DIR}/data_qa_report.txt (.json)")
+            print(f"Run report: {OUTPUT_DIR}/{RUN_REPORT_FILE}")
             print("=" * 80 + "\n")
 
         except Exception as e:
@@ -641,5 +1975,52 @@ class NFLDataPipeline:
 
 
 if __name__ == "__main__":
-    pipeline = NFLDataPipeline()
-    pipeline.run()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NFL analytics data ingestion pipeline")
+    parser.add_argument(
+        "--partition-by-season", action="store_true",
+        help="write large tables as hive-partitioned seas=YYYY/ parquet datasets",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="write PBP/PLAY/TACKLE pruned, type-narrowed and ZSTD-compressed",
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="?", const=INGEST_WORKERS, default=1,
+        help=f"load CSVs concurrently (default when given without N: {INGEST_WORKERS})",
+    )
+    parser.add_argument(
+        "--refresh-schemas", action="store_true",
+        help=f"re-sniff CSV column types instead of reusing {CSV_SCHEMAS_FILE}",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="update the existing database with new/changed games instead of rebuilding it",
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="delete the database and build every table from scratch",
+    )
+    parser.add_argument(
+        "--only", type=lambda v: [name.strip() for name in v.split(",") if name.strip()],
+        help="rebuild just these tables, e.g. --only passes,rushes",
+    )
+    parser.add_argument(
+        "--memory-limit", metavar="SIZE",
+        help="cap DuckDB's memory (e.g. 1.5GB) and load large CSVs in pieces",
+    )
+    parser.add_argument("--threads", type=int, help="DuckDB worker threads")
+    parser.add_argument("--temp-dir", help="directory DuckDB spills to when over the memory limit")
+    parser.add_argument(
+        "--compare", nargs="?", const=f"{OUTPUT_DIR}/{RUN_REPORT_FILE}", metavar="REPORT",
+        help=f"compare stage times with an earlier run report (default when given alone: the last {RUN_REPORT_FILE})",
+    )
+    args = parser.parse_args()
+
+    pipeline = NFLDataPipeline(memory_limit=args.memory_limit, threads=args.threads,
+                               temp_dir=args.temp_dir)
+    pipeline.run(partition_by_season=args.partition_by_season, compact=args.compact,
+                 workers=args.workers, refresh_schemas=args.refresh_schemas,
+                 incremental=args.incremental, rebuild=args.rebuild, only=args.only,
+                 compare=args.compare)